@@ -43,6 +43,9 @@ Examples:
 
   # Specify base path for relative resources
   html2word input.html -o output.docx --base-path /path/to/resources
+
+  # Finish within 30 seconds, degrading image rendering if needed
+  html2word input.html -o output.docx --deadline 30
         """
     )
 
@@ -69,6 +72,19 @@ Examples:
         help='Logging level (default: INFO)'
     )
 
+    parser.add_argument(
+        '--deadline',
+        type=float,
+        help='Overall conversion time budget in seconds (default: HTML2WORD_DEADLINE or unlimited)'
+    )
+
+    parser.add_argument(
+        '--output-backend',
+        choices=['docx', 'streaming'],
+        help='Output writer: build in memory and save (docx, default) or stream the '
+             'document body to the file while building (streaming, for very large documents)'
+    )
+
     parser.add_argument(
         '--version',
         action='version',
@@ -97,10 +113,10 @@ Examples:
             base_path = os.path.dirname(input_path)
 
         # Create converter
-        converter = HTML2WordConverter(base_path=base_path)
+        converter = HTML2WordConverter(base_path=base_path, output_backend=args.output_backend)
 
         # Convert
-        output_path = converter.convert_file(input_path, args.output)
+        output_path = converter.convert_file(input_path, args.output, deadline=args.deadline)
 
         logger.info(f"Success! Document saved to: {output_path}")
         print(f"\nConversion successful!")
@@ -6,10 +6,12 @@ Coordinates the entire conversion pipeline from HTML to .docx.
 
 import logging
 import os
-from typing import Optional
+import time
+from typing import Any, Dict, Optional
 
 from html2word.parser.html_parser import HTMLParser
 from html2word.style.style_resolver import StyleResolver
+from html2word.utils.deadline import start_deadline
 from html2word.word_builder.document_builder import DocumentBuilder
 
 logger = logging.getLogger(__name__)
@@ -18,25 +20,38 @@ logger = logging.getLogger(__name__)
 class HTML2WordConverter:
     """Main converter class that orchestrates the conversion process."""
 
-    def __init__(self, base_path: Optional[str] = None):
+    # Output backends: build with python-docx and save at the end, or stream
+    # word/document.xml into the package while building (bounded memory)
+    OUTPUT_BACKENDS = ('docx', 'streaming')
+
+    def __init__(self, base_path: Optional[str] = None, output_backend: Optional[str] = None):
         """
         Initialize HTML to Word converter.
 
         Args:
             base_path: Base path for resolving relative paths
+            output_backend: 'docx' (default) or 'streaming'; defaults to HTML2WORD_OUTPUT_BACKEND
         """
         self.base_path = base_path or os.getcwd()
+        output_backend = (output_backend or os.environ.get('HTML2WORD_OUTPUT_BACKEND') or 'docx').lower()
+        if output_backend not in self.OUTPUT_BACKENDS:
+            raise ValueError(f"Unknown output backend: {output_backend} (expected one of {self.OUTPUT_BACKENDS})")
+        self.output_backend = output_backend
 
         # Initialize components
         self.html_parser = HTMLParser(base_path=self.base_path)
         self.style_resolver = StyleResolver()
         self.document_builder = DocumentBuilder(base_path=self.base_path)
 
+        # Report of the most recent conversion (phase timings, deadline, degradations)
+        self.last_report: Dict[str, Any] = {}
+
     def convert(
         self,
         html_input: str,
         output_path: str,
-        input_type: str = "file"
+        input_type: str = "file",
+        deadline: Optional[float] = None
     ) -> str:
         """
         Convert HTML to Word document.
@@ -45,6 +60,9 @@ class HTML2WordConverter:
             html_input: HTML file path or HTML string
             output_path: Output .docx file path
             input_type: Type of input - "file" or "string"
+            deadline: Overall time budget in seconds (defaults to HTML2WORD_DEADLINE;
+                unlimited if unset). When the budget runs low, browser renders are
+                replaced by cached results or PIL fallbacks; see last_report.
 
         Returns:
             Output file path
@@ -53,17 +71,32 @@ class HTML2WordConverter:
             converter = HTML2WordConverter()
             converter.convert("input.html", "output.docx")
             converter.convert("<html>...</html>", "output.docx", input_type="string")
+            converter.convert("input.html", "output.docx", deadline=30)
         """
+        budget = start_deadline(deadline)
+        phases: Dict[str, float] = {}
+        self.last_report = {
+            'output': output_path,
+            'output_backend': self.output_backend,
+            'deadline': budget.budget,
+            'phases': phases,
+            'degradations': budget.degradations,
+        }
+
         logger.info(f"Starting HTML to Word conversion")
         logger.info(f"Input: {html_input if input_type == 'file' else 'HTML string'}")
         logger.info(f"Output: {output_path}")
+        if budget.limited:
+            logger.info(f"Deadline: {budget.budget:.1f}s (reserve {budget.reserve:.1f}s)")
 
         # Phase 1: Parse HTML
         logger.info("Phase 1: Parsing HTML")
+        phase_start = time.monotonic()
         if input_type == "file":
             tree = self.html_parser.parse_file(html_input)
         else:
             tree = self.html_parser.parse(html_input)
+        phases['parse'] = time.monotonic() - phase_start
 
         # Log statistics
         stats = tree.get_stats()
@@ -71,41 +104,66 @@ class HTML2WordConverter:
 
         # Phase 2: Resolve styles
         logger.info("Phase 2: Resolving styles")
+        phase_start = time.monotonic()
         self.style_resolver.resolve_styles(tree)
+        phases['styles'] = time.monotonic() - phase_start
 
         # Phase 3: Build Word document
         logger.info("Phase 3: Building Word document")
-        document = self.document_builder.build(tree)
-
-        # Phase 4: Save document
-        logger.info("Phase 4: Saving document")
-        document.save(output_path)
+        if budget.is_low():
+            logger.warning(f"Deadline: {budget.remaining():.1f}s left before building, using low-cost rendering")
+        phase_start = time.monotonic()
+        if self.output_backend == 'streaming':
+            # Phase 4 happens during the build: the package is written as blocks are finished
+            self.document_builder.build(tree, stream_to=output_path)
+            phases['build'] = time.monotonic() - phase_start
+        else:
+            document = self.document_builder.build(tree)
+            phases['build'] = time.monotonic() - phase_start
+
+            # Phase 4: Save document
+            logger.info("Phase 4: Saving document")
+            phase_start = time.monotonic()
+            document.save(output_path)
+            phases['save'] = time.monotonic() - phase_start
+
+        self.last_report['runs'] = self.document_builder.run_report
+        self.last_report['images'] = self.document_builder.image_report
+        self.last_report['named_styles'] = self.document_builder.named_style_report
+        self.last_report['elapsed'] = budget.elapsed()
+        if budget.degradations:
+            logger.warning(
+                f"Conversion took {budget.elapsed():.1f}s of a {budget.budget:.1f}s deadline, "
+                f"degradations applied: {budget.degradations}"
+            )
 
         logger.info(f"Conversion complete: {output_path}")
         return output_path
 
-    def convert_file(self, html_file: str, output_file: str) -> str:
+    def convert_file(self, html_file: str, output_file: str, deadline: Optional[float] = None) -> str:
         """
         Convert HTML file to Word document.
 
         Args:
             html_file: Path to HTML file
             output_file: Path to output .docx file
+            deadline: Overall time budget in seconds (see convert)
 
         Returns:
             Output file path
         """
-        return self.convert(html_file, output_file, input_type="file")
+        return self.convert(html_file, output_file, input_type="file", deadline=deadline)
 
-    def convert_string(self, html_string: str, output_file: str) -> str:
+    def convert_string(self, html_string: str, output_file: str, deadline: Optional[float] = None) -> str:
         """
         Convert HTML string to Word document.
 
         Args:
             html_string: HTML content as string
             output_file: Path to output .docx file
+            deadline: Overall time budget in seconds (see convert)
 
         Returns:
             Output file path
         """
-        return self.convert(html_string, output_file, input_type="string")
+        return self.convert(html_string, output_file, input_type="string", deadline=deadline)
@@ -2,12 +2,13 @@
 Layout module - Handles layout computation for DOM elements.
 
 This module provides functionality to compute layout for HTML elements,
-including flow layout, block layout, and inline layout.
+including flow layout, block layout, inline layout and table layout.
 """
 
 from html2word.layout.flow_layout import FlowLayout
 from html2word.layout.block_layout import BlockLayout
 from html2word.layout.inline_layout import InlineLayout
 from html2word.layout.position_calculator import PositionCalculator
+from html2word.layout.table_layout import TableLayout
 
-__all__ = ["FlowLayout", "BlockLayout", "InlineLayout", "PositionCalculator"]
+__all__ = ["FlowLayout", "BlockLayout", "InlineLayout", "PositionCalculator", "TableLayout"]
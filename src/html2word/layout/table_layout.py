@@ -0,0 +1,567 @@
+"""
+Table layout computation.
+
+Builds one layout model per HTML table: rows, cell spans, column count,
+Element UI gutter detection, the cell grid, declared column widths and
+min/max content widths (CSS automatic table layout). The model is cached on
+the table node so every table-building step reads the same structure instead
+of re-walking the rows.
+"""
+
+import logging
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from html2word.parser.dom_tree import DOMNode
+from html2word.utils.units import UnitConverter
+
+logger = logging.getLogger(__name__)
+
+_INLINE_WIDTH_RE = re.compile(r'width\s*:\s*([^;]+)')
+
+# Average glyph advance relative to the font size, used for content width estimates
+_NARROW_CHAR_EM = 0.55
+_WIDE_CHAR_EM = 1.0
+_DEFAULT_FONT_SIZE_PT = 10.5  # 14px, table body text
+
+
+class TableLayout:
+    """Layout model of one HTML table (or of rows merged from several tables)."""
+
+    def __init__(self, table_node: DOMNode, rows: Optional[List[DOMNode]] = None):
+        """
+        Compute the table structure.
+
+        Args:
+            table_node: Table DOM node (source of <col> widths and first-row widths)
+            rows: Row nodes, when they do not all come from table_node
+                (Element UI header/body tables); defaults to the rows of table_node
+        """
+        self.table_node = table_node
+        self._own_rows = rows is None
+        self.rows = self.extract_rows(table_node) if rows is None else rows
+        self.num_rows = len(self.rows)
+
+        # Cells and parsed spans of every row, gathered once
+        self.row_cells: List[List[DOMNode]] = [
+            [c for c in row.children if c.tag in ('td', 'th')] for row in self.rows
+        ]
+        self.spans: Dict[int, Tuple[int, int]] = {}
+        for cells in self.row_cells:
+            for cell in cells:
+                self.spans[id(cell)] = (
+                    int(cell.get_attribute('rowspan', '1')),
+                    int(cell.get_attribute('colspan', '1')),
+                )
+
+        self._cell_texts: Dict[int, str] = {}
+        self.num_cols = self._calculate_columns()
+        self.rows_with_gutter = self._detect_gutter_rows()
+        self.matrix = self._build_cell_matrix()
+        self.placements = self._plan_cell_layout()
+        self.declared_widths = self._extract_column_widths()
+        self._content_widths: Optional[Tuple[List[float], List[float]]] = None
+
+    @classmethod
+    def for_table(cls, table_node: DOMNode, body_node: Optional[DOMNode] = None) -> 'TableLayout':
+        """
+        Get the layout of a table, computing it on first use.
+
+        Args:
+            table_node: Table DOM node
+            body_node: Optional table whose rows are appended to table_node's rows
+                (Element UI splits header and body into separate tables)
+
+        Returns:
+            TableLayout cached in table_node.layout_info
+        """
+        key = 'table_layout' if body_node is None else 'merged_table_layout'
+        layout = table_node.layout_info.get(key)
+        if layout is None:
+            rows = None
+            if body_node is not None:
+                rows = cls.extract_rows(table_node) + cls.extract_rows(body_node)
+            layout = cls(table_node, rows)
+            table_node.layout_info[key] = layout
+        return layout
+
+    @staticmethod
+    def extract_rows(table_node: DOMNode) -> List[DOMNode]:
+        """
+        Extract row nodes from table.
+
+        Args:
+            table_node: Table DOM node
+
+        Returns:
+            List of row nodes (tr)
+        """
+        rows = []
+
+        # Process children to find rows
+        for child in table_node.children:
+            if child.tag == 'tr':
+                rows.append(child)
+            elif child.tag in ('thead', 'tbody', 'tfoot'):
+                # Process section
+                for section_child in child.children:
+                    if section_child.tag == 'tr':
+                        rows.append(section_child)
+
+        return rows
+
+    def span(self, cell: DOMNode) -> Tuple[int, int]:
+        """(rowspan, colspan) of a cell."""
+        return self.spans[id(cell)]
+
+    def is_gutter_cell(self, row_idx: int, cell_idx: int) -> bool:
+        """Whether the cell is the Element UI gutter cell of its row (skipped when building)."""
+        return row_idx in self.rows_with_gutter and cell_idx == len(self.row_cells[row_idx]) - 1
+
+    def _cell_text(self, cell: DOMNode) -> str:
+        """Text content of a cell, extracted once."""
+        text = self._cell_texts.get(id(cell))
+        if text is None:
+            text = cell.get_text_content() if hasattr(cell, 'get_text_content') else ''
+            self._cell_texts[id(cell)] = text
+        return text
+
+    def _calculate_columns(self) -> int:
+        """
+        Calculate number of columns in table, excluding Element UI gutter columns.
+
+        Element UI tables often have a "gutter" column (for scrollbar space) which should be ignored.
+        This is typically:
+        - The last column
+        - Has empty content
+        - Has class containing "gutter" or col name containing "gutter"
+
+        Returns:
+            Number of columns (excluding gutter)
+        """
+        if not self.rows:
+            return 0
+
+        max_cols = 0
+        for cells in self.row_cells:
+            max_cols = max(max_cols, sum(self.spans[id(cell)][1] for cell in cells))
+
+        # Check if the last column in ALL rows is a gutter column
+        # If so, exclude it from the column count
+        if max_cols > 0 and self._has_gutter_column(max_cols):
+            logger.debug(f"Detected gutter column, reducing column count from {max_cols} to {max_cols - 1}")
+            return max_cols - 1
+
+        return max_cols
+
+    def _has_gutter_column(self, max_cols: int) -> bool:
+        """
+        Check if there is an Element UI gutter column.
+
+        A gutter column is identified by:
+        1. Any cell has class="gutter" (most reliable, check this FIRST)
+        2. Element UI pattern: some rows have N+1 cells, others have N cells
+        3. The extra cell is empty
+
+        Args:
+            max_cols: Maximum number of grid columns in any row
+
+        Returns:
+            True if gutter column detected
+        """
+        if max_cols <= 1:
+            return False
+
+        # PRIORITY 1: Check if ANY cell has class="gutter"
+        # This is the most reliable indicator and works even with single-row tables
+        for cells in self.row_cells:
+            for cell in cells:
+                if 'gutter' in cell.class_string.lower():
+                    logger.debug(f"Detected gutter column via class='gutter'")
+                    return True
+
+        # PRIORITY 2: Check Element UI pattern (some rows have more cells than others)
+        row_cell_counts = [len(cells) for cells in self.row_cells]
+        if not row_cell_counts:
+            return False
+
+        min_count = min(row_cell_counts)
+        max_count = max(row_cell_counts)
+
+        if max_count == min_count + 1:
+            # Some rows have one extra column
+            # Check if rows with max_count have empty last cell
+            for cells in self.row_cells:
+                if len(cells) == max_count and not self._cell_text(cells[-1]).strip():
+                    logger.debug(f"Detected gutter column via empty last cell in longer row")
+                    return True
+
+        return False
+
+    def _detect_gutter_rows(self) -> set:
+        """
+        Find rows whose last cell is an Element UI gutter cell.
+
+        Returns:
+            Set of row indexes with a gutter cell
+        """
+        rows_with_gutter = set()
+        row_cell_counts = [len(cells) for cells in self.row_cells]
+        if not row_cell_counts:
+            return rows_with_gutter
+
+        max_html_cols = max(row_cell_counts)
+        min_html_cols = min(row_cell_counts)
+
+        # Element UI pattern: some rows have more cells than others
+        # Rows with extra cells have gutter
+        if max_html_cols > min_html_cols:
+            for idx, cells in enumerate(self.row_cells):
+                if len(cells) == max_html_cols:
+                    # This row has extra cells, check if last is gutter
+                    last_cell = cells[-1]
+
+                    # If last cell is empty or has "gutter" class, mark this row
+                    if 'gutter' in last_cell.class_string.lower() or not self._cell_text(last_cell).strip():
+                        rows_with_gutter.add(idx)
+                        logger.debug(f"Row {idx} has gutter column")
+
+        return rows_with_gutter
+
+    def _build_cell_matrix(self) -> List[List[Optional[DOMNode]]]:
+        """
+        Build matrix to track cell positions including merged cells.
+
+        Returns:
+            Matrix of the cell node covering each grid slot (None where no cell reaches)
+        """
+        num_rows = self.num_rows
+        num_cols = self.num_cols
+        matrix = [[None] * num_cols for _ in range(num_rows)]
+
+        for row_idx, cells in enumerate(self.row_cells):
+            col_idx = 0
+            row = matrix[row_idx]
+
+            for cell_idx, cell_node in enumerate(cells):
+                # Skip gutter column ONLY if this row has gutter and it's the last cell
+                if self.is_gutter_cell(row_idx, cell_idx):
+                    continue
+
+                # Find next available column
+                while col_idx < num_cols and row[col_idx] is not None:
+                    col_idx += 1
+
+                if col_idx >= num_cols:
+                    break
+
+                rowspan, colspan = self.spans[id(cell_node)]
+
+                # Mark cells as occupied
+                for r in range(row_idx, min(row_idx + rowspan, num_rows)):
+                    for c in range(col_idx, min(col_idx + colspan, num_cols)):
+                        matrix[r][c] = cell_node
+
+                col_idx += colspan
+
+        return matrix
+
+    def _plan_cell_layout(self) -> Optional[List[List[tuple]]]:
+        """
+        Place cells on the layout grid for bulk table construction.
+
+        Cells are placed where the merge-based fill puts them (following the matrix),
+        with rowspan/colspan clamped to the grid.
+
+        Returns:
+            Per row, a list of (col_idx, cell_node, height, width, spanned) in processing
+            order, or None when spans overlap or are invalid (left to the merge path)
+        """
+        num_rows = self.num_rows
+        num_cols = self.num_cols
+        matrix = self.matrix
+        occupied = [[False] * num_cols for _ in range(num_rows)]
+        layout = []
+
+        for row_idx, cells in enumerate(self.row_cells):
+            placements = []
+            col_idx = 0
+
+            for cell_idx, cell_node in enumerate(cells):
+                if self.is_gutter_cell(row_idx, cell_idx):
+                    continue
+
+                # Skip cells that are occupied by a previous rowspan/colspan
+                while col_idx < num_cols and matrix[row_idx][col_idx] is not cell_node:
+                    col_idx += 1
+                if col_idx >= num_cols:
+                    break
+
+                rowspan, colspan = self.spans[id(cell_node)]
+                if colspan < 1 or rowspan < 1:
+                    return None
+
+                height = min(rowspan, num_rows - row_idx)
+                width = min(colspan, num_cols - col_idx)
+                for r in range(row_idx, row_idx + height):
+                    for c in range(col_idx, col_idx + width):
+                        if occupied[r][c]:
+                            return None
+                        occupied[r][c] = True
+
+                placements.append((col_idx, cell_node, height, width, colspan > 1 or rowspan > 1))
+                col_idx += colspan
+
+            layout.append(placements)
+
+        return layout
+
+    def _extract_column_widths(self) -> List[Optional[str]]:
+        """
+        Extract column widths from <col> tags or first row cells.
+
+        Prioritizes <col> tags within <colgroup> as they provide the most
+        accurate width information, especially for Element UI tables.
+
+        Returns:
+            List of width values (can be None for auto-width columns)
+        """
+        widths = []
+
+        # First, try to find <col> or <colgroup> tags
+        cols = []
+        for child in self.table_node.children:
+            if child.tag == 'colgroup':
+                cols.extend(col for col in child.children if col.tag == 'col')
+            elif child.tag == 'col':
+                cols.append(child)
+
+        for col in cols:
+            # Try multiple sources for width
+            width = col.get_attribute('width') or col.computed_styles.get('width') or None
+
+            # Convert numeric width attribute to string with 'px'
+            if width and isinstance(width, (int, float)):
+                width = f"{width}px"
+
+            widths.append(width)
+
+        # If we found column definitions, log them and return
+        if widths:
+            logger.debug(f"Found {len(widths)} column definitions from <col> tags: {widths}")
+            return widths
+
+        # Otherwise, extract from first row cells of the width source table
+        rows = self.rows if self._own_rows else self.extract_rows(self.table_node)
+        if not rows:
+            return []
+
+        for cell in rows[0].children:
+            if cell.tag in ('td', 'th'):
+                # Only use explicitly set widths (from width attribute or inline style)
+                # Don't use computed_styles.get('width') as it may contain browser defaults
+                width_attr = cell.get_attribute('width')
+
+                # Convert numeric width attribute to string with 'px'
+                if width_attr and isinstance(width_attr, (int, float)):
+                    width_attr = f"{width_attr}px"
+
+                # Check inline style for width
+                style_attr = cell.get_attribute('style')
+                width_from_style = None
+                if style_attr and isinstance(style_attr, str) and 'width' in style_attr:
+                    match = _INLINE_WIDTH_RE.search(style_attr)
+                    if match:
+                        width_from_style = match.group(1).strip()
+
+                widths.append(width_attr or width_from_style)
+
+        if widths:
+            logger.debug(f"Extracted {len(widths)} column widths from first row cells: {widths}")
+
+        return widths
+
+    def column_width_specs(self) -> List[Optional[Tuple[float, bool]]]:
+        """
+        Parse the declared widths of the grid columns.
+
+        Returns:
+            Per grid column, (width in px or percent, is_percentage), or None for auto
+            columns; truncated to the column count
+
+        Raises:
+            ValueError: If a declared width cannot be parsed
+        """
+        specs = []
+        for width_info in self.declared_widths[:self.num_cols]:
+            if not width_info:
+                specs.append(None)
+            elif isinstance(width_info, str):
+                if '%' in width_info:
+                    specs.append((float(width_info.rstrip('%')), True))
+                else:
+                    # Absolute width (px, pt, etc.), kept in px for calculation
+                    specs.append((UnitConverter.to_pt(width_info) / 0.75, False))
+            elif isinstance(width_info, (int, float)):
+                # Numeric width, assume pixels
+                specs.append((float(width_info), False))
+            else:
+                specs.append(None)
+        return specs
+
+    @property
+    def content_widths(self) -> Tuple[List[float], List[float]]:
+        """
+        Minimum and maximum content width of every grid column in pt (computed on first use).
+
+        Follows the CSS automatic table layout: each single-column cell raises its column's
+        minimum (longest unbreakable word) and maximum (unwrapped text) width, then spanning
+        cells, narrowest span first, spread what their columns still lack over the columns
+        they cover in proportion to the columns' maximum widths.
+        """
+        if self._content_widths is None:
+            self._content_widths = self._compute_content_widths()
+        return self._content_widths
+
+    def _compute_content_widths(self) -> Tuple[List[float], List[float]]:
+        num_cols = self.num_cols
+        min_widths = [0.0] * num_cols
+        max_widths = [0.0] * num_cols
+        spanning = []
+
+        for placements in self.placements or self._matrix_placements():
+            for col_idx, cell_node, _, width, _ in placements:
+                cell_min, cell_max = self._cell_content_width(cell_node)
+                if width == 1:
+                    if cell_min > min_widths[col_idx]:
+                        min_widths[col_idx] = cell_min
+                    if cell_max > max_widths[col_idx]:
+                        max_widths[col_idx] = cell_max
+                else:
+                    spanning.append((width, col_idx, cell_min, cell_max))
+
+        spanning.sort(key=lambda item: item[0])
+        for width, col_idx, cell_min, cell_max in spanning:
+            cols = range(col_idx, col_idx + width)
+            for widths, needed in ((min_widths, cell_min), (max_widths, cell_max)):
+                have = sum(widths[c] for c in cols)
+                if needed <= have:
+                    continue
+                weights = [max_widths[c] for c in cols]
+                total_weight = sum(weights)
+                for c, weight in zip(cols, weights):
+                    share = weight / total_weight if total_weight else 1.0 / width
+                    widths[c] += (needed - have) * share
+
+        for c in range(num_cols):
+            if max_widths[c] < min_widths[c]:
+                max_widths[c] = min_widths[c]
+        return min_widths, max_widths
+
+    def _matrix_placements(self) -> List[List[tuple]]:
+        """Cell origins read off the matrix, for tables whose spans overlap."""
+        layout = []
+        seen = set()
+        for row_idx, row in enumerate(self.matrix):
+            placements = []
+            for col_idx, cell_node in enumerate(row):
+                if cell_node is None or id(cell_node) in seen:
+                    continue
+                seen.add(id(cell_node))
+                width = 1
+                while col_idx + width < self.num_cols and row[col_idx + width] is cell_node:
+                    width += 1
+                placements.append((col_idx, cell_node, 1, width, width > 1))
+            layout.append(placements)
+        return layout
+
+    def _cell_content_width(self, cell_node: DOMNode) -> Tuple[float, float]:
+        """Estimated (min, max) content width of a cell in pt, including padding and borders."""
+        font_size = _DEFAULT_FONT_SIZE_PT
+        size_value = cell_node.computed_styles.get('font-size')
+        if size_value:
+            try:
+                font_size = UnitConverter.to_pt(size_value)
+            except Exception:
+                pass
+
+        text = self._cell_text(cell_node)
+        longest_word = 0.0
+        line = 0.0
+        word = 0.0
+        for char in text:
+            if char.isspace():
+                longest_word = max(longest_word, word)
+                word = 0.0
+                line += _NARROW_CHAR_EM
+                continue
+            if unicodedata.east_asian_width(char) in ('W', 'F'):
+                # CJK text can break between any two characters
+                longest_word = max(longest_word, word, _WIDE_CHAR_EM)
+                word = 0.0
+                line += _WIDE_CHAR_EM
+            else:
+                word += _NARROW_CHAR_EM
+                line += _NARROW_CHAR_EM
+        longest_word = max(longest_word, word)
+
+        extra = 0.0
+        box_model = cell_node.layout_info.get('box_model')
+        if box_model is not None:
+            extra = (box_model.padding.left + box_model.padding.right
+                     + box_model.border.left.width + box_model.border.right.width)
+        return longest_word * font_size + extra, line * font_size + extra
+
+    def distribute_auto_width(self, available_pt: float, columns: List[int],
+                              min_width_pt: float = 30) -> List[float]:
+        """
+        Share the width left by fixed columns among auto-width columns.
+
+        Columns get at least their minimum content width; space beyond the total minimum
+        goes to the columns whose content would wrap, in proportion to how much they
+        need, and any surplus in proportion to their maximum content width. Columns
+        without content share equally. Columns narrower than min_width_pt are widened
+        at the expense of the wider ones, so the widths always add up to available_pt;
+        if that bound cannot be met for every column they share equally.
+
+        Args:
+            available_pt: Width to distribute in pt
+            columns: Grid indexes of the auto-width columns
+            min_width_pt: Lower bound per column
+
+        Returns:
+            Width in pt for each of the given columns
+        """
+        if not columns:
+            return []
+        if len(columns) * min_width_pt > available_pt:
+            return [available_pt / len(columns)] * len(columns)
+        min_widths, max_widths = self.content_widths
+        mins = [min_widths[c] for c in columns]
+        maxs = [max_widths[c] for c in columns]
+        total_min = sum(mins)
+        total_max = sum(maxs)
+
+        if total_max <= 0:
+            widths = [available_pt / len(columns)] * len(columns)
+        elif available_pt >= total_max:
+            widths = [w + (available_pt - total_max) * w / total_max for w in maxs]
+        elif available_pt > total_min and total_max > total_min:
+            ratio = (available_pt - total_min) / (total_max - total_min)
+            widths = [lo + (hi - lo) * ratio for lo, hi in zip(mins, maxs)]
+        else:
+            # Not even the minimum widths fit: scale them down together
+            widths = [available_pt * lo / total_min for lo in mins] if total_min > 0 \
+                else [available_pt / len(columns)] * len(columns)
+
+        # Raise narrow columns to the lower bound, taking the difference from the
+        # others in proportion to their width above it
+        deficit = sum(min_width_pt - w for w in widths if w < min_width_pt)
+        if deficit <= 0:
+            return widths
+        excess = sum(w - min_width_pt for w in widths if w > min_width_pt)
+        return [
+            w - deficit * (w - min_width_pt) / excess if w > min_width_pt else min_width_pt
+            for w in widths
+        ]
@@ -7,6 +7,7 @@ inline CSS styles, building an enhanced DOM tree with style information.
 
 from html2word.parser.html_parser import HTMLParser
 from html2word.parser.css_parser import CSSParser
-from html2word.parser.dom_tree import DOMNode, DOMTree
+from html2word.parser.dom_tree import DOMNode, DOMTree, DOMIndex
+from html2word.parser.parse_filter import ParseFilter
 
-__all__ = ["HTMLParser", "CSSParser", "DOMNode", "DOMTree"]
+__all__ = ["HTMLParser", "CSSParser", "DOMNode", "DOMTree", "DOMIndex", "ParseFilter"]
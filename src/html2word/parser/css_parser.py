@@ -4,13 +4,19 @@ CSS parser for inline styles and stylesheet rules.
 Parses CSS from style attributes, <style> tags, and extracts style properties.
 """
 
+import os
 import re
 import logging
-from typing import Dict, Optional, List, Tuple
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Optional, List, Tuple, Mapping
 import tinycss2
 
 logger = logging.getLogger(__name__)
 
+# 内联样式解析缓存大小（按原始 style 字符串缓存）
+INLINE_STYLE_CACHE_SIZE = int(os.environ.get('HTML2WORD_INLINE_STYLE_CACHE_SIZE', '4096'))
+
 
 class CSSParser:
     """Parser for inline CSS styles."""
@@ -35,6 +41,10 @@ class CSSParser:
         ':fullscreen', ':modal', ':picture-in-picture',
     ])
 
+    # 有界 LRU 缓存: raw style string -> 只读映射
+    _inline_style_cache: "OrderedDict[str, Mapping[str, str]]" = OrderedDict()
+    inline_style_cache_stats = {'hits': 0, 'misses': 0}
+
     @classmethod
     def _should_skip_selector(cls, selector: str) -> bool:
         """检查选择器是否应该跳过 (静态文档中无用的伪类/伪元素)"""
@@ -83,6 +93,35 @@ class CSSParser:
 
         return styles
 
+    @classmethod
+    def parse_inline_style_cached(cls, style_string: str) -> Mapping[str, str]:
+        """
+        Parse inline CSS with a bounded cache keyed by the raw style string.
+
+        Report generators repeat identical style attributes thousands of times,
+        so the parsed result is shared. The returned mapping is read-only;
+        DOMNode copies it only when the node's styles are later mutated.
+
+        Args:
+            style_string: CSS string from style attribute
+
+        Returns:
+            Read-only mapping of property: value pairs
+        """
+        cache = cls._inline_style_cache
+        cached = cache.get(style_string)
+        if cached is not None:
+            cache.move_to_end(style_string)
+            cls.inline_style_cache_stats['hits'] += 1
+            return cached
+
+        cls.inline_style_cache_stats['misses'] += 1
+        cached = MappingProxyType(cls.parse_inline_style(style_string))
+        cache[style_string] = cached
+        if len(cache) > INLINE_STYLE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return cached
+
     @classmethod
     def _serialize_value(cls, tokens) -> str:
         """
@@ -107,20 +107,15 @@ class CSSSelector:
         # Extract and check ID
         id_matches = cls._ID_PATTERN.findall(selector)
         if id_matches:
-            node_id = node.attributes.get('id', '')
-            if node_id not in id_matches:
+            if node.node_id not in id_matches:
                 return False
 
-        # Extract and check classes
+        # Extract and check classes (class_set is pre-tokenized by the parser)
         class_matches = cls._CLASS_PATTERN.findall(selector)
         if class_matches:
-            node_classes = node.attributes.get('class', '')
-            if isinstance(node_classes, list):
-                node_classes = ' '.join(node_classes)
-            node_class_list = node_classes.split() if node_classes else []
-
+            node_class_set = node.class_set
             for required_class in class_matches:
-                if required_class not in node_class_list:
+                if required_class not in node_class_set:
                     return False
 
         # Extract and check attributes
@@ -4,10 +4,67 @@ DOM tree data structures.
 Defines the DOM node and tree structures for representing parsed HTML.
 """
 
-from typing import Optional, List, Dict, Any
+import sys
+from typing import Optional, List, Dict, Any, Tuple, FrozenSet, Mapping
 from enum import Enum
 
 
+# 全局驻留缓存：相同的 class 组合在整个文档中共享同一组对象
+# class tuple -> (ordered tuple, frozenset, joined string)
+_CLASS_INTERN_CACHE: Dict[Tuple[str, ...], Tuple[Tuple[str, ...], FrozenSet[str], str]] = {}
+_CLASS_INTERN_CACHE_LIMIT = 100000
+_EMPTY_CLASSES: Tuple[Tuple[str, ...], FrozenSet[str], str] = ((), frozenset(), '')
+
+
+def intern_classes(value: Any) -> Tuple[Tuple[str, ...], FrozenSet[str], str]:
+    """
+    Tokenize and intern a class attribute value.
+
+    Args:
+        value: class attribute (BeautifulSoup list, string or None)
+
+    Returns:
+        Tuple of (ordered class tuple, class frozenset, space-joined class string),
+        shared between all nodes with the same class list
+    """
+    if not value:
+        return _EMPTY_CLASSES
+
+    if isinstance(value, str):
+        key = tuple(value.split())
+    elif isinstance(value, (list, tuple)):
+        if len(value) == 1 and ' ' not in value[0]:
+            key = (value[0],)
+        else:
+            key = tuple(' '.join(value).split())
+    else:
+        return _EMPTY_CLASSES
+
+    cached = _CLASS_INTERN_CACHE.get(key)
+    if cached is None:
+        if len(_CLASS_INTERN_CACHE) >= _CLASS_INTERN_CACHE_LIMIT:
+            _CLASS_INTERN_CACHE.clear()
+        class_list = tuple(sys.intern(c) for c in key)
+        cached = (class_list, frozenset(class_list), sys.intern(' '.join(class_list)))
+        _CLASS_INTERN_CACHE[key] = cached
+    return cached
+
+
+def intern_id(value: Any) -> Optional[str]:
+    """
+    Intern an id attribute value.
+
+    Args:
+        value: id attribute
+
+    Returns:
+        Interned id string, or None if missing/empty
+    """
+    if isinstance(value, str) and value:
+        return sys.intern(value)
+    return None
+
+
 class NodeType(Enum):
     """Type of DOM node."""
     ELEMENT = "element"
@@ -37,17 +94,84 @@ class DOMNode:
             parent: Parent node
         """
         self.node_type = node_type
-        self.tag = tag.lower() if tag else None
+        self.tag = sys.intern(tag.lower()) if tag else None
         self.text = text
         self.attributes = attributes or {}
+
+        # Pre-tokenized class/id (interned), used by selector matching and builder predicates.
+        # class_list keeps the original order for serialization.
+        self.class_list, self.class_set, self.class_string = intern_classes(self.attributes.get('class'))
+        self.node_id = intern_id(self.attributes.get('id'))
         self.parent = parent
         self.children: List[DOMNode] = []
 
         # Computed properties
-        self.inline_styles: Dict[str, str] = {}  # Parsed from style attribute
+        self._inline_styles: Dict[str, str] = {}  # Parsed from style attribute (+ cascade)
+        self._inline_styles_shared = False  # True while _inline_styles is a shared read-only mapping
         self.computed_styles: Dict[str, Any] = {}  # Final computed styles
         self.layout_info: Dict[str, Any] = {}  # Layout information
 
+    @property
+    def inline_styles(self) -> Mapping[str, str]:
+        """
+        Inline + cascaded styles.
+
+        May be a shared read-only mapping (see share_inline_styles); use
+        merge_inline_styles to mutate.
+        """
+        return self._inline_styles
+
+    @inline_styles.setter
+    def inline_styles(self, styles: Dict[str, str]):
+        """Replace inline styles with a node-owned dict."""
+        self._inline_styles = styles
+        self._inline_styles_shared = False
+
+    def share_inline_styles(self, styles: Mapping[str, str]):
+        """
+        Use a shared read-only style mapping (e.g. from the inline style cache).
+
+        The mapping is copied on the first mutation (copy-on-write).
+
+        Args:
+            styles: Read-only style mapping shared between nodes
+        """
+        self._inline_styles = styles
+        self._inline_styles_shared = True
+
+    def _own_inline_styles(self) -> Dict[str, str]:
+        """Return a node-owned, mutable inline style dict (copying a shared mapping)."""
+        if self._inline_styles_shared:
+            self._inline_styles = dict(self._inline_styles)
+            self._inline_styles_shared = False
+        return self._inline_styles
+
+    def merge_inline_styles(self, styles: Mapping[str, str]) -> int:
+        """
+        Merge styles without overriding existing properties (inline takes precedence).
+
+        Args:
+            styles: Styles to merge
+
+        Returns:
+            Number of properties added
+        """
+        current = self._inline_styles
+        missing = [prop for prop in styles if prop not in current]
+        if not missing:
+            return 0
+        own = self._own_inline_styles()
+        for prop in missing:
+            own[prop] = styles[prop]
+        return len(missing)
+
+    @property
+    def has_cascaded_styles(self) -> bool:
+        """True if stylesheet rules added properties beyond the parsed style attribute."""
+        # Parsed style attributes stay shared until merge_inline_styles adds to them;
+        # nodes without one start with an empty owned dict.
+        return not self._inline_styles_shared and bool(self._inline_styles)
+
     @property
     def is_element(self) -> bool:
         """Check if this is an element node."""
@@ -142,17 +266,149 @@ class DOMNode:
             return f"DOMNode({self.tag}, {len(self.children)} children, {attrs})"
 
 
+class DOMIndex:
+    """
+    Incremental tag/id/class indexes and node counters for a DOM tree.
+
+    Nodes are registered as the parser creates them (document order) and
+    unregistered when a subtree is detached, so lookups and statistics never
+    need a full tree walk. Each index bucket is an insertion-ordered dict
+    keyed by id(node), making removal O(1).
+    """
+
+    def __init__(self):
+        """Initialize empty indexes."""
+        self.tag_index: Dict[str, Dict[int, DOMNode]] = {}
+        self.id_index: Dict[str, Dict[int, DOMNode]] = {}
+        self.class_index: Dict[str, Dict[int, DOMNode]] = {}
+        self.total_nodes = 0
+        self.element_nodes = 0
+        self.text_nodes = 0
+
+    def add(self, node: DOMNode):
+        """
+        Register a single node.
+
+        Args:
+            node: Newly created node
+        """
+        self.total_nodes += 1
+        if node.is_element:
+            self.element_nodes += 1
+            key = id(node)
+            if node.tag:
+                self.tag_index.setdefault(node.tag, {})[key] = node
+            if node.node_id:
+                self.id_index.setdefault(node.node_id, {})[key] = node
+            for class_name in node.class_set:
+                self.class_index.setdefault(class_name, {})[key] = node
+        elif node.is_text:
+            self.text_nodes += 1
+
+    def add_subtree(self, node: DOMNode):
+        """Register a node and all its descendants (document order)."""
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self.add(current)
+            stack.extend(reversed(current.children))
+
+    def remove_subtree(self, node: DOMNode) -> Tuple[int, int]:
+        """
+        Unregister a node and all its descendants.
+
+        Args:
+            node: Root of the detached subtree
+
+        Returns:
+            Tuple of (removed nodes, removed elements)
+        """
+        removed_nodes = 0
+        removed_elements = 0
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            stack.extend(current.children)
+            removed_nodes += 1
+            if current.is_element:
+                removed_elements += 1
+                key = id(current)
+                if current.tag:
+                    self._discard(self.tag_index, current.tag, key)
+                if current.node_id:
+                    self._discard(self.id_index, current.node_id, key)
+                for class_name in current.class_set:
+                    self._discard(self.class_index, class_name, key)
+            elif current.is_text:
+                self.text_nodes -= 1
+
+        self.total_nodes -= removed_nodes
+        self.element_nodes -= removed_elements
+        return removed_nodes, removed_elements
+
+    @staticmethod
+    def _discard(index: Dict[str, Dict[int, DOMNode]], name: str, key: int):
+        """Remove a node from an index bucket, dropping empty buckets."""
+        bucket = index.get(name)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del index[name]
+
+
 class DOMTree:
     """Represents the complete DOM tree."""
 
-    def __init__(self, root: DOMNode):
+    def __init__(self, root: DOMNode, index: Optional[DOMIndex] = None):
         """
         Initialize DOM tree.
 
         Args:
             root: Root node of the tree
+            index: Index populated while the tree was built (built from the tree if None)
         """
         self.root = root
+        if index is None:
+            index = DOMIndex()
+            index.add_subtree(root)
+        self.index = index
+        # Content dropped by the parse-time filter (see ParseFilter)
+        self.parse_stats: Dict[str, int] = {
+            'skipped_subtrees': 0,
+            'skipped_nodes': 0,
+            'skipped_bytes': 0
+        }
+        # Subtrees detached after the cascade (see HiddenSubtreePruner)
+        self.pruned_stats: Dict[str, int] = {
+            'pruned_subtrees': 0,
+            'pruned_nodes': 0,
+            'pruned_elements': 0
+        }
+
+    def record_pruned(self, stats: Dict[str, int]):
+        """
+        Accumulate counts of pruned (detached) subtrees.
+
+        Args:
+            stats: Dict with pruned_subtrees / pruned_nodes / pruned_elements
+        """
+        for key, value in stats.items():
+            self.pruned_stats[key] = self.pruned_stats.get(key, 0) + value
+
+    def detach(self, node: DOMNode) -> Tuple[int, int]:
+        """
+        Detach a subtree from its parent and drop it from the indexes.
+
+        Args:
+            node: Root of the subtree to detach
+
+        Returns:
+            Tuple of (removed nodes, removed elements)
+        """
+        if node.parent is not None:
+            node.parent.children.remove(node)
+            node.parent = None
+        return self.index.remove_subtree(node)
 
     def traverse(self, callback, node: Optional[DOMNode] = None):
         """
@@ -181,7 +437,7 @@ class DOMTree:
             List of matching nodes
         """
         if node is None:
-            node = self.root
+            return list(self.index.tag_index.get(tag.lower(), {}).values())
 
         results = []
         if node.tag == tag.lower():
@@ -192,6 +448,30 @@ class DOMTree:
 
         return results
 
+    def find_by_id(self, element_id: str) -> List[DOMNode]:
+        """
+        Find all elements with a specific id (index lookup).
+
+        Args:
+            element_id: id attribute value
+
+        Returns:
+            List of matching nodes (document order)
+        """
+        return list(self.index.id_index.get(element_id, {}).values())
+
+    def find_by_class(self, class_name: str) -> List[DOMNode]:
+        """
+        Find all elements having a class (index lookup).
+
+        Args:
+            class_name: Class name
+
+        Returns:
+            List of matching nodes (document order)
+        """
+        return list(self.index.class_index.get(class_name, {}).values())
+
     def find_by_attribute(
         self,
         attr_name: str,
@@ -210,6 +490,8 @@ class DOMTree:
             List of matching nodes
         """
         if node is None:
+            if attr_name == 'id' and isinstance(attr_value, str):
+                return self.find_by_id(attr_value)
             node = self.root
 
         results = []
@@ -224,34 +506,21 @@ class DOMTree:
 
     def get_stats(self) -> Dict[str, Any]:
         """
-        Get statistics about the tree.
+        Get statistics about the tree (from the incremental index, no tree walk).
 
         Returns:
             Dict with statistics
         """
-        total_nodes = 0
-        element_nodes = 0
-        text_nodes = 0
-        tag_counts: Dict[str, int] = {}
-
-        def count_node(node: DOMNode):
-            nonlocal total_nodes, element_nodes, text_nodes
-            total_nodes += 1
-
-            if node.is_element:
-                element_nodes += 1
-                if node.tag:
-                    tag_counts[node.tag] = tag_counts.get(node.tag, 0) + 1
-            elif node.is_text:
-                text_nodes += 1
-
-        self.traverse(count_node)
-
+        index = self.index
         return {
-            'total_nodes': total_nodes,
-            'element_nodes': element_nodes,
-            'text_nodes': text_nodes,
-            'tag_counts': tag_counts
+            'total_nodes': index.total_nodes,
+            'element_nodes': index.element_nodes,
+            'text_nodes': index.text_nodes,
+            'tag_counts': {tag: len(nodes) for tag, nodes in index.tag_index.items()},
+            'pruned_subtrees': self.pruned_stats['pruned_subtrees'],
+            'pruned_nodes': self.pruned_stats['pruned_nodes'],
+            'skipped_nodes': self.parse_stats['skipped_nodes'],
+            'skipped_bytes': self.parse_stats['skipped_bytes']
         }
 
     def __repr__(self) -> str:
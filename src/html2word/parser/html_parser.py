@@ -6,12 +6,16 @@ Parses HTML documents and builds a DOM tree with inline style information.
 
 import logging
 import os
-from typing import Optional, Union
+import re
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple, Union, Mapping
 from bs4 import BeautifulSoup, NavigableString, Comment, Tag
+from lxml import etree
 import yaml
 
-from html2word.parser.dom_tree import DOMNode, DOMTree, NodeType
-from html2word.parser.css_parser import CSSParser
+from html2word.parser.dom_tree import DOMNode, DOMTree, DOMIndex, NodeType
+from html2word.parser.css_parser import CSSParser, INLINE_STYLE_CACHE_SIZE
+from html2word.parser.parse_filter import ParseFilter
 
 # Try to import optimized version first, fallback to regular version
 try:
@@ -24,20 +28,94 @@ except ImportError:
     logger.warning("StylesheetManagerOptimized not found, using standard version")
 
 
+# Tokens relevant for locating <svg> elements in raw markup: comments and raw-text
+# elements are skipped as a whole so that "<svg" inside them is not mistaken for a tag.
+_SVG_TOKEN_RE = re.compile(
+    rb'<!--.*?-->|<(script|style|textarea|title)\b.*?</\1\s*>'
+    rb'|<svg\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>|</svg\s*>',
+    re.IGNORECASE | re.DOTALL
+)
+_SVG_PRESENT_RE = re.compile(r'<svg\b', re.IGNORECASE)
+_SVG_WRAPPER_OPEN = b'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">'
+_SVG_WRAPPER_CLOSE = b'</svg>'
+
+
+def _scan_svg_sources(source: bytes) -> List[Tuple[int, int, int]]:
+    """
+    Locate outermost <svg> elements in raw markup.
+
+    Args:
+        source: Raw document bytes
+
+    Returns:
+        [(start, inner_start, inner_end), ...] in document order; start is the
+        offset of "<svg", inner_start/inner_end delimit the element content
+    """
+    spans = []
+    depth = 0
+    start = inner_start = 0
+    for match in _SVG_TOKEN_RE.finditer(source):
+        token = match.group(0)
+        if token[:2] == b'</':
+            if token[2:5].lower() != b'svg':
+                continue  # raw-text element (e.g. <style>) inside an SVG
+            if depth == 0:
+                continue
+            depth -= 1
+            if depth == 0:
+                spans.append((start, inner_start, match.start()))
+        elif token[:4].lower() == b'<svg':
+            if depth == 0:
+                start, inner_start = match.start(), match.end()
+                if token.endswith(b'/>'):
+                    spans.append((start, inner_start, inner_start))
+                    continue
+            elif token.endswith(b'/>'):
+                continue
+            depth += 1
+    return spans
+
+
+def _is_well_formed_svg_content(content: memoryview) -> bool:
+    """
+    Check that raw SVG content is well-formed XML.
+
+    The content is HTML markup and may use unquoted attributes, HTML entities
+    such as &nbsp; or unclosed void tags, none of which an XML parser accepts.
+
+    Args:
+        content: Raw element content (UTF-8)
+
+    Returns:
+        True if the content parses as XML inside an <svg> root
+    """
+    try:
+        etree.fromstring(_SVG_WRAPPER_OPEN + bytes(content) + _SVG_WRAPPER_CLOSE)
+        return True
+    except (etree.XMLSyntaxError, ValueError):
+        return False
+
+
 class HTMLParser:
     """Parser for HTML documents."""
 
-    def __init__(self, base_path: Optional[str] = None):
+    def __init__(self, base_path: Optional[str] = None, parse_filter: Optional[ParseFilter] = None):
         """
         Initialize HTML parser.
 
         Args:
             base_path: Base path for resolving relative paths
+            parse_filter: Parse-time element filter (defaults to ParseFilter())
         """
         self.base_path = base_path or os.getcwd()
+        self.parse_filter = parse_filter or ParseFilter()
         self.css_parser = CSSParser()
         self.stylesheet_manager = StylesheetManager()
         self.default_styles = self._load_default_styles()
+        # (tag, style string) -> inline styles merged with default styles
+        self._merged_style_cache = {}
+        # id(outermost <svg> tag) -> raw element content, valid during _build_dom_tree
+        self._svg_sources: Dict[int, memoryview] = {}
 
     def _load_default_styles(self) -> dict:
         """Load default HTML element styles from config."""
@@ -57,6 +135,40 @@ class HTMLParser:
             logger.error(f"Error loading default styles: {e}")
             return {}
 
+    def _get_inline_styles(self, tag_name: str, style_string: Optional[str]) -> Mapping[str, str]:
+        """
+        Get parsed inline styles merged with the element's default styles.
+
+        Both the parsed style attribute and the merged result are cached, so
+        repeated style attributes are parsed once and shared between nodes.
+
+        Args:
+            tag_name: Element tag name
+            style_string: Raw style attribute value (or None)
+
+        Returns:
+            Read-only mapping of property: value pairs
+        """
+        parsed = self.css_parser.parse_inline_style_cached(style_string) if style_string else {}
+
+        default_style = self.default_styles.get(tag_name)
+        if not default_style:
+            return parsed
+
+        key = (tag_name, style_string or '')
+        merged = self._merged_style_cache.get(key)
+        if merged is None:
+            styles = dict(parsed)
+            # Merge default styles with inline styles (inline takes precedence)
+            for prop, value in default_style.items():
+                if prop not in styles:
+                    styles[prop] = str(value)
+            merged = MappingProxyType(styles)
+            if len(self._merged_style_cache) >= INLINE_STYLE_CACHE_SIZE:
+                self._merged_style_cache.clear()
+            self._merged_style_cache[key] = merged
+        return merged
+
     def _extract_stylesheets(self, soup):
         """
         Extract and parse CSS from <style> tags.
@@ -112,20 +224,86 @@ class HTMLParser:
         logger.info("Extracting stylesheets from <style> tags...")
         self._extract_stylesheets(soup)
 
+        # Locate the raw source of inline SVGs so the renderer can slice it instead of re-serializing
+        self._svg_sources = self._map_svg_sources(soup, html_content)
+
         # Build DOM tree
         logger.info("Building DOM tree from parsed HTML...")
-        root = self._build_dom_tree(soup)
-        tree = DOMTree(root)
+        self.parse_filter.reset_stats()
+        index = DOMIndex()
+        root = self._build_dom_tree(soup, index)
+        self._svg_sources = {}
+        tree = DOMTree(root, index=index)
+        tree.parse_stats.update(self.parse_filter.stats)
         logger.info(f"DOM tree built with {tree.get_stats()['total_nodes']} nodes")
+        if self.parse_filter.stats['skipped_subtrees']:
+            logger.info(
+                f"Parse filter skipped {self.parse_filter.stats['skipped_subtrees']} elements "
+                f"({self.parse_filter.stats['skipped_nodes']} nodes, "
+                f"{self.parse_filter.stats['skipped_bytes']} bytes)"
+            )
 
         # Apply CSS rules to the DOM tree
         if self.stylesheet_manager.get_rule_count() > 0:
             logger.info(f"Applying {self.stylesheet_manager.get_rule_count()} CSS rules to DOM tree")
             self.stylesheet_manager.apply_styles_to_tree(tree.root)
 
+        cache_stats = CSSParser.inline_style_cache_stats
+        logger.info(f"Inline style cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
         logger.info(f"Parsed HTML: {tree}")
         return tree
 
+    def _map_svg_sources(self, soup, html_content: Union[str, bytes]) -> Dict[int, memoryview]:
+        """
+        Map outermost <svg> tags to the raw markup of their content.
+
+        Offsets come from scanning the input bytes; the scan is matched to the
+        parsed tags in document order and discarded entirely if the two disagree
+        (parser-repaired markup, "<svg" inside attribute values, ...).
+
+        Args:
+            soup: Parsed BeautifulSoup document
+            html_content: Original HTML string or bytes
+
+        Returns:
+            {id(svg_tag): memoryview of the element content}
+        """
+        if isinstance(html_content, str):
+            if not _SVG_PRESENT_RE.search(html_content):
+                return {}
+            source = html_content.encode('utf-8')
+        elif (soup.original_encoding or 'utf-8').lower() in ('utf-8', 'ascii'):
+            source = bytes(html_content)
+        else:
+            return {}
+
+        svg_tags = [tag for tag in soup.find_all('svg') if tag.find_parent('svg') is None]
+        if not svg_tags:
+            return {}
+        spans = _scan_svg_sources(source)
+        if len(spans) != len(svg_tags):
+            logger.debug(f"SVG source scan found {len(spans)} elements, parser found {len(svg_tags)}; not capturing")
+            return {}
+
+        view = memoryview(source)
+        sources = {}
+        for tag, (start, inner_start, inner_end) in zip(svg_tags, spans):
+            start_tag = source[start:inner_start].lower()
+            for name in ('id', 'width', 'height'):
+                value = tag.get(name)
+                if isinstance(value, str) and value.lower().encode('utf-8') not in start_tag:
+                    logger.debug("SVG source scan does not match parsed tags; not capturing")
+                    return {}
+            if inner_start == inner_end and tag.contents:
+                # e.g. "<svg/>" which the HTML parser treated as an open tag
+                logger.debug("SVG source scan does not match parsed tags; not capturing")
+                return {}
+            sources[id(tag)] = view[inner_start:inner_end]
+
+        logger.debug(f"Captured raw source of {len(sources)} inline SVGs")
+        return sources
+
     def parse_file(self, file_path: str, parser: str = "lxml") -> DOMTree:
         """
         Parse HTML file and build DOM tree.
@@ -152,12 +330,13 @@ class HTMLParser:
 
         return self.parse(html_content, parser)
 
-    def _build_dom_tree(self, soup_node) -> DOMNode:
+    def _build_dom_tree(self, soup_node, index: Optional[DOMIndex] = None) -> DOMNode:
         """
         Recursively build DOM tree from BeautifulSoup node.
 
         Args:
             soup_node: BeautifulSoup node
+            index: DOM index to register created nodes in (document order)
 
         Returns:
             DOMNode
@@ -174,12 +353,26 @@ class HTMLParser:
             if not text or text.isspace():
                 return None
 
-            return DOMNode(node_type=NodeType.TEXT, text=text)
+            text_node = DOMNode(node_type=NodeType.TEXT, text=text)
+            if index is not None:
+                index.add(text_node)
+            return text_node
 
         elif isinstance(soup_node, Tag):
             # Element node
             tag_name = soup_node.name
 
+            # Parse-time filter: drop content of non-rendered elements (script, template, ...)
+            # Keep a bare placeholder so sibling-based selectors (:first-child, +, ~)
+            # still see the same sibling positions; it is pruned after the cascade.
+            if self.parse_filter.should_skip(tag_name, soup_node.attrs):
+                self.parse_filter.record_skipped(soup_node)
+                placeholder = DOMNode(node_type=NodeType.ELEMENT, tag=tag_name)
+                placeholder.layout_info['parse_skipped'] = True
+                if index is not None:
+                    index.add(placeholder)
+                return placeholder
+
             # Extract attributes
             attributes = dict(soup_node.attrs)
 
@@ -190,24 +383,30 @@ class HTMLParser:
                 attributes=attributes
             )
 
-            # Parse inline styles
-            if 'style' in attributes:
-                dom_node.inline_styles = self.css_parser.parse_inline_style(attributes['style'])
+            if index is not None:
+                index.add(dom_node)
 
-            # Apply default styles for this element
-            if tag_name in self.default_styles:
-                default_style = self.default_styles[tag_name]
-                # Merge default styles with inline styles (inline takes precedence)
-                for prop, value in default_style.items():
-                    if prop not in dom_node.inline_styles:
-                        dom_node.inline_styles[prop] = str(value)
+            # Parse inline styles and apply default styles for this element.
+            # The result is a shared read-only mapping (copy-on-write in DOMNode).
+            if 'style' in attributes or tag_name in self.default_styles:
+                dom_node.share_inline_styles(self._get_inline_styles(tag_name, attributes.get('style')))
+
+            svg_source = self._svg_sources.get(id(soup_node)) if tag_name == 'svg' else None
+            skipped_before = self.parse_filter.stats['skipped_subtrees']
 
             # Recursively process children
             for child in soup_node.children:
-                child_node = self._build_dom_tree(child)
+                child_node = self._build_dom_tree(child, index)
                 if child_node is not None:
                     dom_node.add_child(child_node)
 
+            # Raw SVG content is only usable when nothing inside it was filtered out
+            # and it is well-formed XML; otherwise the SVG is rebuilt from the DOM
+            if (svg_source is not None
+                    and self.parse_filter.stats['skipped_subtrees'] == skipped_before
+                    and _is_well_formed_svg_content(svg_source)):
+                dom_node.layout_info['svg_source'] = svg_source
+
             return dom_node
 
         else:
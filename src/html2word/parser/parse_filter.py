@@ -0,0 +1,128 @@
+"""
+Parse-time element filter.
+
+Decides which elements are dropped while the DOM tree is built, so that
+non-rendered content (inline JS bundles, JSON payloads, templates, metadata)
+never reaches the cascade or style resolution.
+"""
+
+import logging
+import os
+from typing import Dict, Iterable, Optional
+
+from bs4 import NavigableString, Comment, Tag
+
+logger = logging.getLogger(__name__)
+
+
+class ParseFilter:
+    """Tag denylist plus attribute predicates applied during tree construction."""
+
+    # 默认跳过的非渲染标签（<style> 在构建 DOM 之前已被提取并删除）
+    DEFAULT_SKIP_TAGS = frozenset({
+        'script', 'noscript', 'template', 'link', 'meta', 'base'
+    })
+
+    def __init__(
+        self,
+        skip_tags: Optional[Iterable[str]] = None,
+        skip_attributes: Optional[Dict[str, Optional[str]]] = None,
+        enabled: Optional[bool] = None
+    ):
+        """
+        Initialize parse filter.
+
+        Args:
+            skip_tags: Tags whose whole subtree is dropped
+                (defaults to HTML2WORD_PARSE_SKIP_TAGS or DEFAULT_SKIP_TAGS)
+            skip_attributes: Attribute predicates {name: value}; an element matches
+                when it has the attribute and value is None or equal
+                (defaults to HTML2WORD_PARSE_SKIP_ATTRS, e.g. "hidden,type=text/x-template")
+            enabled: Whether filtering is enabled (defaults to HTML2WORD_PARSE_FILTER, true)
+        """
+        if enabled is None:
+            enabled = os.environ.get('HTML2WORD_PARSE_FILTER', 'true').lower() == 'true'
+        self.enabled = enabled
+
+        if skip_tags is None:
+            env_tags = os.environ.get('HTML2WORD_PARSE_SKIP_TAGS')
+            skip_tags = self._parse_list(env_tags) if env_tags is not None else self.DEFAULT_SKIP_TAGS
+        self.skip_tags = frozenset(tag.lower() for tag in skip_tags)
+
+        if skip_attributes is None:
+            skip_attributes = self._parse_attributes(os.environ.get('HTML2WORD_PARSE_SKIP_ATTRS', ''))
+        self.skip_attributes = dict(skip_attributes)
+
+        self.stats = {'skipped_nodes': 0, 'skipped_bytes': 0, 'skipped_subtrees': 0}
+
+    @staticmethod
+    def _parse_list(value: str):
+        """Parse comma-separated list."""
+        return [item.strip() for item in value.split(',') if item.strip()]
+
+    @classmethod
+    def _parse_attributes(cls, value: str) -> Dict[str, Optional[str]]:
+        """Parse "name" / "name=value" comma-separated predicates."""
+        predicates = {}
+        for item in cls._parse_list(value):
+            if '=' in item:
+                name, attr_value = item.split('=', 1)
+                predicates[name.strip().lower()] = attr_value.strip()
+            else:
+                predicates[item.lower()] = None
+        return predicates
+
+    def reset_stats(self):
+        """Reset skipped counters (called at the start of each parse)."""
+        self.stats = {'skipped_nodes': 0, 'skipped_bytes': 0, 'skipped_subtrees': 0}
+
+    def should_skip(self, tag_name: str, attributes: Dict) -> bool:
+        """
+        Check whether an element's content should be dropped.
+
+        Args:
+            tag_name: Element tag name
+            attributes: Element attributes (BeautifulSoup attrs)
+
+        Returns:
+            True if the element subtree should not be materialized
+        """
+        if not self.enabled:
+            return False
+
+        if tag_name in self.skip_tags:
+            return True
+
+        if self.skip_attributes and attributes:
+            for name, expected in self.skip_attributes.items():
+                if name in attributes:
+                    if expected is None:
+                        return True
+                    actual = attributes[name]
+                    if isinstance(actual, list):
+                        actual = ' '.join(actual)
+                    if actual == expected:
+                        return True
+
+        return False
+
+    def record_skipped(self, soup_node: Tag):
+        """
+        Count the descendant nodes and text bytes of a skipped subtree.
+
+        Args:
+            soup_node: BeautifulSoup element being skipped
+        """
+        nodes = 0
+        size = 0
+        for descendant in soup_node.descendants:
+            if isinstance(descendant, Tag):
+                nodes += 1
+            elif isinstance(descendant, NavigableString) and not isinstance(descendant, Comment):
+                if not descendant.isspace():
+                    nodes += 1
+                size += len(descendant.encode('utf-8'))
+
+        self.stats['skipped_subtrees'] += 1
+        self.stats['skipped_nodes'] += nodes
+        self.stats['skipped_bytes'] += size
@@ -75,9 +75,7 @@ class StylesheetManager:
 
         # Merge CSS styles into node's inline styles
         # Inline styles have precedence, so only add CSS styles that aren't already set
-        for prop, value in css_styles.items():
-            if prop not in node.inline_styles:
-                node.inline_styles[prop] = value
+        node.merge_inline_styles(css_styles)
 
         logger.debug(f"Applied {len(matching_rules)} CSS rules to {node.tag}")
 
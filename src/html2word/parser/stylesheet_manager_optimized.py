@@ -16,7 +16,7 @@ from typing import Dict, List, Tuple, Optional, Any, Set
 from dataclasses import dataclass
 import pickle
 
-from html2word.parser.dom_tree import DOMNode
+from html2word.parser.dom_tree import DOMNode, intern_classes, intern_id
 from html2word.parser.css_parser import CSSParser
 from html2word.parser.css_selector import CSSSelector
 from html2word.parser.performance_monitor import (
@@ -362,13 +362,7 @@ class RuleIndex:
 
         # 2. Index by class names
         attributes = node_data.get('attributes', {})
-        node_classes = attributes.get('class', [])
-
-        # Handle both string and list formats
-        if isinstance(node_classes, str):
-            node_classes = node_classes.split()
-        elif not isinstance(node_classes, list):
-            node_classes = []
+        node_classes = intern_classes(attributes.get('class'))[0]
 
         for cls in node_classes:
             if cls in self.class_index:
@@ -541,13 +535,9 @@ class StylesheetManagerOptimized:
             # Merge CSS styles into node's inline styles
             if self.monitor:
                 with self.monitor.timer('style_merge'):
-                    for prop, value in css_styles.items():
-                        if prop not in node.inline_styles:
-                            node.inline_styles[prop] = value
+                    node.merge_inline_styles(css_styles)
             else:
-                for prop, value in css_styles.items():
-                    if prop not in node.inline_styles:
-                        node.inline_styles[prop] = value
+                node.merge_inline_styles(css_styles)
 
             logger.debug(f"Applied {len(matching_rules)} CSS rules to {node.tag}")
 
@@ -890,9 +880,7 @@ class StylesheetManagerOptimized:
                 node = node_map[node_id]
 
                 # Merge styles (inline styles have priority)
-                for prop, value in css_styles.items():
-                    if prop not in node.inline_styles:
-                        node.inline_styles[prop] = value
+                node.merge_inline_styles(css_styles)
 
                 logger.debug(f"Merged {len(css_styles)} styles to node {node.tag}")
 
@@ -914,9 +902,7 @@ class StylesheetManagerOptimized:
                 node = path_to_node[node_path]
 
                 # Merge styles (inline styles have priority)
-                for prop, value in css_styles.items():
-                    if prop not in node.inline_styles:
-                        node.inline_styles[prop] = value
+                node.merge_inline_styles(css_styles)
 
                 if css_styles:
                     merged_count += 1
@@ -1047,6 +1033,8 @@ def process_chunk_worker(
             self.attributes = data.get('attributes', {})
             self.inline_styles = data.get('inline_styles', {})
             self.is_element = True
+            self.class_list, self.class_set, self.class_string = intern_classes(self.attributes.get('class'))
+            self.node_id = intern_id(self.attributes.get('id'))
             self._tree = tree
             self._parent = None
             self._children = None
@@ -1162,6 +1150,8 @@ def process_chunk_worker_indexed(
             self.attributes = data.get('attributes', {})
             self.inline_styles = data.get('inline_styles', {})
             self.is_element = True
+            self.class_list, self.class_set, self.class_string = intern_classes(self.attributes.get('class'))
+            self.node_id = intern_id(self.attributes.get('id'))
             self._tree = tree
             self._parent = None
             self._children = None
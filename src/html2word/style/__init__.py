@@ -9,5 +9,6 @@ from html2word.style.style_resolver import StyleResolver
 from html2word.style.inheritance import StyleInheritance
 from html2word.style.box_model import BoxModel
 from html2word.style.style_normalizer import StyleNormalizer
+from html2word.style.pruner import HiddenSubtreePruner
 
-__all__ = ["StyleResolver", "StyleInheritance", "BoxModel", "StyleNormalizer"]
+__all__ = ["StyleResolver", "StyleInheritance", "BoxModel", "StyleNormalizer", "HiddenSubtreePruner"]
@@ -0,0 +1,167 @@
+"""
+Hidden subtree pruning.
+
+Detaches subtrees that will never be rendered (display:none, visibility:hidden,
+framework templates, script blocks) right after the CSS cascade, so that
+inheritance, normalization, box model calculation and document building never
+visit them.
+"""
+
+import logging
+import os
+from typing import Dict, Set
+
+from html2word.parser.dom_tree import DOMNode, DOMTree
+
+logger = logging.getLogger(__name__)
+
+
+class HiddenSubtreePruner:
+    """Removes non-rendered subtrees from the DOM tree after the cascade."""
+
+    # 不会产生可见内容的标签（模板、脚本）
+    NON_RENDERED_TAGS = frozenset({'template', 'script', 'style', 'noscript'})
+
+    # 框架隐藏模板的 class（Element UI / Vue）
+    HIDDEN_CLASS_MARKERS = ('hidden-columns', 'v-show-false', 'v-if-false')
+
+    # 表格结构元素由 TableBuilder 构建单元格矩阵，删除会导致列错位，不能裁剪
+    TABLE_STRUCTURE_TAGS = frozenset({
+        'table', 'thead', 'tbody', 'tfoot', 'tr', 'td', 'th',
+        'col', 'colgroup', 'caption'
+    })
+
+    # 文档根节点始终保留
+    PROTECTED_TAGS = frozenset({'html', 'body'})
+
+    def __init__(self, enabled: bool = None):
+        """
+        Initialize pruner.
+
+        Args:
+            enabled: Whether pruning is enabled (defaults to HTML2WORD_PRUNE_HIDDEN, true)
+        """
+        if enabled is None:
+            enabled = os.environ.get('HTML2WORD_PRUNE_HIDDEN', 'true').lower() == 'true'
+        self.enabled = enabled
+
+    def prune(self, tree: DOMTree) -> Dict[str, int]:
+        """
+        Detach all non-rendered subtrees from the tree.
+
+        Must run after the cascade (inline_styles populated) and before
+        inheritance, so later phases only see rendered nodes.
+
+        Args:
+            tree: DOM tree
+
+        Returns:
+            Dict with pruned_subtrees / pruned_nodes / pruned_elements counts
+        """
+        stats = {'pruned_subtrees': 0, 'pruned_nodes': 0, 'pruned_elements': 0}
+        if not self.enabled:
+            return stats
+
+        self._prune_children(tree, stats)
+        tree.record_pruned(stats)
+
+        if stats['pruned_subtrees']:
+            logger.info(
+                f"Pruned {stats['pruned_subtrees']} hidden subtrees "
+                f"({stats['pruned_nodes']} nodes, {stats['pruned_elements']} elements)"
+            )
+        return stats
+
+    def _prune_children(self, tree: DOMTree, stats: Dict[str, int]):
+        """Prune hidden subtrees of the tree (iterative to avoid deep recursion)."""
+        protected = self._symbol_ancestors(tree)
+        stack = [tree.root]
+        while stack:
+            current = stack.pop()
+            if not current.children:
+                continue
+
+            kept = []
+            for child in current.children:
+                if child.is_element and id(child) not in protected and self.should_prune(child):
+                    removed_nodes, removed_elements = tree.index.remove_subtree(child)
+                    stats['pruned_nodes'] += removed_nodes
+                    stats['pruned_elements'] += removed_elements
+                    stats['pruned_subtrees'] += 1
+                    child.parent = None
+                    logger.debug(f"Pruned hidden subtree: <{child.tag}> class='{child.attributes.get('class', '')}'")
+                else:
+                    kept.append(child)
+                    if child.is_element:
+                        stack.append(child)
+
+            if len(kept) != len(current.children):
+                current.children = kept
+
+    @staticmethod
+    def _symbol_ancestors(tree: DOMTree) -> Set[int]:
+        """
+        Collect ids of nodes that contain SVG <symbol> definitions.
+
+        Icon sprite sheets are usually hidden (display:none) but are referenced
+        by <use> elsewhere, so they must stay reachable for symbol lookups.
+        """
+        protected = set()
+        for symbol in tree.find_by_tag('symbol'):
+            node = symbol
+            while node is not None and id(node) not in protected:
+                protected.add(id(node))
+                node = node.parent
+        return protected
+
+    @classmethod
+    def should_prune(cls, node: DOMNode) -> bool:
+        """
+        Check whether an element subtree is never rendered.
+
+        Mirrors the rules of DocumentBuilder._should_skip_hidden_element that
+        hold in every build context (block, inline and table cell content),
+        including the exception for non-empty paragraphs with display:none.
+        aria-hidden and generic "hidden" class substrings are still handled at
+        build time, because paragraph and table cell content render them today.
+
+        Args:
+            node: Element node with cascaded inline_styles
+
+        Returns:
+            True if the subtree can be detached
+        """
+        # 解析阶段过滤器留下的占位节点（见 ParseFilter）
+        if node.layout_info.get('parse_skipped'):
+            return True
+
+        tag = node.tag
+        if tag in cls.PROTECTED_TAGS or tag in cls.TABLE_STRUCTURE_TAGS:
+            return False
+
+        if tag in cls.NON_RENDERED_TAGS:
+            return True
+
+        classes = node.class_string
+        if classes:
+            for marker in cls.HIDDEN_CLASS_MARKERS:
+                if marker in classes:
+                    return True
+
+        # 级联结果：display 不继承；visibility 继承自祖先时祖先已被裁剪
+        styles = node.computed_styles or node.inline_styles
+        if not styles:
+            return False
+
+        if styles.get('display', '') == 'none':
+            # 与构建阶段一致：有文本内容的段落不跳过（可能是误匹配的 p:empty 规则）
+            if tag == 'p':
+                text_content = node.get_text_content()
+                if text_content and text_content.strip():
+                    return False
+            return True
+
+        if styles.get('visibility', '') == 'hidden':
+            return True
+
+        return False
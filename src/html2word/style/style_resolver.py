@@ -10,6 +10,7 @@ from html2word.parser.dom_tree import DOMNode, DOMTree
 from html2word.style.inheritance import StyleInheritance
 from html2word.style.style_normalizer import StyleNormalizer
 from html2word.style.box_model import BoxModel
+from html2word.style.pruner import HiddenSubtreePruner
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +22,14 @@ class StyleResolver:
         """Initialize style resolver."""
         self.inheritance = StyleInheritance()
         self.normalizer = StyleNormalizer()
+        self.pruner = HiddenSubtreePruner()
 
     def resolve_styles(self, tree: DOMTree):
         """
         Resolve styles for entire DOM tree.
 
         This is the main entry point that orchestrates:
+        0. Pruning of non-rendered subtrees
         1. Style inheritance
         2. Style normalization
         3. Box model calculation
@@ -36,6 +39,10 @@ class StyleResolver:
         """
         logger.info("Starting style resolution")
 
+        # Step 0: Detach hidden subtrees so later steps never visit them
+        self.pruner.prune(tree)
+        logger.debug("Pruned hidden subtrees")
+
         # Get initial styles from body or root
         initial_styles = self._get_initial_styles(tree)
 
@@ -203,9 +210,7 @@ class StyleResolver:
             return
 
         # Check if this element has classes that might define specific colors
-        classes = node.attributes.get('class', [])
-        if isinstance(classes, str):
-            classes = [classes]
+        classes = node.class_list
 
         # List of class names that define specific colors that should not be overridden
         # Define default colors for these classes
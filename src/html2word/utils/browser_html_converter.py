@@ -2,13 +2,18 @@
 基于浏览器的 HTML 转 PNG 转换器
 使用 Chrome headless 模式渲染 HTML 片段（含背景图+绝对定位文字），获得像素级精确的截图
 """
-import io
 import logging
 import tempfile
+import time
 import subprocess
 import os
-import hashlib
-from typing import Optional, Dict
+from typing import Optional
+
+from html2word.utils.browser_session import get_browser_session
+from html2word.utils.raster_sizing import (
+    compute_render_scale, encode_png, get_raster_metrics, scaled_size
+)
+from html2word.utils.render_cache import get_render_cache, make_render_key
 
 logger = logging.getLogger(__name__)
 
@@ -17,12 +22,12 @@ class BrowserHTMLConverter:
     """
     使用浏览器渲染 HTML 片段的转换器
     主要用于将带有背景图和绝对定位文字的 HTML 元素转换为 PNG 图片
-    仅使用 Chrome subprocess 方式，无需 Selenium
+    优先使用持久化浏览器会话（DevTools 管道），回退到 Chrome subprocess，无需 Selenium
     """
 
     def __init__(self):
-        # HTML 转换结果缓存 (html_hash -> png_bytes)
-        self._cache: Dict[str, bytes] = {}
+        # HTML 转换结果缓存（内存 LRU + 磁盘，与 SVG 转换器共享）
+        self._cache = get_render_cache()
         self._chrome_exe: Optional[str] = None
 
     def _find_chrome(self) -> Optional[str]:
@@ -52,17 +57,20 @@ class BrowserHTMLConverter:
         logger.debug("Chrome executable not found")
         return None
 
-    def _get_html_hash(self, html_content: str, width: int, height: int) -> str:
-        """生成 HTML 内容的唯一标识"""
-        key = f"{html_content}_{width}_{height}"
-        return hashlib.md5(key.encode()).hexdigest()
+    def _get_html_hash(self, html_content: str, width: int, height: int,
+                       display_width_pt: Optional[float] = None) -> str:
+        """生成 HTML 内容的唯一标识（包含缩放因子与渲染器版本）"""
+        scale_factor = compute_render_scale(width, height, display_width_pt)
+        return make_render_key('html', html_content, width, height, scale_factor)
 
-    def get_cached(self, html_content: str, width: int, height: int) -> Optional[bytes]:
+    def get_cached(self, html_content: str, width: int, height: int,
+                   display_width_pt: Optional[float] = None) -> Optional[bytes]:
         """从缓存获取已转换的 PNG"""
-        html_hash = self._get_html_hash(html_content, width, height)
+        html_hash = self._get_html_hash(html_content, width, height, display_width_pt)
         return self._cache.get(html_hash)
 
-    def convert(self, html_content: str, width: int, height: int) -> Optional[bytes]:
+    def convert(self, html_content: str, width: int, height: int,
+                display_width_pt: Optional[float] = None) -> Optional[bytes]:
         """
         使用 Chrome headless 渲染 HTML 并转换为 PNG
 
@@ -70,27 +78,64 @@ class BrowserHTMLConverter:
             html_content: 完整的 HTML 文档字符串（包含 DOCTYPE、head、body）
             width: 目标宽度（像素）
             height: 目标高度（像素）
+            display_width_pt: 在文档中的显示宽度（磅），用于选择缩放因子；为空时按 96 DPI 换算 width
 
         Returns:
             PNG 图片数据（bytes）或 None
         """
         # 先检查缓存
-        cached = self.get_cached(html_content, width, height)
+        cached = self.get_cached(html_content, width, height, display_width_pt)
         if cached:
             logger.debug(f"HTML cache hit for {width}x{height}")
             return cached
 
-        # 使用 Chrome subprocess 方法
-        result = self._convert_with_chrome(html_content, width, height)
+        start_time = time.time()
+        scale_factor = compute_render_scale(width, height, display_width_pt)
+
+        # 持久化浏览器会话优先，回退到 Chrome subprocess
+        result = self._convert_with_browser_session(html_content, width, height, scale_factor)
+        if not result:
+            result = self._convert_with_chrome(html_content, width, height, scale_factor)
         if result:
+            get_raster_metrics().record('html', result, time.time() - start_time, scale_factor)
             # 存入缓存
-            html_hash = self._get_html_hash(html_content, width, height)
-            self._cache[html_hash] = result
+            html_hash = self._get_html_hash(html_content, width, height, display_width_pt)
+            self._cache.put(html_hash, result)
             return result
 
         return None
 
-    def _convert_with_chrome(self, html_content: str, width: int, height: int) -> Optional[bytes]:
+    def _convert_with_browser_session(self, html_content: str, width: int, height: int,
+                                      scale_factor: float) -> Optional[bytes]:
+        """
+        使用持久化浏览器会话（DevTools）截图，无需为每个片段启动 Chrome
+
+        Args:
+            html_content: 完整的 HTML 文档
+            width: 目标宽度（像素）
+            height: 目标高度（像素）
+            scale_factor: 设备缩放因子
+
+        Returns:
+            PNG 图片数据（bytes）或 None
+        """
+        session = get_browser_session()
+        if session is None:
+            return None
+
+        # 与 subprocess 方式一致：极小尺寸使用 16px 窗口，截图区域裁剪为实际尺寸
+        min_size = 16
+        png_data = session.screenshot_html(
+            html_content, width, height,
+            viewport_width=max(width, min_size), viewport_height=max(height, min_size),
+            scale=scale_factor
+        )
+        if png_data:
+            logger.info(f"Browser session: rendered HTML to PNG ({width}x{height} at {scale_factor}x scale, {len(png_data)} bytes)")
+        return png_data
+
+    def _convert_with_chrome(self, html_content: str, width: int, height: int,
+                             scale_factor: float) -> Optional[bytes]:
         """
         使用 Chrome headless 模式直接截图
 
@@ -98,6 +143,7 @@ class BrowserHTMLConverter:
             html_content: 完整的 HTML 文档
             width: 目标宽度（像素）
             height: 目标高度（像素）
+            scale_factor: 设备缩放因子
 
         Returns:
             PNG 图片数据（bytes）或 None
@@ -127,10 +173,6 @@ class BrowserHTMLConverter:
             # 创建临时 PNG 文件
             png_file = tempfile.mktemp(suffix='.png')
 
-            # 使用 2x 或 3x 缩放因子提高截图清晰度
-            # 可以通过环境变量配置，默认 2x
-            scale_factor = int(os.environ.get('HTML2WORD_SCREENSHOT_SCALE', '2'))
-
             try:
                 # 使用 Chrome headless 截图
                 cmd = [
@@ -163,19 +205,15 @@ class BrowserHTMLConverter:
                     from PIL import Image
 
                     # Chrome 生成的图片会按 scale_factor 放大
-                    scaled_width = width * scale_factor
-                    scaled_height = height * scale_factor
-                    scaled_target_width = target_width * scale_factor
-                    scaled_target_height = target_height * scale_factor
+                    scaled_width, scaled_height = scaled_size(width, height, scale_factor)
+                    scaled_target_width, scaled_target_height = scaled_size(target_width, target_height, scale_factor)
 
                     if use_cropping:
                         try:
                             with Image.open(png_file) as img:
                                 # 裁剪到实际需要的尺寸（保持高分辨率，不缩放）
                                 cropped = img.crop((0, 0, scaled_width, scaled_height))
-                                output = io.BytesIO()
-                                cropped.save(output, format='PNG', optimize=True)
-                                png_data = output.getvalue()
+                                png_data = encode_png(cropped)
                                 logger.debug(f"Cropped high-res PNG: {scaled_target_width}x{scaled_target_height} -> {scaled_width}x{scaled_height} (kept at {scale_factor}x resolution)")
                         except Exception as e:
                             logger.warning(f"Failed to crop high-res image: {e}")
@@ -0,0 +1,509 @@
+"""
+持久化 Chrome headless 会话
+每个进程只启动一次 Chrome，通过 DevTools 协议（--remote-debugging-pipe）通信，
+在可复用的标签页中渲染多个页面/截图，避免每张图片都启动一个 Chrome 进程。
+
+浏览器崩溃时自动重启；无法建立会话时（未找到 Chrome、Windows 不支持管道等）
+返回 None，由调用方回退到原有的 subprocess 截图方式。
+"""
+import atexit
+import base64
+import json
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHROME_PATHS = [
+    # Windows
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe"),
+    # Linux
+    "/usr/bin/google-chrome",
+    "/usr/bin/google-chrome-stable",
+    "/usr/bin/chromium-browser",
+    "/usr/bin/chromium",
+    # Mac
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+
+def find_chrome_executable() -> Optional[str]:
+    """查找 Chrome 可执行文件（HTML2WORD_CHROME_PATH 优先）"""
+    env_path = os.environ.get('HTML2WORD_CHROME_PATH')
+    if env_path and os.path.exists(env_path):
+        return env_path
+    for path in CHROME_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class BrowserSessionError(Exception):
+    """DevTools 会话错误（命令失败、超时或浏览器退出）"""
+
+
+class _Tab:
+    """一个已附加（flatten 模式）的标签页"""
+
+    def __init__(self, target_id: str, session_id: str):
+        self.target_id = target_id
+        self.session_id = session_id
+        self.transparent = False
+
+
+class BrowserSession:
+    """
+    通过 DevTools 管道协议控制的持久化 Chrome 进程
+
+    消息格式：JSON，以 NUL 字节分隔；Chrome 从 fd 3 读取命令，向 fd 4 写入响应/事件。
+    """
+
+    # 崩溃后最多自动重启次数
+    MAX_RESTARTS = 3
+
+    def __init__(self, chrome_exe: Optional[str] = None, max_tabs: Optional[int] = None):
+        """
+        Args:
+            chrome_exe: Chrome 可执行文件路径（默认自动查找）
+            max_tabs: 最大并发标签页数（默认 HTML2WORD_BROWSER_TABS 或 4）
+        """
+        self.chrome_exe = chrome_exe or find_chrome_executable()
+        self.max_tabs = max_tabs or int(os.environ.get('HTML2WORD_BROWSER_TABS', '4'))
+
+        self._process: Optional[subprocess.Popen] = None
+        self._write_fd: Optional[int] = None
+        self._read_fd: Optional[int] = None
+        self._reader: Optional[threading.Thread] = None
+        self._user_data_dir: Optional[str] = None
+
+        self._lock = threading.RLock()       # 启动/重启
+        self._write_lock = threading.Lock()  # 管道写入
+        self._next_id = 0
+        self._pending: Dict[int, Tuple[threading.Event, List[Any]]] = {}
+        self._event_waiters: Dict[Tuple[str, str], threading.Event] = {}
+
+        self._idle_tabs: "queue.LifoQueue[_Tab]" = queue.LifoQueue()
+        self._tab_slots = threading.BoundedSemaphore(self.max_tabs)
+        self._generation = 0   # 每次（重）启动 +1，旧标签页随之失效
+        self._restarts = 0
+        self._alive = False
+
+        self.stats = {'renders': 0, 'failures': 0, 'restarts': 0, 'tabs_created': 0}
+
+    # ------------------------------------------------------------------ #
+    # 进程生命周期
+    # ------------------------------------------------------------------ #
+
+    def is_supported(self) -> bool:
+        """当前平台是否可以使用管道会话"""
+        return bool(self.chrome_exe) and os.name == 'posix'
+
+    def _ensure_started(self) -> bool:
+        """确保浏览器在运行；崩溃时重启。返回是否可用。"""
+        with self._lock:
+            if self._alive and self._process is not None and self._process.poll() is None:
+                return True
+
+            if self._restarts > self.MAX_RESTARTS:
+                return False
+
+            if self._process is not None:
+                # 进程已退出（崩溃）：清理后重启
+                self._restarts += 1
+                self.stats['restarts'] += 1
+                logger.warning(f"Browser session died, restarting ({self._restarts}/{self.MAX_RESTARTS})")
+                self._shutdown_process()
+                if self._restarts > self.MAX_RESTARTS:
+                    return False
+
+            try:
+                self._start_process()
+                return True
+            except Exception as e:
+                # 启动失败也计入重启次数，避免每次渲染都尝试启动
+                self._restarts += 1
+                logger.warning(f"Failed to start browser session: {e}")
+                self._shutdown_process()
+                return False
+
+    def _start_process(self):
+        """启动 Chrome 并建立管道"""
+        import fcntl
+
+        # parent -> chrome (chrome fd 3), chrome -> parent (chrome fd 4)
+        cmd_read, cmd_write = os.pipe()
+        resp_read, resp_write = os.pipe()
+
+        def _setup_pipes():
+            # 先复制到 >=5 的描述符，避免 dup2 覆盖尚未复制的管道端
+            in_fd = fcntl.fcntl(cmd_read, fcntl.F_DUPFD, 5)
+            out_fd = fcntl.fcntl(resp_write, fcntl.F_DUPFD, 5)
+            os.dup2(in_fd, 3)
+            os.dup2(out_fd, 4)
+
+        self._user_data_dir = tempfile.mkdtemp(prefix='html2word_chrome_')
+        cmd = [
+            self.chrome_exe,
+            '--headless=new',
+            '--disable-gpu',
+            '--no-sandbox',
+            '--hide-scrollbars',
+            '--no-first-run',
+            '--no-default-browser-check',
+            '--disable-extensions',
+            '--disable-background-networking',
+            '--mute-audio',
+            '--remote-debugging-pipe',
+            f'--user-data-dir={self._user_data_dir}',
+            'about:blank',
+        ]
+
+        try:
+            self._process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                preexec_fn=_setup_pipes,
+                pass_fds=(3, 4),
+            )
+        finally:
+            os.close(cmd_read)
+            os.close(resp_write)
+
+        self._write_fd = cmd_write
+        self._read_fd = resp_read
+        self._generation += 1
+        self._alive = True
+        self._idle_tabs = queue.LifoQueue()
+
+        self._reader = threading.Thread(target=self._read_loop, args=(resp_read, self._generation), daemon=True,
+                                        name='html2word-devtools-reader')
+        self._reader.start()
+
+        # 握手：确认协议可用
+        version = self.send('Browser.getVersion', timeout=10)
+        logger.info(f"Browser session started: {version.get('product', 'unknown')} (pid {self._process.pid})")
+
+    def _shutdown_process(self):
+        """终止浏览器进程并清理资源"""
+        self._alive = False
+        process = self._process
+        self._process = None
+
+        if process is not None and process.poll() is None:
+            try:
+                self._send_raw({'id': -1, 'method': 'Browser.close'})
+                process.wait(timeout=3)
+            except Exception:
+                try:
+                    process.kill()
+                    process.wait(timeout=3)
+                except Exception:
+                    pass
+
+        for fd in (self._write_fd, self._read_fd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._write_fd = None
+        self._read_fd = None
+
+        self._fail_pending("browser session closed")
+
+        if self._user_data_dir:
+            shutil.rmtree(self._user_data_dir, ignore_errors=True)
+            self._user_data_dir = None
+
+    def close(self):
+        """关闭会话（进程退出时自动调用）"""
+        with self._lock:
+            self._shutdown_process()
+
+    # ------------------------------------------------------------------ #
+    # 协议收发
+    # ------------------------------------------------------------------ #
+
+    def _read_loop(self, read_fd: int, generation: int):
+        """后台线程：读取 NUL 分隔的消息并分发"""
+        buffer = b''
+        try:
+            while True:
+                chunk = os.read(read_fd, 1 << 20)
+                if not chunk:
+                    break
+                buffer += chunk
+                while b'\0' in buffer:
+                    raw, buffer = buffer.split(b'\0', 1)
+                    if raw:
+                        self._dispatch(json.loads(raw))
+        except OSError:
+            pass
+        except Exception as e:
+            logger.debug(f"DevTools reader stopped: {e}")
+
+        # 管道关闭：浏览器已退出（若期间已重启则不影响新会话）
+        if generation == self._generation:
+            self._alive = False
+            self._fail_pending("browser process exited")
+
+    def _dispatch(self, message: Dict[str, Any]):
+        """分发响应或事件"""
+        msg_id = message.get('id')
+        if msg_id is not None:
+            waiter = self._pending.pop(msg_id, None)
+            if waiter is not None:
+                event, slot = waiter
+                slot.append(message)
+                event.set()
+            return
+
+        method = message.get('method')
+        if method:
+            waiter = self._event_waiters.pop((message.get('sessionId', ''), method), None)
+            if waiter is not None:
+                waiter.set()
+
+    def _fail_pending(self, reason: str):
+        """唤醒所有等待中的调用"""
+        pending = list(self._pending.values())
+        self._pending.clear()
+        for event, slot in pending:
+            slot.append({'error': {'message': reason}})
+            event.set()
+
+    def _send_raw(self, message: Dict[str, Any]):
+        """写入一条消息"""
+        data = json.dumps(message).encode('utf-8') + b'\0'
+        with self._write_lock:
+            if self._write_fd is None:
+                raise BrowserSessionError("browser session not running")
+            view = memoryview(data)
+            while view:
+                written = os.write(self._write_fd, view)
+                view = view[written:]
+
+    def send(self, method: str, params: Optional[Dict[str, Any]] = None,
+             session_id: Optional[str] = None, timeout: float = 15) -> Dict[str, Any]:
+        """
+        发送 DevTools 命令并等待结果
+
+        Args:
+            method: 协议方法名，如 "Page.navigate"
+            params: 参数
+            session_id: 目标会话（flatten 模式）
+            timeout: 超时（秒）
+
+        Returns:
+            result 字典
+
+        Raises:
+            BrowserSessionError: 命令失败、超时或浏览器退出
+        """
+        with self._write_lock:
+            self._next_id += 1
+            msg_id = self._next_id
+
+        event = threading.Event()
+        slot: List[Any] = []
+        self._pending[msg_id] = (event, slot)
+
+        message: Dict[str, Any] = {'id': msg_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+
+        try:
+            self._send_raw(message)
+        except OSError as e:
+            self._pending.pop(msg_id, None)
+            self._alive = False
+            raise BrowserSessionError(f"{method}: {e}")
+
+        if not event.wait(timeout):
+            self._pending.pop(msg_id, None)
+            raise BrowserSessionError(f"{method}: timed out after {timeout}s")
+
+        response = slot[0]
+        if 'error' in response:
+            raise BrowserSessionError(f"{method}: {response['error'].get('message')}")
+        return response.get('result', {})
+
+    # ------------------------------------------------------------------ #
+    # 标签页池
+    # ------------------------------------------------------------------ #
+
+    def _create_tab(self) -> _Tab:
+        """新建并附加一个标签页"""
+        target_id = self.send('Target.createTarget', {'url': 'about:blank'})['targetId']
+        session_id = self.send('Target.attachToTarget', {'targetId': target_id, 'flatten': True})['sessionId']
+        self.send('Page.enable', session_id=session_id)
+        self.stats['tabs_created'] += 1
+        return _Tab(target_id, session_id)
+
+    def _acquire_tab(self, timeout: float) -> Tuple[_Tab, int]:
+        """获取空闲标签页（无空闲时新建，受 max_tabs 限制）"""
+        if not self._tab_slots.acquire(timeout=timeout):
+            raise BrowserSessionError("no free browser tab")
+        generation = self._generation
+        try:
+            try:
+                return self._idle_tabs.get_nowait(), generation
+            except queue.Empty:
+                return self._create_tab(), generation
+        except Exception:
+            self._tab_slots.release()
+            raise
+
+    def _release_tab(self, tab: _Tab, generation: int, healthy: bool):
+        """归还标签页；出错的标签页直接关闭"""
+        try:
+            if generation != self._generation:
+                return  # 浏览器已重启，旧标签页失效
+            if healthy:
+                self._idle_tabs.put(tab)
+            else:
+                try:
+                    self.send('Target.closeTarget', {'targetId': tab.target_id}, timeout=5)
+                except Exception:
+                    pass
+        finally:
+            self._tab_slots.release()
+
+    # ------------------------------------------------------------------ #
+    # 渲染
+    # ------------------------------------------------------------------ #
+
+    def screenshot_html(self, html_content: str, width: int, height: int,
+                        viewport_width: Optional[int] = None, viewport_height: Optional[int] = None,
+                        scale: float = 1, transparent: bool = False,
+                        timeout: float = 15) -> Optional[bytes]:
+        """
+        在复用的标签页中加载 HTML 并截图
+
+        Args:
+            html_content: 完整 HTML 文档
+            width: 截图区域宽度（CSS 像素）
+            height: 截图区域高度（CSS 像素）
+            viewport_width: 视口宽度（默认等于 width，极小尺寸时可更大）
+            viewport_height: 视口高度（默认等于 height）
+            scale: 设备缩放因子
+            transparent: 是否使用透明背景
+            timeout: 单次渲染超时（秒）
+
+        Returns:
+            PNG 数据，失败返回 None
+        """
+        if not self.is_supported() or not self._ensure_started():
+            return None
+
+        deadline = time.time() + timeout
+        tab, generation = None, self._generation
+        healthy = False
+        html_file = None
+        try:
+            tab, generation = self._acquire_tab(timeout)
+            sid = tab.session_id
+
+            def remaining() -> float:
+                left = deadline - time.time()
+                if left <= 0:
+                    raise BrowserSessionError("render deadline exceeded")
+                return left
+
+            self.send('Emulation.setDeviceMetricsOverride', {
+                'width': viewport_width or width,
+                'height': viewport_height or height,
+                'deviceScaleFactor': scale,
+                'mobile': False,
+            }, session_id=sid, timeout=remaining())
+
+            if transparent != tab.transparent:
+                params = {'color': {'r': 0, 'g': 0, 'b': 0, 'a': 0}} if transparent else {}
+                self.send('Emulation.setDefaultBackgroundColorOverride', params,
+                          session_id=sid, timeout=remaining())
+                tab.transparent = transparent
+
+            # 与 subprocess 方式一致：通过 file:// 加载，保证相对/本地资源可访问
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False,
+                                             encoding='utf-8', dir=self._user_data_dir) as f:
+                f.write(html_content)
+                html_file = f.name
+
+            load_event = threading.Event()
+            self._event_waiters[(sid, 'Page.loadEventFired')] = load_event
+            self.send('Page.navigate', {'url': 'file://' + html_file}, session_id=sid, timeout=remaining())
+            if not load_event.wait(remaining()):
+                raise BrowserSessionError("page load timed out")
+
+            # 等待 Web 字体就绪
+            self.send('Runtime.evaluate', {
+                'expression': 'document.fonts ? document.fonts.ready.then(() => true) : true',
+                'awaitPromise': True,
+            }, session_id=sid, timeout=remaining())
+
+            result = self.send('Page.captureScreenshot', {
+                'format': 'png',
+                'clip': {'x': 0, 'y': 0, 'width': width, 'height': height, 'scale': 1},
+            }, session_id=sid, timeout=remaining())
+
+            png_data = base64.b64decode(result['data'])
+            healthy = True
+            self.stats['renders'] += 1
+            return png_data
+
+        except Exception as e:
+            self.stats['failures'] += 1
+            logger.debug(f"Browser session render failed ({width}x{height}): {e}")
+            return None
+
+        finally:
+            if tab is not None:
+                self._event_waiters.pop((tab.session_id, 'Page.loadEventFired'), None)
+                self._release_tab(tab, generation, healthy)
+            if html_file:
+                try:
+                    os.unlink(html_file)
+                except OSError:
+                    pass
+
+
+# 全局单例
+_browser_session: Optional[BrowserSession] = None
+_browser_session_checked = False
+_browser_session_lock = threading.Lock()
+
+
+def get_browser_session() -> Optional[BrowserSession]:
+    """
+    获取持久化浏览器会话单例
+
+    通过 HTML2WORD_BROWSER_SESSION=false 可关闭（始终使用 subprocess 方式）。
+
+    Returns:
+        BrowserSession，不可用时返回 None
+    """
+    global _browser_session, _browser_session_checked
+    if os.environ.get('HTML2WORD_BROWSER_SESSION', 'true').lower() != 'true':
+        return None
+
+    with _browser_session_lock:
+        if not _browser_session_checked:
+            _browser_session_checked = True
+            session = BrowserSession()
+            if session.is_supported():
+                _browser_session = session
+                atexit.register(session.close)
+            else:
+                logger.debug("Persistent browser session not supported here, using subprocess rendering")
+    return _browser_session
@@ -8,10 +8,17 @@ import tempfile
 import time
 import subprocess
 import os
-import hashlib
+import html
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, List, Tuple, Dict
 
+from html2word.utils.browser_session import get_browser_session, find_chrome_executable
+from html2word.utils.raster_sizing import (
+    compute_render_scale, encode_png, get_raster_metrics, scaled_size
+)
+from html2word.utils.render_cache import get_render_cache, make_render_key
+from html2word.utils.svg_rasterizer import get_svg_rasterizer
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,17 +26,34 @@ class BrowserSVGConverter:
     """
     使用浏览器渲染SVG的转换器
     支持复杂的SVG图表（如echarts、d3.js等）
-    仅使用Chrome subprocess方式，无需Selenium
+    优先使用持久化浏览器会话（DevTools 管道），回退到 Chrome subprocess，无需Selenium
     """
 
-    def __init__(self):
-        # SVG转换结果缓存 (svg_hash -> png_bytes)
-        self._svg_cache: Dict[str, bytes] = {}
+    # 精灵图（sprite sheet）批量渲染：单页的最大边长（CSS 像素）与最大图块数
+    SPRITE_MAX_SIZE = int(os.environ.get('HTML2WORD_SPRITE_MAX_SIZE', '4096'))
+    SPRITE_MAX_TILES = int(os.environ.get('HTML2WORD_SPRITE_MAX_TILES', '48'))
+    # 图块之间的间隔，避免抗锯齿边缘渗入相邻图块
+    SPRITE_GAP = 4
+
+    def __init__(self, sprite_batch: bool = None):
+        """
+        Args:
+            sprite_batch: 是否启用精灵图批量渲染（默认读取 HTML2WORD_SVG_SPRITE_BATCH，true）
+        """
+        # SVG转换结果缓存（内存 LRU + 磁盘，与 HTML 转换器共享）
+        self._cache = get_render_cache()
+        if sprite_batch is None:
+            sprite_batch = os.environ.get('HTML2WORD_SVG_SPRITE_BATCH', 'true').lower() == 'true'
+        self.sprite_batch = sprite_batch
+
+    @staticmethod
+    def _get_scale_factor(width: int, height: int) -> float:
+        """截图缩放因子：按显示尺寸与输出 DPI 计算（见 compute_render_scale）"""
+        return compute_render_scale(width, height)
 
     def _get_svg_hash(self, svg_content: str, width: int, height: int) -> str:
-        """生成SVG内容的唯一标识"""
-        key = f"{svg_content}_{width}_{height}"
-        return hashlib.md5(key.encode()).hexdigest()
+        """生成SVG内容的唯一标识（包含缩放因子与渲染器版本）"""
+        return make_render_key('svg', svg_content, width, height, self._get_scale_factor(width, height))
 
     def convert_batch(self, svg_list: List[Tuple[str, int, int]], max_workers: int = 4) -> Dict[str, bytes]:
         """
@@ -40,29 +64,79 @@ class BrowserSVGConverter:
             max_workers: 最大并行工作线程数
 
         Returns:
-            {svg_hash: png_bytes} 字典
+            本次新渲染的 {svg_hash: png_bytes} 字典（已缓存的可通过 get_cached 获取）
         """
+        results: Dict[str, bytes] = {}
         if not svg_list:
-            return {}
+            return results
 
-        # 过滤已缓存的SVG
+        # 过滤已缓存的SVG（同一批次内的重复项只渲染一次）
         to_convert = []
+        seen = set()
         for svg_content, width, height in svg_list:
             svg_hash = self._get_svg_hash(svg_content, width, height)
-            if svg_hash not in self._svg_cache:
+            if svg_hash not in seen and not self._cache.contains(svg_hash):
+                seen.add(svg_hash)
                 to_convert.append((svg_hash, svg_content, width, height))
 
         if not to_convert:
             logger.info(f"All {len(svg_list)} SVGs already cached")
-            return self._svg_cache
+            return results
 
-        logger.info(f"Batch converting {len(to_convert)} SVGs with {max_workers} workers...")
         start_time = time.time()
+
+        # 简单SVG（图标、纯图形）先在进程内光栅化，其余交给浏览器
+        rasterizer = get_svg_rasterizer()
+        metrics = get_raster_metrics()
+        browser_items = []
+        for item in to_convert:
+            svg_hash, svg_content, width, height = item
+            scale_factor = self._get_scale_factor(width, height)
+            item_start = time.time()
+            png_data = rasterizer.rasterize(svg_content, width, height, scale_factor)
+            if png_data:
+                metrics.record('svg', png_data, time.time() - item_start, scale_factor)
+                self._store(svg_hash, png_data, results)
+            else:
+                browser_items.append(item)
+        if len(browser_items) < len(to_convert):
+            logger.info(f"Rasterized {len(to_convert) - len(browser_items)} SVGs in-process, "
+                        f"{len(browser_items)} left for the browser")
+
+        # 精灵图模式：多个SVG排布在同一页面，一次截图后逐块裁剪
+        pending = browser_items
+        if self.sprite_batch and len(browser_items) > 1:
+            pending = self._convert_sprite_sheets(browser_items, results)
+
+        if pending:
+            self._convert_individually(pending, max_workers, results)
+
+        elapsed = time.time() - start_time
+        logger.info(f"Batch converted {len(results)}/{len(to_convert)} SVGs in {elapsed:.2f}s")
+
+        return results
+
+    def _store(self, svg_hash: str, png_data: bytes, results: Dict[str, bytes]):
+        """写入共享缓存并记录到本次批量结果"""
+        self._cache.put(svg_hash, png_data)
+        results[svg_hash] = png_data
+
+    def _convert_individually(self, to_convert: List[Tuple[str, str, int, int]], max_workers: int,
+                              results: Dict[str, bytes]):
+        """
+        逐个渲染SVG（线程池并行）
+
+        Args:
+            to_convert: [(svg_hash, svg_content, width, height), ...] 列表
+            max_workers: 最大并行工作线程数
+            results: 渲染结果输出字典
+        """
+        logger.info(f"Batch converting {len(to_convert)} SVGs with {max_workers} workers...")
         completed_count = 0
 
         def convert_single(args):
             svg_hash, svg_content, width, height = args
-            png_data = self._convert_with_chrome_subprocess(svg_content, width, height)
+            png_data = self._render_svg(svg_content, width, height)
             return svg_hash, png_data
 
         # 使用线程池并行转换，设置总体超时
@@ -76,7 +150,7 @@ class BrowserSVGConverter:
                         svg_hash, png_data = future.result(timeout=15)
                         completed_count += 1
                         if png_data:
-                            self._svg_cache[svg_hash] = png_data
+                            self._store(svg_hash, png_data, results)
                         # 进度日志
                         if completed_count % 5 == 0:
                             logger.info(f"SVG batch progress: {completed_count}/{len(to_convert)}")
@@ -89,16 +163,235 @@ class BrowserSVGConverter:
                 for future in futures:
                     future.cancel()
 
-        elapsed = time.time() - start_time
-        success_count = sum(1 for h, _, _, _ in to_convert if h in self._svg_cache)
-        logger.info(f"Batch converted {success_count}/{len(to_convert)} SVGs in {elapsed:.2f}s")
+    def _pack_sprite_sheets(self, items: List[Tuple[str, str, int, int]]):
+        """
+        按行（shelf）排布图块，超出尺寸或数量上限时换页
+
+        Args:
+            items: [(svg_hash, svg_content, width, height), ...] 列表
+
+        Returns:
+            (sheets, oversized)：sheets 为 [(sheet_width, sheet_height, [(item, x, y), ...]), ...]，
+            oversized 为单个就超出页面上限、需要单独渲染的条目
+        """
+        gap = self.SPRITE_GAP
+        max_size = self.SPRITE_MAX_SIZE
+        sheets = []
+        oversized = []
+
+        tiles, sheet_width, sheet_height = [], 0, 0
+        x, y, row_height = 0, 0, 0
+
+        def flush():
+            if tiles:
+                sheets.append((sheet_width, sheet_height, tiles))
+
+        # 按高度降序排列，行内高度接近，减少空白
+        for item in sorted(items, key=lambda it: (-it[3], -it[2])):
+            width, height = item[2], item[3]
+            if width <= 0 or height <= 0 or width > max_size or height > max_size:
+                oversized.append(item)
+                continue
+
+            if x and x + width > max_size:
+                # 换行
+                x, y, row_height = 0, y + row_height + gap, 0
+            if (y and y + height > max_size) or len(tiles) >= self.SPRITE_MAX_TILES:
+                # 换页
+                flush()
+                tiles, sheet_width, sheet_height = [], 0, 0
+                x, y, row_height = 0, 0, 0
+
+            tiles.append((item, x, y))
+            sheet_width = max(sheet_width, x + width)
+            sheet_height = max(sheet_height, y + height)
+            row_height = max(row_height, height)
+            x += width + gap
+
+        flush()
+        return sheets, oversized
+
+    def _build_sprite_page(self, sheet_width: int, sheet_height: int, tiles) -> str:
+        """
+        生成精灵图页面：每个SVG放在独立的 iframe 中（隔离 id 与 <style>），绝对定位
+
+        Args:
+            sheet_width: 页面宽度（像素）
+            sheet_height: 页面高度（像素）
+            tiles: [(item, x, y), ...]
+
+        Returns:
+            完整 HTML 文档
+        """
+        frames = []
+        for (_, svg_content, width, height), x, y in tiles:
+            page = self._build_svg_page(svg_content, width, height, width, height)
+            frames.append(
+                f'<iframe scrolling="no" style="left:{x}px;top:{y}px;width:{width}px;height:{height}px" '
+                f'srcdoc="{html.escape(page, quote=True)}"></iframe>'
+            )
+
+        return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<style>
+    * {{ margin: 0; padding: 0; }}
+    html, body {{
+        width: {sheet_width}px;
+        height: {sheet_height}px;
+        overflow: hidden;
+        background: white;
+    }}
+    iframe {{ position: absolute; border: 0; display: block; }}
+</style>
+</head>
+<body>
+{''.join(frames)}
+</body>
+</html>"""
+
+    def _convert_sprite_sheets(self, to_convert: List[Tuple[str, str, int, int]],
+                               results: Dict[str, bytes]) -> List[Tuple[str, str, int, int]]:
+        """
+        精灵图批量渲染：每页一次浏览器截图，再用PIL裁剪出各个图块
+
+        Args:
+            to_convert: [(svg_hash, svg_content, width, height), ...] 列表
+            results: 渲染结果输出字典
+
+        Returns:
+            未能通过精灵图渲染的条目（由调用方逐个渲染）
+        """
+        try:
+            from PIL import Image
+        except ImportError:
+            logger.debug("PIL not installed, sprite sheet batch disabled")
+            return to_convert
+
+        # 同一页面只能使用一个缩放因子：按各 SVG 的缩放因子分组排布
+        groups: Dict[float, List[Tuple[str, str, int, int]]] = {}
+        for item in to_convert:
+            groups.setdefault(self._get_scale_factor(item[2], item[3]), []).append(item)
+
+        sheets, pending = [], []
+        for scale_factor, group_items in groups.items():
+            group_sheets, oversized = self._pack_sprite_sheets(group_items)
+            sheets.extend((scale_factor, sheet) for sheet in group_sheets)
+            pending.extend(oversized)
+        logger.info(f"Sprite batch: {len(to_convert) - len(pending)} SVGs on {len(sheets)} sheet(s)")
+
+        metrics = get_raster_metrics()
+        for scale_factor, (sheet_width, sheet_height, tiles) in sheets:
+            # 单个图块的页面没有收益，直接走逐个渲染
+            if len(tiles) == 1:
+                pending.append(tiles[0][0])
+                continue
+
+            sheet_start = time.time()
+            html_content = self._build_sprite_page(sheet_width, sheet_height, tiles)
+            sheet_png = self._capture_page(html_content, sheet_width, sheet_height, scale_factor)
+            if not sheet_png:
+                pending.extend(item for item, _, _ in tiles)
+                continue
+            # 整页截图耗时平均分摊到各图块
+            capture_share = (time.time() - sheet_start) / len(tiles)
+
+            try:
+                with Image.open(io.BytesIO(sheet_png)) as sheet:
+                    expected = scaled_size(sheet_width, sheet_height, scale_factor)
+                    # 非整数缩放因子下浏览器的取整可能相差 1 像素
+                    if abs(sheet.size[0] - expected[0]) > 1 or abs(sheet.size[1] - expected[1]) > 1:
+                        logger.warning(f"Sprite sheet size mismatch: {sheet.size} != {expected}")
+                        pending.extend(item for item, _, _ in tiles)
+                        continue
+
+                    sheet.load()
+                    for (svg_hash, _, width, height), x, y in tiles:
+                        crop_start = time.time()
+                        left, top = scaled_size(x, y, scale_factor)
+                        tile_width, tile_height = scaled_size(width, height, scale_factor)
+                        png_data = encode_png(sheet.crop((left, top, left + tile_width, top + tile_height)))
+                        metrics.record('svg', png_data, capture_share + time.time() - crop_start, scale_factor)
+                        self._store(svg_hash, png_data, results)
+                        get_svg_rasterizer().record('browser')
+            except Exception as e:
+                logger.warning(f"Failed to crop sprite sheet: {e}")
+                pending.extend(item for item, _, _ in tiles if item[0] not in results)
+
+        return pending
+
+    def _capture_page(self, html_content: str, width: int, height: int, scale_factor: float) -> Optional[bytes]:
+        """
+        对完整页面截图（持久化浏览器会话优先，回退到Chrome subprocess）
+
+        Args:
+            html_content: 完整 HTML 文档
+            width: 页面宽度（像素）
+            height: 页面高度（像素）
+            scale_factor: 设备缩放因子
+
+        Returns:
+            PNG图片数据（bytes）或None
+        """
+        session = get_browser_session()
+        if session is not None:
+            png_data = session.screenshot_html(html_content, width, height, scale=scale_factor, timeout=60)
+            if png_data:
+                return png_data
+
+        chrome_exe = find_chrome_executable()
+        if not chrome_exe:
+            return None
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
+            f.write(html_content)
+            html_file = f.name
+        png_file = tempfile.mktemp(suffix='.png')
 
-        return self._svg_cache
+        try:
+            cmd = [
+                chrome_exe,
+                '--headless',
+                '--disable-gpu',
+                '--no-sandbox',
+                '--hide-scrollbars',
+                f'--force-device-scale-factor={scale_factor}',
+                f'--window-size={width},{height}',
+                f'--screenshot={png_file}',
+                html_file
+            ]
+            subprocess.run(
+                cmd,
+                capture_output=True,
+                timeout=60,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            )
+            if os.path.exists(png_file):
+                with open(png_file, 'rb') as f:
+                    return f.read()
+            return None
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Chrome subprocess timed out for sprite sheet ({width}x{height})")
+            return None
+        except Exception as e:
+            logger.debug(f"Sprite sheet capture failed: {e}")
+            return None
+        finally:
+            try:
+                os.unlink(html_file)
+            except:
+                pass
+            try:
+                if os.path.exists(png_file):
+                    os.unlink(png_file)
+            except:
+                pass
 
     def get_cached(self, svg_content: str, width: int, height: int) -> Optional[bytes]:
         """从缓存获取已转换的PNG"""
         svg_hash = self._get_svg_hash(svg_content, width, height)
-        return self._svg_cache.get(svg_hash)
+        return self._cache.get(svg_hash)
 
     def convert(self, svg_content: str, width: int, height: int) -> Optional[bytes]:
         """
@@ -118,16 +411,117 @@ class BrowserSVGConverter:
             logger.debug(f"SVG cache hit for {width}x{height}")
             return cached
 
-        # 使用Chrome subprocess方法
-        result = self._convert_with_chrome_subprocess(svg_content, width, height)
+        # 持久化浏览器会话优先，回退到Chrome subprocess
+        result = self._render_svg(svg_content, width, height)
         if result:
             # 存入缓存
             svg_hash = self._get_svg_hash(svg_content, width, height)
-            self._svg_cache[svg_hash] = result
+            self._cache.put(svg_hash, result)
             return result
 
         return None
 
+    def _build_svg_page(self, svg_content: str, width: int, height: int,
+                        target_width: int, target_height: int) -> str:
+        """
+        生成用于截图的 HTML 页面（SVG 保持请求尺寸，窗口可能更大）
+
+        Args:
+            svg_content: SVG XML字符串
+            width: SVG 宽度（像素）
+            height: SVG 高度（像素）
+            target_width: 窗口宽度（像素）
+            target_height: 窗口高度（像素）
+
+        Returns:
+            完整 HTML 文档
+        """
+        return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<style>
+    * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+    html, body {{
+        width: {target_width}px;
+        height: {target_height}px;
+        margin: 0;
+        padding: 0;
+        overflow: hidden;
+        background: white;
+    }}
+    svg {{
+        display: block;
+        /* 强制SVG保持原始请求尺寸，不随窗口放大 */
+        width: {width}px !important;
+        height: {height}px !important;
+    }}
+</style>
+</head>
+<body>
+{svg_content}
+</body>
+</html>"""
+
+    def _render_svg(self, svg_content: str, width: int, height: int) -> Optional[bytes]:
+        """
+        渲染单个SVG：简单SVG在进程内光栅化；否则优先使用持久化浏览器会话，
+        不可用或失败时回退到 subprocess
+
+        Args:
+            svg_content: SVG XML字符串
+            width: 目标宽度（像素）
+            height: 目标高度（像素）
+
+        Returns:
+            PNG图片数据（bytes）或None
+        """
+        start_time = time.time()
+        scale_factor = self._get_scale_factor(width, height)
+        rasterizer = get_svg_rasterizer()
+        png_data = rasterizer.rasterize(svg_content, width, height, scale_factor)
+        if not png_data:
+            png_data = self._convert_with_browser_session(svg_content, width, height)
+            if not png_data:
+                png_data = self._convert_with_chrome_subprocess(svg_content, width, height)
+            if png_data:
+                rasterizer.record('browser')
+        if png_data:
+            get_raster_metrics().record('svg', png_data, time.time() - start_time, scale_factor)
+        return png_data
+
+    def _convert_with_browser_session(self, svg_content: str, width: int, height: int) -> Optional[bytes]:
+        """
+        使用持久化浏览器会话（DevTools）截图，无需为每个SVG启动Chrome
+
+        Args:
+            svg_content: SVG XML字符串
+            width: 目标宽度（像素）
+            height: 目标高度（像素）
+
+        Returns:
+            PNG图片数据（bytes）或None
+        """
+        session = get_browser_session()
+        if session is None:
+            return None
+
+        # 与 subprocess 方式一致：极小尺寸使用 16px 窗口，截图区域裁剪为实际尺寸
+        min_size = 16
+        target_width = max(width, min_size)
+        target_height = max(height, min_size)
+        scale_factor = self._get_scale_factor(width, height)
+
+        html_content = self._build_svg_page(svg_content, width, height, target_width, target_height)
+        png_data = session.screenshot_html(
+            html_content, width, height,
+            viewport_width=target_width, viewport_height=target_height,
+            scale=scale_factor
+        )
+        if png_data:
+            logger.debug(f"Browser session: converted SVG to PNG ({width}x{height} at {scale_factor}x scale)")
+        return png_data
+
     def _convert_with_chrome_subprocess(self, svg_content: str, width: int, height: int) -> Optional[bytes]:
         """
         使用Chrome headless模式直接截图
@@ -180,32 +574,7 @@ class BrowserSVGConverter:
                 logger.debug(f"SVG size too small ({width}x{height}), scaling window to {target_width}x{target_height} and cropping")
 
             # 创建HTML文件
-            html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        html, body {{
-            width: {target_width}px;
-            height: {target_height}px;
-            margin: 0;
-            padding: 0;
-            overflow: hidden;
-            background: white;
-        }}
-        svg {{
-            display: block;
-            /* 强制SVG保持原始请求尺寸，不随窗口放大 */
-            width: {width}px !important;
-            height: {height}px !important;
-        }}
-    </style>
-</head>
-<body>
-    {svg_content}
-</body>
-</html>"""
+            html_content = self._build_svg_page(svg_content, width, height, target_width, target_height)
 
             # 创建临时HTML文件
             with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
@@ -215,8 +584,8 @@ class BrowserSVGConverter:
             # 创建临时PNG文件
             png_file = tempfile.mktemp(suffix='.png')
 
-            # 使用 2x 或 3x 缩放因子提高截图清晰度
-            scale_factor = int(os.environ.get('HTML2WORD_SCREENSHOT_SCALE', '2'))
+            # 缩放因子按显示尺寸与输出 DPI 计算
+            scale_factor = self._get_scale_factor(width, height)
 
             try:
                 # 使用Chrome headless截图
@@ -251,10 +620,8 @@ class BrowserSVGConverter:
                     from PIL import Image
 
                     # Chrome 生成的图片会按 scale_factor 放大
-                    scaled_width = width * scale_factor
-                    scaled_height = height * scale_factor
-                    scaled_target_width = target_width * scale_factor
-                    scaled_target_height = target_height * scale_factor
+                    scaled_width, scaled_height = scaled_size(width, height, scale_factor)
+                    scaled_target_width, scaled_target_height = scaled_size(target_width, target_height, scale_factor)
 
                     # 如果使用了裁剪，使用PIL裁剪图片（保持高分辨率）
                     if use_cropping:
@@ -263,9 +630,7 @@ class BrowserSVGConverter:
                             with Image.open(png_file) as img:
                                 # 裁剪到实际需要的尺寸（保持高分辨率，不缩放）
                                 cropped = img.crop((0, 0, scaled_width, scaled_height))
-                                output = io.BytesIO()
-                                cropped.save(output, format='PNG', optimize=True)
-                                png_data = output.getvalue()
+                                png_data = encode_png(cropped)
                                 logger.debug(f"Cropped high-res PNG: {scaled_target_width}x{scaled_target_height} -> {scaled_width}x{scaled_height} (kept at {scale_factor}x resolution)")
                         except ImportError:
                             logger.warning("PIL not installed, returning uncropped image")
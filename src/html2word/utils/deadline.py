@@ -0,0 +1,111 @@
+"""
+转换截止时间
+为一次转换设置总时间预算；各阶段与渲染调度器查询剩余时间，预算不足时改用代价更低的策略
+（缓存结果、PIL 占位图/合成图、跳过装饰性图标），并记录实际采用的降级策略。
+截止时间保存在 contextvar 中，不同线程中并发的转换各自计时。
+"""
+import contextvars
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ConversionDeadline:
+    """
+    一次转换的时间预算
+
+    剩余时间低于保留时间（reserve，留给保存文档等必须完成的步骤）时进入降级状态：
+    不再发起新的浏览器渲染，只使用缓存结果或 PIL 回退；超过截止时间后连 PIL 合成也跳过。
+    """
+
+    def __init__(self, budget: Optional[float] = None, reserve: Optional[float] = None):
+        """
+        Args:
+            budget: 总预算（秒）；为空表示不限时
+            reserve: 保留时间（秒；默认 HTML2WORD_DEADLINE_RESERVE，未设置时取预算的 10%，最多 5 秒）
+        """
+        if reserve is None:
+            env_reserve = os.environ.get('HTML2WORD_DEADLINE_RESERVE')
+            if env_reserve:
+                reserve = float(env_reserve)
+            else:
+                reserve = min(5.0, budget * 0.1) if budget else 0.0
+
+        self.budget = budget
+        self.reserve = reserve
+        self.started_at = time.monotonic()
+        self.degradations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def limited(self) -> bool:
+        """是否设置了预算"""
+        return self.budget is not None
+
+    def elapsed(self) -> float:
+        """已用时间（秒）"""
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> float:
+        """距截止时间的剩余秒数（不限时为 inf）"""
+        if self.budget is None:
+            return math.inf
+        return self.budget - self.elapsed()
+
+    def render_budget(self) -> float:
+        """可用于可选工作（如浏览器渲染）的剩余秒数，扣除保留时间"""
+        return self.remaining() - self.reserve
+
+    def is_low(self) -> bool:
+        """剩余时间已低于保留时间：只使用代价低的策略"""
+        return self.render_budget() <= 0
+
+    def expired(self) -> bool:
+        """已超过截止时间"""
+        return self.remaining() <= 0
+
+    def record(self, strategy: str):
+        """
+        记录一次降级
+
+        Args:
+            strategy: 降级策略名称（如 'svg_placeholder'）
+        """
+        with self._lock:
+            first = strategy not in self.degradations
+            self.degradations[strategy] = self.degradations.get(strategy, 0) + 1
+        if first:
+            logger.warning(f"Deadline: degrading with '{strategy}' ({self.remaining():.1f}s left)")
+
+
+# 当前转换的截止时间（按上下文隔离；未开始计时时不限时）
+_unlimited = ConversionDeadline()
+_deadline_var: contextvars.ContextVar = contextvars.ContextVar('conversion_deadline', default=None)
+
+
+def start_deadline(budget: Optional[float] = None) -> ConversionDeadline:
+    """
+    开始一次转换的计时（只影响当前线程/上下文）
+
+    Args:
+        budget: 总预算（秒）；为空时读取 HTML2WORD_DEADLINE，仍为空表示不限时
+
+    Returns:
+        新的截止时间对象（同时成为当前上下文中 get_deadline 的返回值）
+    """
+    if budget is None:
+        env_budget = os.environ.get('HTML2WORD_DEADLINE')
+        budget = float(env_budget) if env_budget else None
+    deadline = ConversionDeadline(budget)
+    _deadline_var.set(deadline)
+    return deadline
+
+
+def get_deadline() -> ConversionDeadline:
+    """获取当前上下文中转换的截止时间"""
+    return _deadline_var.get() or _unlimited
@@ -5,13 +5,25 @@ This module provides utilities to ensure consistent font application across
 ASCII, East Asian, and other character types in Word documents.
 """
 
+import copy
 import logging
+from functools import lru_cache
 from docx.oxml import parse_xml
 from docx.oxml.ns import nsdecls
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _rfonts_template(font_name: str):
+    """Parse the uniform <w:rFonts> element for a font once; callers clone it."""
+    from xml.sax.saxutils import quoteattr
+    name = quoteattr(font_name)
+    return parse_xml(
+        f'<w:rFonts {nsdecls("w")} w:ascii={name} w:hAnsi={name} w:eastAsia={name} w:cs={name}/>'
+    )
+
+
 def apply_uniform_font(run, font_name: str):
     """
     Apply uniform font to all character types in a text run.
@@ -35,17 +47,9 @@ def apply_uniform_font(run, font_name: str):
         # Get the run properties element
         rPr = run._element.get_or_add_rPr()
 
-        # Create the rFonts element with all font types set to the same font
-        rFonts_xml = f'''
-            <w:rFonts {nsdecls("w")}
-                w:ascii="{font_name}"
-                w:hAnsi="{font_name}"
-                w:eastAsia="{font_name}"
-                w:cs="{font_name}"/>
-        '''
-
-        # Parse the XML
-        rFonts = parse_xml(rFonts_xml)
+        # Clone the pre-parsed rFonts element with all font types set to the same font
+        # (ascii/hAnsi are what run.font.name would set, so no second mutation is needed)
+        rFonts = copy.deepcopy(_rfonts_template(font_name))
 
         # Remove existing rFonts element if present
         existing_rFonts = rPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}rFonts')
@@ -55,9 +59,6 @@ def apply_uniform_font(run, font_name: str):
         # Add the new rFonts element
         rPr.append(rFonts)
 
-        # Also set the basic font name for compatibility
-        run.font.name = font_name
-
         logger.debug(f"Applied uniform font '{font_name}' to all character types")
 
     except Exception as e:
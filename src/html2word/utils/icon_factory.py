@@ -0,0 +1,167 @@
+"""
+进程内图标生成
+用 PIL 绘制缺失 SVG 符号的替代图标（信息/警告/错误/成功），按（图形、颜色、尺寸）缓存，
+同一图标在进程内只生成一次，字节完全一致，python-docx 会复用同一个图片部件。
+"""
+import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from html2word.utils.colors import ColorConverter
+from html2word.utils.raster_sizing import encode_png, get_output_dpi
+
+logger = logging.getLogger(__name__)
+
+RGBA = Tuple[int, int, int, int]
+
+# 各类图标的默认颜色
+ICON_COLORS: Dict[str, RGBA] = {
+    'info': (86, 125, 245, 255),      # Blue from the original style
+    'warning': (255, 193, 7, 255),    # Amber
+    'error': (244, 67, 54, 255),      # Red
+    'success': (76, 175, 80, 255),    # Green
+}
+
+
+def icon_kind_from_href(href: Optional[str]) -> str:
+    """
+    根据 <use> 引用的符号名判断图标类型
+
+    Args:
+        href: xlink:href / href 属性值（如 '#icon-tishi'）
+
+    Returns:
+        'info' / 'warning' / 'error' / 'success'
+    """
+    if href:
+        if 'tishi' in href or 'info' in href:
+            return 'info'
+        if 'warning' in href or 'jinggao' in href:
+            return 'warning'
+        if 'error' in href or 'cuowu' in href:
+            return 'error'
+        if 'success' in href or 'zhengque' in href:
+            return 'success'
+    return 'info'
+
+
+class IconFactory:
+    """按（图形、颜色、像素尺寸）缓存的 PIL 图标生成器"""
+
+    # 超采样倍数，缩小后得到平滑边缘
+    SUPERSAMPLE = 4
+
+    def __init__(self, dpi: Optional[float] = None):
+        """
+        Args:
+            dpi: 图标渲染分辨率（默认 HTML2WORD_ICON_DPI，未设置时与 HTML2WORD_RASTER_DPI 一致）
+        """
+        if dpi is None:
+            dpi = float(os.environ.get('HTML2WORD_ICON_DPI') or get_output_dpi())
+        self.dpi = dpi
+        self._cache: Dict[Tuple[str, RGBA, int, int], bytes] = {}
+        self._lock = threading.Lock()
+        self.stats = {'generated': 0, 'reused': 0}
+
+    def get_icon(self, kind: str, width_pt: float, height_pt: float,
+                 color: Optional[str] = None) -> Optional[bytes]:
+        """
+        获取图标 PNG（透明背景）
+
+        Args:
+            kind: 图标类型（见 ICON_COLORS）
+            width_pt: 显示宽度（磅）
+            height_pt: 显示高度（磅）
+            color: CSS 颜色；为空时使用该类型的默认颜色
+
+        Returns:
+            PNG 数据或 None
+        """
+        rgba = ICON_COLORS.get(kind, ICON_COLORS['info'])
+        if color:
+            rgb = ColorConverter.parse_color(color)
+            if rgb:
+                rgba = (rgb[0], rgb[1], rgb[2], 255)
+
+        width_px = max(int(round(width_pt * self.dpi / 72)), 16)
+        height_px = max(int(round(height_pt * self.dpi / 72)), 16)
+        key = (kind, rgba, width_px, height_px)
+
+        with self._lock:
+            png_data = self._cache.get(key)
+            if png_data is not None:
+                self.stats['reused'] += 1
+                return png_data
+
+        try:
+            png_data = self._draw(kind, rgba, width_px, height_px)
+        except Exception as e:
+            logger.warning(f"Failed to draw {kind} icon: {e}")
+            return None
+
+        with self._lock:
+            self._cache.setdefault(key, png_data)
+            self.stats['generated'] += 1
+            return self._cache[key]
+
+    def _draw(self, kind: str, color: RGBA, width_px: int, height_px: int) -> bytes:
+        """绘制图标：白色圆形 + 彩色描边 + 彩色符号"""
+        from PIL import Image, ImageDraw
+
+        ss = self.SUPERSAMPLE
+        w, h = width_px * ss, height_px * ss
+        img = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+
+        margin = ss
+        border = max(2 * ss, w // 8)
+        draw.ellipse([(margin, margin), (w - margin - 1, h - margin - 1)],
+                     fill=(255, 255, 255, 255), outline=color, width=border)
+
+        cx, cy = w / 2, h / 2
+        unit = min(w, h) / 16.0
+
+        if kind == 'success':
+            # 对勾
+            points = [(cx - 4 * unit, cy), (cx - 1 * unit, cy + 3 * unit), (cx + 4.5 * unit, cy - 3 * unit)]
+            draw.line(points, fill=color, width=max(1, int(1.8 * unit)), joint='curve')
+        elif kind == 'error':
+            # 叉号
+            d = 3 * unit
+            stroke = max(1, int(1.8 * unit))
+            draw.line([(cx - d, cy - d), (cx + d, cy + d)], fill=color, width=stroke)
+            draw.line([(cx - d, cy + d), (cx + d, cy - d)], fill=color, width=stroke)
+        else:
+            # 'i'（info，倾斜）或 '!'（warning，竖直，点在下方）
+            slant = 0.25 if kind == 'info' else 0.0
+            half = 0.9 * unit
+
+            def skew(x, y):
+                return x - (y - cy) * slant, y
+
+            if kind == 'warning':
+                stem_top, stem_bottom, dot_y = cy - 4.5 * unit, cy + 1.5 * unit, cy + 3.8 * unit
+            else:
+                stem_top, stem_bottom, dot_y = cy - 1.2 * unit, cy + 4.5 * unit, cy - 3.6 * unit
+
+            draw.polygon([skew(cx - half, stem_top), skew(cx + half, stem_top),
+                          skew(cx + half, stem_bottom), skew(cx - half, stem_bottom)], fill=color)
+            dot_x, _ = skew(cx, dot_y)
+            r = 1.1 * unit
+            draw.ellipse([(dot_x - r, dot_y - r), (dot_x + r, dot_y + r)], fill=color)
+
+        img = img.resize((width_px, height_px), Image.LANCZOS)
+        return encode_png(img)
+
+
+# 全局单例
+_icon_factory: Optional[IconFactory] = None
+
+
+def get_icon_factory() -> IconFactory:
+    """获取图标生成器单例"""
+    global _icon_factory
+    if _icon_factory is None:
+        _icon_factory = IconFactory()
+    return _icon_factory
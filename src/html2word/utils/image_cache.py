@@ -0,0 +1,269 @@
+"""
+处理后图片缓存
+按（源摘要、transform、filter、最大尺寸）缓存 ImageProcessor 编码后的图片数据（按字节数限制的 LRU），
+同一图片重复出现时不再经过 PIL 解码、滤镜、缩放和重新编码；
+插入文档时按内容摘要复用同一个 python-docx 图片部件，不再解析图片头和逐个比对已有部件。
+
+数据 URI（内容摘要）与本地文件（路径、修改时间、大小）的缓存条目可跨转换复用；
+远程图片无法确认内容未变，其条目只在同一次构建内有效（缓存键包含构建标识）。
+"""
+import contextvars
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.shape import CT_Inline
+from docx.shape import InlineShape
+
+logger = logging.getLogger(__name__)
+
+_PART_INDEX_ATTR = '_html2word_image_parts'
+# 已写出文档部件的最大形状 id（流式写出的块不在内存树中，part.next_id 看不到其中的 id）
+_STREAMED_ID_ATTR = '_html2word_streamed_max_id'
+
+
+class ProcessedImage:
+    """一次处理结果：编码后的图片数据与像素尺寸"""
+
+    __slots__ = ('data', 'size')
+
+    def __init__(self, data: bytes, size: Tuple[int, int]):
+        self.data = data
+        self.size = size
+
+
+class ImageBuild:
+    """一次构建的图片状态：作为远程图片缓存键的构建标识，并记录加载失败的图片源"""
+
+    __slots__ = ('failed_sources', '_lock')
+
+    def __init__(self):
+        self.failed_sources = set()
+        self._lock = threading.Lock()
+
+    def record_failure(self, src: str):
+        """记录加载失败的图片源（本次构建内不再重试）"""
+        with self._lock:
+            self.failed_sources.add(src)
+
+    def has_failed(self, src: str) -> bool:
+        """图片源在本次构建中是否已加载失败"""
+        with self._lock:
+            return src in self.failed_sources
+
+
+class ProcessedImageCache:
+    """处理后图片的内存 LRU 缓存（按字节数限制）与图片部件复用表"""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        Args:
+            max_bytes: 缓存上限（默认 HTML2WORD_IMAGE_CACHE_MB，64MB；0 表示不缓存）
+        """
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('HTML2WORD_IMAGE_CACHE_MB', '64')) * 1024 * 1024)
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[Tuple, ProcessedImage]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # 当前线程/上下文的构建（begin_build 开始；构建之外为 None，远程图片不缓存）
+        self._build_var: contextvars.ContextVar = contextvars.ContextVar('image_build', default=None)
+        self.stats: Dict[str, int] = {}
+        self.reset_stats()
+
+    def begin_build(self):
+        """为当前线程/上下文开始新的构建：此前缓存的远程图片不再命中，失败记录清空"""
+        self._build_var.set(ImageBuild())
+
+    def current_build(self) -> Optional[ImageBuild]:
+        """当前上下文的构建（未开始构建时为 None）"""
+        return self._build_var.get()
+
+    def reset_stats(self):
+        """重置统计（每次构建开始时调用；缓存内容保留）"""
+        with self._lock:
+            self.stats = {
+                'hits': 0,
+                'misses': 0,
+                'evictions': 0,
+                'bytes_saved': 0,
+                'parts_added': 0,
+                'parts_reused': 0,
+                'passed_through': 0,
+                'bytes_passed_through': 0,
+                'reencoded': 0,
+            }
+
+    def report(self) -> Dict[str, Any]:
+        """
+        统计报告
+
+        Returns:
+            命中/未命中次数、命中率、缓存命中省去的编码字节数、图片部件新增/复用次数、
+            原样嵌入/重新编码的图片数
+        """
+        with self._lock:
+            report: Dict[str, Any] = dict(self.stats)
+        lookups = report['hits'] + report['misses']
+        report['hit_rate'] = report['hits'] / lookups if lookups else 0.0
+        return report
+
+    def get(self, key: Tuple) -> Optional[ProcessedImage]:
+        """
+        查询缓存
+
+        Args:
+            key: 缓存键（见 ImageProcessor.process_image）
+
+        Returns:
+            缓存的处理结果或 None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            self.stats['bytes_saved'] += len(entry.data)
+            return entry
+
+    def put(self, key: Tuple, data: bytes, size: Tuple[int, int]):
+        """
+        写入缓存并按字节数淘汰最久未使用的条目
+
+        Args:
+            key: 缓存键
+            data: 编码后的图片数据
+            size: 像素尺寸 (width, height)
+        """
+        if not data or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.data)
+            self._entries[key] = ProcessedImage(data, size)
+            self._bytes += len(data)
+
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.data)
+                self.stats['evictions'] += 1
+
+    def record_pass_through(self, size: int):
+        """记录一次原样嵌入（无需变换的图片直接使用源数据，不经 PIL 重新编码）"""
+        with self._lock:
+            self.stats['passed_through'] += 1
+            self.stats['bytes_passed_through'] += size
+
+    def record_reencode(self):
+        """记录一次 PIL 重新编码"""
+        with self._lock:
+            self.stats['reencoded'] += 1
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def add_picture(self, run, image_stream, width=None, height=None) -> InlineShape:
+        """
+        在 run 末尾插入图片（与 Run.add_picture 输出一致）
+
+        同一文档中内容相同的图片复用已有的图片部件：只计算数据摘要，
+        不再解析图片头，也不逐个比对文档中已有的图片部件。
+
+        Args:
+            run: python-docx Run
+            image_stream: 图片数据流
+            width: 显示宽度（Length，可选）
+            height: 显示高度（Length，可选）
+
+        Returns:
+            python-docx InlineShape
+        """
+        part = run.part
+        package = part.package
+        image_stream.seek(0)
+        sha1 = hashlib.sha1(image_stream.read()).hexdigest()
+        image_stream.seek(0)
+
+        with self._lock:
+            # {图片数据 SHA-1: ImagePart} 索引挂在文档包上，随文档一起释放
+            # （图片部件引用文档包，外部弱引用表无法释放）
+            parts = getattr(package, _PART_INDEX_ATTR, None)
+            if parts is None:
+                parts = {}
+                setattr(package, _PART_INDEX_ATTR, parts)
+            image_part = parts.get(sha1)
+
+        if image_part is None:
+            rId, image = part.get_or_add_image(image_stream)
+            with self._lock:
+                parts[sha1] = part.related_parts[rId]
+                self.stats['parts_added'] += 1
+        else:
+            rId = part.relate_to(image_part, RT.IMAGE)
+            image = image_part.image
+            with self._lock:
+                self.stats['parts_reused'] += 1
+
+        cx, cy = image.scaled_dimensions(width, height)
+        inline = CT_Inline.new_pic_inline(next_shape_id(part), rId, image.filename, cx, cy)
+        run._r.add_drawing(inline)
+        return InlineShape(inline)
+
+
+def record_streamed_ids(part, max_id: int):
+    """
+    记录已从内存树移出（流式写出）的最大形状 id
+
+    Args:
+        part: 文档部件
+        max_id: 已写出块中的最大数字 id
+    """
+    if max_id > getattr(part, _STREAMED_ID_ATTR, 0):
+        setattr(part, _STREAMED_ID_ATTR, max_id)
+
+
+def next_shape_id(part) -> int:
+    """
+    下一个可用的形状 id（wp:docPr / pic:cNvPr）
+
+    python-docx 的 part.next_id 只扫描内存中的文档树；流式构建时已写出的块
+    不在其中，另取已写出部分的最大 id，保证整个文档中的 id 单调递增、不重复。
+
+    Args:
+        part: 文档部件
+
+    Returns:
+        形状 id
+    """
+    return max(part.next_id, getattr(part, _STREAMED_ID_ATTR, 0) + 1)
+
+
+# 全局单例
+_image_cache: Optional[ProcessedImageCache] = None
+_image_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> ProcessedImageCache:
+    """获取处理后图片缓存单例"""
+    global _image_cache
+    if _image_cache is None:
+        with _image_cache_lock:
+            if _image_cache is None:
+                _image_cache = ProcessedImageCache()
+    return _image_cache
+
+
+def add_picture(run, image_stream, width=None, height=None) -> InlineShape:
+    """在 run 末尾插入图片，复用同一文档中内容相同的图片部件（见 ProcessedImageCache.add_picture）"""
+    return get_image_cache().add_picture(run, image_stream, width, height)
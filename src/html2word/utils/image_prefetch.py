@@ -0,0 +1,152 @@
+"""
+图片预取
+构建前集中获取、解码并处理文档中的全部图片（<img> 与 CSS 背景图），
+在线程池中并发执行（本地文件读取、URL 下载、base64 解码、PIL 处理），
+结果写入处理后图片缓存，构建阶段遇到图片时只做缓存查询。
+"""
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from html2word.utils.deadline import get_deadline
+from html2word.utils.image_cache import get_image_cache
+
+logger = logging.getLogger(__name__)
+
+# 预取任务：('image', src, transform, filter) 或 ('source', src)
+PrefetchTask = Tuple
+
+
+class ImagePrefetcher:
+    """并发预取图片并写入处理后图片缓存（按字节数限制预取总量）"""
+
+    def __init__(self, max_workers: Optional[int] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            max_workers: 线程数（默认 HTML2WORD_IMAGE_PREFETCH_WORKERS，4；0 表示不预取）
+            max_bytes: 预取数据上限（默认 HTML2WORD_IMAGE_PREFETCH_MB，32MB；
+                       不超过图片缓存容量，超出部分留给构建阶段按需加载）
+        """
+        if max_workers is None:
+            max_workers = int(os.environ.get('HTML2WORD_IMAGE_PREFETCH_WORKERS', '4'))
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('HTML2WORD_IMAGE_PREFETCH_MB', '32')) * 1024 * 1024)
+        self.max_workers = max(0, max_workers)
+        self.max_bytes = max_bytes
+        self.stats: Dict[str, Any] = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        """重置统计"""
+        self.stats = {
+            'tasks': 0,
+            'prefetched': 0,
+            'failed': 0,
+            'skipped': 0,
+            'bytes': 0,
+            'seconds': 0.0,
+        }
+
+    def prefetch(self, processor, tasks: Iterable[PrefetchTask]) -> Dict[str, Any]:
+        """
+        并发执行预取任务（阻塞至全部完成）
+
+        已提交任务的结果总字节数达到上限后不再提交新任务，
+        同时在途的任务数不超过线程数，内存占用有界。
+        转换预算不足（见 deadline.py）时同样停止提交，剩余图片留给构建阶段按需处理。
+
+        Args:
+            processor: ImageProcessor（与构建阶段使用相同的基础路径，缓存键一致）
+            tasks: 预取任务（重复任务只执行一次）
+
+        Returns:
+            统计：任务数、成功/失败/因上限跳过的数量、预取字节数、耗时
+        """
+        self.reset_stats()
+        unique = list(dict.fromkeys(tasks))
+        self.stats['tasks'] = len(unique)
+        if not unique or self.max_workers == 0:
+            self.stats['skipped'] = len(unique)
+            return self.stats
+
+        budget = min(self.max_bytes, get_image_cache().max_bytes)
+        deadline = get_deadline()
+        start = time.perf_counter()
+        remaining = iter(unique)
+        pending = set()
+        used = 0
+        exhausted = stopped = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='image-prefetch') as pool:
+            while True:
+                while not exhausted and not stopped and len(pending) < self.max_workers and used < budget:
+                    if deadline.is_low():
+                        stopped = True
+                        deadline.record('image_prefetch_stopped')
+                        break
+                    task = next(remaining, None)
+                    if task is None:
+                        exhausted = True
+                        break
+                    # 在调用方上下文的副本中执行（远程图片缓存键属于当前构建）
+                    pending.add(pool.submit(contextvars.copy_context().run, self._run, processor, task))
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    size = future.result()
+                    if size:
+                        used += size
+                        self.stats['prefetched'] += 1
+                    else:
+                        self.stats['failed'] += 1
+
+        self.stats['skipped'] = sum(1 for _ in remaining)
+        self.stats['bytes'] = used
+        self.stats['seconds'] = time.perf_counter() - start
+        return self.stats
+
+    @staticmethod
+    def _run(processor, task: PrefetchTask) -> int:
+        """
+        执行单个预取任务
+
+        Args:
+            processor: ImageProcessor
+            task: 预取任务
+
+        Returns:
+            缓存的数据字节数（失败为 0）
+        """
+        try:
+            if task[0] == 'image':
+                _, src, transform, filter_css = task
+                result = processor.process_image(src, transform=transform, filter_css=filter_css)
+                return result[0].getbuffer().nbytes if result else 0
+
+            result = processor.load_source_image(task[1])
+            return len(result[0]) if result else 0
+        except Exception as e:
+            # 预取失败不影响构建：构建阶段会再次加载并报告错误
+            logger.debug(f"Image prefetch failed for {str(task[1])[:80]}: {e}")
+            return 0
+
+
+# 全局单例
+_image_prefetcher: Optional[ImagePrefetcher] = None
+_image_prefetcher_lock = threading.Lock()
+
+
+def get_image_prefetcher() -> ImagePrefetcher:
+    """获取图片预取器单例"""
+    global _image_prefetcher
+    if _image_prefetcher is None:
+        with _image_prefetcher_lock:
+            if _image_prefetcher is None:
+                _image_prefetcher = ImagePrefetcher()
+    return _image_prefetcher
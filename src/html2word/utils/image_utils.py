@@ -8,13 +8,37 @@ import os
 import base64
 import io
 import logging
+import threading
 from typing import Optional, Tuple, Union
 from urllib.parse import urlparse, urljoin
 import requests
+from requests.adapters import HTTPAdapter
 from PIL import Image
 
+from html2word.utils.deadline import get_deadline
+from html2word.utils.image_cache import get_image_cache
+from html2word.utils.render_cache import content_digest
+
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session: keeps connections alive across images and prefetch workers
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Get the shared HTTP session used to download images."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
 
 class ImageProcessor:
     """Processor for handling images from various sources."""
@@ -28,14 +52,17 @@ class ImageProcessor:
     # Maximum image size (width or height) in pixels
     MAX_IMAGE_SIZE = 4000
 
-    def __init__(self, base_path: Optional[str] = None):
+    def __init__(self, base_path: Optional[str] = None, session: Optional[requests.Session] = None):
         """
         Initialize image processor.
 
         Args:
             base_path: Base path for resolving relative image paths
+            session: HTTP session (anything with a requests-style get()) used for
+                URL images; defaults to the shared session
         """
         self.base_path = base_path or os.getcwd()
+        self.session = session
 
     def process_image(
         self,
@@ -58,11 +85,30 @@ class ImageProcessor:
         Returns:
             Tuple of (image_stream, (width, height)) or None if failed
         """
+        # Repeated images (logos, status icons, data URIs) are processed once
+        cache = get_image_cache()
+        cache_key = self._cache_key(src, max_width, max_height, transform, filter_css)
+        if cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return io.BytesIO(cached.data), cached.size
+
         try:
-            # Get image from source
-            image = self._load_image(src)
-            if image is None:
+            # Get image data from source; PIL only reads the header until pixels are needed
+            data = self._load_image_data(src)
+            if data is None:
                 return None
+            image = Image.open(io.BytesIO(data))
+            logger.debug(f"Opened image ({image.format}, {image.size}, {len(data)} bytes)")
+
+            # Fast path: embed the original bytes when nothing would change them
+            # (damaged files go through PIL like any other image)
+            if (self._can_pass_through(image, max_width, max_height, transform, filter_css)
+                    and self._is_intact(data, image.format)):
+                if cache_key is not None:
+                    cache.put(cache_key, data, image.size)
+                cache.record_pass_through(len(data))
+                return io.BytesIO(data), image.size
 
             # Convert to supported format if needed
             image = self._ensure_supported_format(image)
@@ -94,6 +140,10 @@ class ImageProcessor:
 
             image.save(stream, format=image_format)
             stream.seek(0)
+            cache.record_reencode()
+
+            if cache_key is not None:
+                cache.put(cache_key, stream.getvalue(), image.size)
 
             return stream, image.size
 
@@ -101,29 +151,192 @@ class ImageProcessor:
             logger.error(f"Error processing image '{src}': {e}")
             return None
 
-    def _load_image(self, src: str) -> Optional[Image.Image]:
+    def load_source_image(self, src: str) -> Optional[Tuple[bytes, Tuple[int, int]]]:
         """
-        Load image from source.
+        Load the original bytes and pixel size of an image without processing it.
+
+        Used for CSS background images, which are composited or embedded as they
+        are. Results share the processed-image cache, so sources warmed by the
+        prefetch stage are not fetched or decoded again.
+
+        Args:
+            src: Image source (local path, URL, or base64 data URI)
+
+        Returns:
+            Tuple of (image_data, (width, height)) or None if failed
+        """
+        cache = get_image_cache()
+        source_key = self._cache_key(src, None, None, None, None)
+        cache_key = ("source",) + source_key if source_key is not None else None
+        if cache_key is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached.data, cached.size
+
+        try:
+            data = self._load_image_data(src)
+            if data is None:
+                return None
+            with Image.open(io.BytesIO(data)) as image:
+                size = image.size
+        except Exception as e:
+            logger.error(f"Error reading image '{src[:80]}': {e}")
+            return None
+
+        if cache_key is not None:
+            cache.put(cache_key, data, size)
+        return data, size
+
+    def _cache_key(
+        self,
+        src: str,
+        max_width: Optional[int],
+        max_height: Optional[int],
+        transform: Optional[str],
+        filter_css: Optional[str]
+    ) -> Optional[Tuple]:
+        """
+        Build the processed-image cache key.
+
+        Data URIs are keyed by a digest of their content and local files by their
+        resolved path, modification time and size; both may be reused across
+        conversions. A URL may serve different content over time, so URL keys
+        include the current build and are not reused by later builds (outside a
+        build URL images are not cached).
 
         Args:
             src: Image source
+            max_width: Maximum width in pixels
+            max_height: Maximum height in pixels
+            transform: CSS transform value
+            filter_css: CSS filter value
 
         Returns:
-            PIL Image object or None
+            Cache key, or None if the source cannot be identified (not cached)
         """
-        # Check if it's a data URI (base64)
         if src.startswith("data:"):
-            return self._load_from_data_uri(src)
+            source = ("data", content_digest(src))
+        elif self._is_url(src):
+            build = get_image_cache().current_build()
+            if build is None:
+                return None
+            source = ("url", src, build)
+        else:
+            file_path = src if os.path.isabs(src) else os.path.join(self.base_path, src)
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                return None
+            source = ("file", os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
 
-        # Check if it's a URL
-        if self._is_url(src):
-            return self._load_from_url(src)
+        return source, transform or None, filter_css or None, max_width or None, max_height or None
+
+    def _can_pass_through(
+        self,
+        image: Image.Image,
+        max_width: Optional[int],
+        max_height: Optional[int],
+        transform: Optional[str],
+        filter_css: Optional[str]
+    ) -> bool:
+        """
+        Check whether the source bytes can be embedded unchanged.
 
+        True when pass-through is enabled (HTML2WORD_IMAGE_PASSTHROUGH, default true),
+        the format is supported by Word, no filter or transform applies and neither
+        the requested maximum size nor MAX_IMAGE_SIZE would resize the image.
+
+        Args:
+            image: PIL Image opened from the source (header only)
+            max_width: Maximum width in pixels
+            max_height: Maximum height in pixels
+            transform: CSS transform value
+            filter_css: CSS filter value
+
+        Returns:
+            True if the original bytes can be used as is
+        """
+        if os.getenv('HTML2WORD_IMAGE_PASSTHROUGH', 'true').lower() != 'true':
+            return False
+        if filter_css or transform:
+            return False
+        if not image.format or image.format.upper() not in self.SUPPORTED_FORMATS:
+            return False
+
+        width, height = image.size
+        if width > self.MAX_IMAGE_SIZE or height > self.MAX_IMAGE_SIZE:
+            return False
+        if (max_width and width > max_width) or (max_height and height > max_height):
+            return False
+        return True
+
+    @staticmethod
+    def _is_intact(data: bytes, image_format: str) -> bool:
+        """
+        Check that encoded image data is complete before embedding it unchanged.
+
+        Image.verify() checks the PNG chunk structure and CRCs; it is a no-op for
+        the other formats, so JPEG and GIF must end with their end marker and BMP
+        and TIFF are decoded.
+
+        Args:
+            data: Encoded image data
+            image_format: PIL format name
+
+        Returns:
+            True if the data is not truncated or corrupt
+        """
+        try:
+            with Image.open(io.BytesIO(data)) as copy:
+                if image_format in ("BMP", "TIFF"):
+                    copy.load()
+                else:
+                    copy.verify()
+        except Exception as e:
+            logger.debug(f"Image data failed verification ({image_format}): {e}")
+            return False
+
+        tail = data.rstrip(b"\x00")
+        if image_format == "JPEG":
+            return tail.endswith(b"\xff\xd9")
+        if image_format == "GIF":
+            return tail.endswith(b"\x3b")
+        return True
+
+    def _load_image_data(self, src: str) -> Optional[bytes]:
+        """
+        Load image bytes from source.
+
+        Sources that failed to load are remembered for the rest of the build, so
+        a dead or hanging URL seen by the prefetch stage is not fetched again.
+
+        Args:
+            src: Image source
+
+        Returns:
+            Encoded image data or None
+        """
+        build = get_image_cache().current_build()
+        if build is not None and build.has_failed(src):
+            logger.debug(f"Skipping image that already failed in this build: {src[:80]}")
+            return None
+
+        # Check if it's a data URI (base64)
+        if src.startswith("data:"):
+            data = self._load_from_data_uri(src)
+        # Check if it's a URL
+        elif self._is_url(src):
+            data = self._load_from_url(src)
         # Assume it's a local file path
-        return self._load_from_file(src)
+        else:
+            data = self._load_from_file(src)
+
+        if data is None and build is not None:
+            build.record_failure(src)
+        return data
 
-    def _load_from_data_uri(self, data_uri: str) -> Optional[Image.Image]:
-        """Load image from base64 data URI."""
+    def _load_from_data_uri(self, data_uri: str) -> Optional[bytes]:
+        """Load image bytes from base64 data URI."""
         try:
             # Format: data:image/png;base64,iVBORw0KG...
             if ";base64," not in data_uri:
@@ -132,30 +345,47 @@ class ImageProcessor:
 
             header, base64_data = data_uri.split(";base64,", 1)
             image_data = base64.b64decode(base64_data)
-            image = Image.open(io.BytesIO(image_data))
-            logger.debug(f"Loaded image from data URI ({image.format}, {image.size})")
-            return image
+            logger.debug(f"Loaded image from data URI ({len(image_data)} bytes)")
+            return image_data
 
         except Exception as e:
             logger.error(f"Error loading image from data URI: {e}")
             return None
 
-    def _load_from_url(self, url: str) -> Optional[Image.Image]:
-        """Load image from URL."""
+    def _load_from_url(self, url: str) -> Optional[bytes]:
+        """
+        Load image bytes from URL.
+
+        The download timeout is capped by the remaining render budget of the
+        conversion deadline (a download cut short this way is recorded as a
+        degradation); once the budget is low the download is skipped and the
+        image is reported as failed.
+        """
+        deadline = get_deadline()
+        if deadline.is_low():
+            deadline.record('image_download_skipped')
+            return None
+
         try:
-            response = requests.get(url, timeout=self.DOWNLOAD_TIMEOUT)
+            session = self.session or get_http_session()
+            timeout = min(self.DOWNLOAD_TIMEOUT, deadline.render_budget())
+            response = session.get(url, timeout=timeout)
             response.raise_for_status()
 
-            image = Image.open(io.BytesIO(response.content))
-            logger.debug(f"Downloaded image from {url} ({image.format}, {image.size})")
-            return image
+            logger.debug(f"Downloaded image from {url} ({len(response.content)} bytes)")
+            return response.content
 
+        except requests.Timeout as e:
+            if timeout < self.DOWNLOAD_TIMEOUT:
+                deadline.record('image_download_cut_short')
+            logger.error(f"Timed out downloading image from {url}: {e}")
+            return None
         except Exception as e:
             logger.error(f"Error downloading image from {url}: {e}")
             return None
 
-    def _load_from_file(self, file_path: str) -> Optional[Image.Image]:
-        """Load image from local file."""
+    def _load_from_file(self, file_path: str) -> Optional[bytes]:
+        """Load image bytes from local file."""
         try:
             # Resolve relative paths
             if not os.path.isabs(file_path):
@@ -165,9 +395,10 @@ class ImageProcessor:
                 logger.error(f"Image file not found: {file_path}")
                 return None
 
-            image = Image.open(file_path)
-            logger.debug(f"Loaded image from {file_path} ({image.format}, {image.size})")
-            return image
+            with open(file_path, "rb") as f:
+                image_data = f.read()
+            logger.debug(f"Loaded image from {file_path} ({len(image_data)} bytes)")
+            return image_data
 
         except Exception as e:
             logger.error(f"Error loading image from {file_path}: {e}")
@@ -0,0 +1,154 @@
+"""
+光栅化尺寸与 PNG 编码
+根据图片在 Word 中的显示尺寸（磅）与输出 DPI 选择截图缩放因子，限制总像素数，
+以偏重速度的压缩级别编码 PNG，并记录每张图片的尺寸与耗时
+"""
+import io
+import logging
+import math
+import os
+import struct
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Word 默认页面可用宽度（6.5 英寸），超出的图片插入时会被缩放到该宽度
+PAGE_CONTENT_WIDTH_PT = 468
+
+# 缩放因子取 1/4 的整数倍，便于精灵图分组与缓存命中
+SCALE_STEP = 0.25
+
+
+def get_output_dpi() -> float:
+    """输出分辨率（HTML2WORD_RASTER_DPI，默认 192，即 96 DPI 下的 2 倍）"""
+    return float(os.environ.get('HTML2WORD_RASTER_DPI', '192'))
+
+
+def get_max_render_pixels() -> int:
+    """单张图片的最大输出像素数（HTML2WORD_RASTER_MAX_PIXELS，默认 800 万）"""
+    return int(float(os.environ.get('HTML2WORD_RASTER_MAX_PIXELS', '8000000')))
+
+
+def get_png_compress_level() -> int:
+    """PNG 压缩级别（HTML2WORD_PNG_COMPRESS_LEVEL，0-9，默认 1：编码快，体积略大）"""
+    return max(0, min(9, int(os.environ.get('HTML2WORD_PNG_COMPRESS_LEVEL', '1'))))
+
+
+def compute_render_scale(width_px: int, height_px: int, display_width_pt: Optional[float] = None) -> float:
+    """
+    计算截图缩放因子
+
+    设置了 HTML2WORD_SCREENSHOT_SCALE 时使用该固定值；否则按显示宽度和输出 DPI 计算，
+    显示宽度不超过页面可用宽度，输出像素数不超过上限。
+
+    Args:
+        width_px: 渲染宽度（CSS 像素）
+        height_px: 渲染高度（CSS 像素）
+        display_width_pt: 在文档中的显示宽度（磅）；为空时按 96 DPI 换算渲染宽度
+
+    Returns:
+        缩放因子（SCALE_STEP 的整数倍）
+    """
+    fixed = os.environ.get('HTML2WORD_SCREENSHOT_SCALE')
+    if fixed:
+        return float(fixed)
+
+    if width_px <= 0 or height_px <= 0:
+        return 1.0
+
+    if display_width_pt is None:
+        display_width_pt = width_px * 72 / 96
+    display_width_pt = min(display_width_pt, PAGE_CONTENT_WIDTH_PT)
+
+    scale = display_width_pt / 72 * get_output_dpi() / width_px
+    max_scale = math.sqrt(get_max_render_pixels() / (width_px * height_px))
+
+    scale = max(SCALE_STEP, round(scale / SCALE_STEP) * SCALE_STEP)
+    while scale > SCALE_STEP and scale > max_scale:
+        scale -= SCALE_STEP
+    return scale
+
+
+def scaled_size(width_px: int, height_px: int, scale: float) -> Tuple[int, int]:
+    """按缩放因子计算输出像素尺寸（与浏览器截图的取整方式一致）"""
+    return int(round(width_px * scale)), int(round(height_px * scale))
+
+
+def encode_png(image) -> bytes:
+    """
+    以 HTML2WORD_PNG_COMPRESS_LEVEL 编码 PIL 图片为 PNG
+
+    Args:
+        image: PIL Image
+
+    Returns:
+        PNG 数据
+    """
+    output = io.BytesIO()
+    image.save(output, format='PNG', compress_level=get_png_compress_level())
+    return output.getvalue()
+
+
+def png_dimensions(png_data: bytes) -> Optional[Tuple[int, int]]:
+    """从 PNG 文件头读取像素尺寸（无需解码）"""
+    if len(png_data) < 24 or png_data[:8] != b'\x89PNG\r\n\x1a\n':
+        return None
+    return struct.unpack('>II', png_data[16:24])
+
+
+class RasterMetrics:
+    """记录每张光栅化图片的输出尺寸、字节数与耗时"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Any] = {}
+        self.reset()
+
+    def reset(self):
+        """清空统计（每次构建文档开始时调用）"""
+        with self._lock:
+            self.stats = {
+                'images': 0,
+                'pixels': 0,
+                'bytes': 0,
+                'seconds': 0.0,
+                'by_kind': {},
+            }
+
+    def record(self, kind: str, png_data: bytes, seconds: float, scale: float):
+        """
+        记录一张新渲染的图片
+
+        Args:
+            kind: 图片类型（'svg'、'html' 等）
+            png_data: PNG 数据
+            seconds: 渲染与编码耗时（秒）
+            scale: 使用的缩放因子
+        """
+        size = png_dimensions(png_data) or (0, 0)
+        pixels = size[0] * size[1]
+        logger.debug(f"Rasterized {kind}: {size[0]}x{size[1]}px at {scale}x, "
+                     f"{len(png_data)} bytes in {seconds * 1000:.0f}ms")
+
+        with self._lock:
+            self.stats['images'] += 1
+            self.stats['pixels'] += pixels
+            self.stats['bytes'] += len(png_data)
+            self.stats['seconds'] += seconds
+            kind_stats = self.stats['by_kind'].setdefault(kind, {'images': 0, 'bytes': 0, 'seconds': 0.0})
+            kind_stats['images'] += 1
+            kind_stats['bytes'] += len(png_data)
+            kind_stats['seconds'] += seconds
+
+
+# 全局单例
+_raster_metrics: Optional[RasterMetrics] = None
+
+
+def get_raster_metrics() -> RasterMetrics:
+    """获取光栅化统计单例"""
+    global _raster_metrics
+    if _raster_metrics is None:
+        _raster_metrics = RasterMetrics()
+    return _raster_metrics
@@ -0,0 +1,381 @@
+"""
+渲染结果缓存
+内存 LRU（按字节数限制）+ 磁盘内容寻址存储（原子写入，同一用户的多进程共享）
+"""
+import hashlib
+import logging
+import os
+import stat
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# PNG 文件签名与结束块（读取磁盘条目时校验）
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_PNG_IEND = b'IEND\xaeB`\x82'
+
+# 渲染器版本：渲染页面模板或截图参数变化时递增，使旧的磁盘缓存失效
+RENDERER_VERSION = '2'
+
+# 内容摘要记忆：同一 SVG 在一次转换中计算 2~5 次缓存键（预处理、批量渲染、构建阶段查询）。
+# 只记忆较大的内容，总量按一份文档中大型 SVG 的规模限制（示例月报约 2M 字符）
+_DIGEST_MEMO_MIN_CHARS = 16 * 1024
+_DIGEST_MEMO_MAX_CHARS = 8 * 1024 * 1024
+_digest_memo: "OrderedDict[str, str]" = OrderedDict()
+_digest_memo_chars = 0
+_digest_memo_lock = threading.Lock()
+
+
+def content_digest(content: str) -> str:
+    """
+    内容的 SHA-256 摘要（较大的内容按内容记忆）
+
+    记忆表以内容字符串为键：查询仍需计算字符串哈希并按相等比较
+    （同一对象的哈希值由 str 缓存、相等比较先比较身份，这时开销很小；
+    内容相同的不同对象需完整哈希与比较一次），省去的是 SHA-256 与 UTF-8 编码。
+
+    Args:
+        content: SVG/HTML 内容
+
+    Returns:
+        SHA-256 十六进制摘要
+    """
+    global _digest_memo_chars
+    if len(content) < _DIGEST_MEMO_MIN_CHARS:
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    with _digest_memo_lock:
+        digest = _digest_memo.get(content)
+        if digest is not None:
+            _digest_memo.move_to_end(content)
+            return digest
+
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    if len(content) > _DIGEST_MEMO_MAX_CHARS:
+        return digest
+
+    with _digest_memo_lock:
+        if content not in _digest_memo:
+            _digest_memo[content] = digest
+            _digest_memo_chars += len(content)
+            while _digest_memo_chars > _DIGEST_MEMO_MAX_CHARS:
+                evicted, _ = _digest_memo.popitem(last=False)
+                _digest_memo_chars -= len(evicted)
+    return digest
+
+
+def default_cache_dir() -> str:
+    """磁盘层默认目录：用户缓存目录（$XDG_CACHE_HOME 或 ~/.cache）下的 html2word/render"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'html2word', 'render')
+
+
+def secure_cache_dir(path: str) -> bool:
+    """
+    创建（权限 0700）并校验磁盘层目录
+
+    缓存条目会直接嵌入文档，目录必须只有当前用户可写：
+    属主不是当前用户、或同组/其他用户可写的目录不使用（防止他人预置缓存文件）。
+
+    Args:
+        path: 缓存目录
+
+    Returns:
+        目录可安全使用时返回 True
+    """
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        st = os.stat(path)
+    except OSError as e:
+        logger.warning(f"Render cache directory unavailable, disk tier disabled: {path} ({e})")
+        return False
+
+    if not stat.S_ISDIR(st.st_mode):
+        logger.warning(f"Render cache path is not a directory, disk tier disabled: {path}")
+        return False
+    if hasattr(os, 'getuid'):
+        if st.st_uid != os.getuid():
+            logger.warning(f"Render cache directory is owned by another user, disk tier disabled: {path}")
+            return False
+        if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            logger.warning(f"Render cache directory is writable by other users, disk tier disabled: {path}")
+            return False
+    return True
+
+
+def _is_valid_png(data: bytes) -> bool:
+    """校验磁盘条目是完整的 PNG（签名与结束块）"""
+    return data.startswith(_PNG_SIGNATURE) and data.endswith(_PNG_IEND)
+
+
+def make_render_key(kind: str, content: str, width: int, height: int, scale: float) -> str:
+    """
+    生成渲染结果的缓存键
+
+    Args:
+        kind: 渲染类型（如 'svg'、'html'）
+        content: 被渲染的 SVG/HTML 内容
+        width: 目标宽度（像素）
+        height: 目标高度（像素）
+        scale: 截图缩放因子
+
+    Returns:
+        SHA-256 十六进制摘要
+    """
+    key = f"{RENDERER_VERSION}|{kind}|{width}x{height}@{scale}|{content_digest(content)}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """
+    两级渲染缓存
+
+    内存层为按字节数限制的 LRU；磁盘层以缓存键为文件名（按前两位分目录），
+    先写临时文件再 os.replace，同一用户的多个进程并发读写同一目录是安全的。
+    磁盘目录只对当前用户开放（0700，见 secure_cache_dir），读取的条目须为完整的 PNG。
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        max_disk_bytes: Optional[int] = None,
+        disk_enabled: Optional[bool] = None
+    ):
+        """
+        Args:
+            max_memory_bytes: 内存层上限（默认 HTML2WORD_RENDER_CACHE_MEMORY_MB，64MB）
+            cache_dir: 磁盘层目录（默认 HTML2WORD_RENDER_CACHE_DIR，~/.cache/html2word/render；
+                       属主须为当前用户且他人不可写，否则不启用磁盘层）
+            max_disk_bytes: 磁盘层上限（默认 HTML2WORD_RENDER_CACHE_DISK_MB，512MB）
+            disk_enabled: 是否启用磁盘层（默认 HTML2WORD_RENDER_CACHE_DISK，true）
+        """
+        if max_memory_bytes is None:
+            max_memory_bytes = int(float(os.environ.get('HTML2WORD_RENDER_CACHE_MEMORY_MB', '64')) * 1024 * 1024)
+        if max_disk_bytes is None:
+            max_disk_bytes = int(float(os.environ.get('HTML2WORD_RENDER_CACHE_DISK_MB', '512')) * 1024 * 1024)
+        if disk_enabled is None:
+            disk_enabled = os.environ.get('HTML2WORD_RENDER_CACHE_DISK', 'true').lower() == 'true'
+        if cache_dir is None:
+            cache_dir = os.environ.get('HTML2WORD_RENDER_CACHE_DIR') or default_cache_dir()
+
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.cache_dir = None
+        if disk_enabled and max_disk_bytes > 0 and secure_cache_dir(cache_dir):
+            self.cache_dir = cache_dir
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        # 磁盘占用估计值；首次写入时扫描目录初始化
+        self._disk_bytes: Optional[int] = None
+
+        self.stats: Dict[str, int] = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'memory_evictions': 0,
+            'disk_evictions': 0,
+            'bytes_served': 0,
+            'bytes_stored': 0,
+        }
+
+    @property
+    def memory_bytes(self) -> int:
+        """内存层当前占用字节数"""
+        return self._memory_bytes
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + '.png')
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        查询缓存（内存层未命中时读取磁盘层并回填内存层）
+
+        Args:
+            key: 缓存键（见 make_render_key）
+
+        Returns:
+            缓存的 PNG 数据或 None
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                self.stats['bytes_served'] += len(data)
+                return data
+
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['disk_hits'] += 1
+            self.stats['bytes_served'] += len(data)
+            self._put_memory(key, data)
+        return data
+
+    def contains(self, key: str) -> bool:
+        """检查缓存中是否存在（不计入命中统计）"""
+        with self._lock:
+            if key in self._memory:
+                return True
+        return self.cache_dir is not None and os.path.exists(self._disk_path(key))
+
+    def put(self, key: str, data: bytes):
+        """
+        写入缓存（内存层 + 磁盘层）
+
+        Args:
+            key: 缓存键
+            data: PNG 数据
+        """
+        if not data:
+            return
+        with self._lock:
+            self._put_memory(key, data)
+            self.stats['stores'] += 1
+            self.stats['bytes_stored'] += len(data)
+        self._write_disk(key, data)
+
+    def clear_memory(self):
+        """清空内存层"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def _put_memory(self, key: str, data: bytes):
+        """写入内存层并按字节数淘汰最久未使用的条目（调用方持有锁）"""
+        if len(data) > self.max_memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats['memory_evictions'] += 1
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if self.cache_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if not _is_valid_png(data):
+            # 截断或损坏的条目：丢弃并删除
+            logger.debug(f"Discarding invalid render cache entry: {path}")
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+        try:
+            # 更新访问时间，磁盘淘汰按最近使用排序
+            os.utime(path, None)
+        except OSError:
+            pass
+        return data
+
+    def _write_disk(self, key: str, data: bytes):
+        if self.cache_dir is None or len(data) > self.max_disk_bytes:
+            return
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            return
+        try:
+            directory = os.path.dirname(path)
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except Exception:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+        except Exception as e:
+            logger.debug(f"Render cache disk write failed: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(data)
+            over_limit = self._disk_bytes > self.max_disk_bytes
+        if over_limit:
+            self._evict_disk()
+
+    def _scan_disk_entries(self):
+        """列出磁盘层所有缓存文件 [(mtime, size, path), ...]"""
+        entries = []
+        try:
+            for shard in os.scandir(self.cache_dir):
+                if not shard.is_dir():
+                    continue
+                for entry in os.scandir(shard.path):
+                    if entry.name.endswith('.png'):
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(size for _, size, _ in self._scan_disk_entries())
+
+    def _evict_disk(self):
+        """按最近使用时间淘汰磁盘条目，降到上限的 90%（其他进程可能同时删除，忽略错误）"""
+        entries = sorted(self._scan_disk_entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_disk_bytes * 0.9)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                evicted += 1
+            except OSError:
+                pass
+            total -= size
+
+        with self._lock:
+            self._disk_bytes = total
+            self.stats['disk_evictions'] += evicted
+        if evicted:
+            logger.debug(f"Render cache evicted {evicted} disk entries, {total} bytes remain")
+
+
+# 全局单例
+_render_cache: Optional[RenderCache] = None
+_render_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> RenderCache:
+    """获取渲染缓存单例（SVG 与 HTML 转换器共享）"""
+    global _render_cache
+    if _render_cache is None:
+        with _render_cache_lock:
+            if _render_cache is None:
+                _render_cache = RenderCache()
+    return _render_cache
@@ -0,0 +1,338 @@
+"""
+统一渲染调度器
+收集 SVG / HTML 截图 / 图标渲染任务，按内容键去重，限制并发并为每个任务设置截止时间
+"""
+import atexit
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from html2word.utils.deadline import get_deadline
+from html2word.utils.render_cache import get_render_cache
+
+logger = logging.getLogger(__name__)
+
+
+def default_render_workers() -> int:
+    """
+    默认渲染并发数（HTML2WORD_RENDER_WORKERS 优先）
+
+    浏览器渲染本身占用多个 CPU 核，并发数取 CPU 核数的一半，最多 4 个。
+    """
+    env_workers = os.environ.get('HTML2WORD_RENDER_WORKERS')
+    if env_workers:
+        return max(1, int(env_workers))
+    return max(1, min(4, (os.cpu_count() or 2) // 2))
+
+
+class _BuildState:
+    """一次构建的任务记录与统计（同时进行的多个转换互不影响）"""
+
+    __slots__ = ('jobs', 'stats')
+
+    def __init__(self):
+        self.jobs: Dict[str, "_RenderJob"] = {}
+        self.stats: Dict[str, Any] = {
+            'submitted': 0,
+            'deduplicated': 0,
+            'inline': 0,
+            'completed': 0,
+            'failed': 0,
+            'timed_out': 0,
+            'by_kind': {},
+        }
+
+    def count_kind(self, kind: str):
+        by_kind = self.stats['by_kind']
+        by_kind[kind] = by_kind.get(kind, 0) + 1
+
+
+class _RenderJob:
+    """一个已提交的渲染任务（批量任务的多个键共享同一个 future）"""
+
+    __slots__ = ('kind', 'future', 'timeout', 'started_at', 'batch', 'build')
+
+    def __init__(self, kind: str, timeout: float, build: _BuildState, batch: bool = False):
+        self.kind = kind
+        self.future: Future = Future()
+        self.timeout = timeout
+        self.started_at: Optional[float] = None
+        self.batch = batch
+        self.build = build
+
+
+class RenderScheduler:
+    """
+    渲染任务调度器
+
+    预处理阶段通过 submit / submit_batch 异步提交任务，文档构建继续进行；
+    构建器需要图片时调用 run：若任务已提交则等待其结果（不超过截止时间），
+    否则在当前线程直接执行。同一内容键在一次构建内只渲染一次。
+
+    工作线程池在进程内共享（限制总并发）；任务记录与统计按构建隔离
+    （begin_build 为当前线程/上下文开始新的构建），不同线程中同时进行的转换互不干扰。
+
+    设置了转换截止时间（见 deadline.py）时，等待不超过剩余的渲染预算
+    （任务在提交方的上下文副本中执行，截止时间随之传递）；
+    预算耗尽后不再提交或执行渲染，只返回渲染缓存中已有的结果。
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, default_timeout: Optional[float] = None):
+        """
+        Args:
+            max_workers: 最大并发数（默认 default_render_workers()）
+            default_timeout: 单个任务的截止时间（秒，从开始执行算起；默认 HTML2WORD_RENDER_TIMEOUT，60）
+        """
+        if max_workers is None:
+            max_workers = default_render_workers()
+        if default_timeout is None:
+            default_timeout = float(os.environ.get('HTML2WORD_RENDER_TIMEOUT', '60'))
+
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # 当前上下文的构建状态；未调用 begin_build 的调用方共用默认状态
+        self._build_var: contextvars.ContextVar = contextvars.ContextVar('render_build', default=None)
+        self._default_build = _BuildState()
+        # 已提交、尚未开始执行的任务（shutdown 时取消）
+        self._queued: set = set()
+
+    def begin_build(self):
+        """为当前线程/上下文开始新的构建：新的任务记录与统计（渲染结果由渲染缓存保留）"""
+        self._build_var.set(_BuildState())
+
+    def _build(self) -> _BuildState:
+        return self._build_var.get() or self._default_build
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """当前构建的统计"""
+        return self._build().stats
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='html2word-render')
+            return self._executor
+
+    def _execute(self, job: _RenderJob, fn: Callable, args: tuple):
+        """在工作线程中执行任务并设置 future 结果"""
+        with self._lock:
+            self._queued.discard(job)
+        if not job.future.set_running_or_notify_cancel():
+            return
+        job.started_at = time.time()
+        try:
+            result = fn(*args)
+        except Exception as e:
+            with self._lock:
+                job.build.stats['failed'] += 1
+            logger.warning(f"Render job ({job.kind}) failed: {e}")
+            job.future.set_result(None)
+            return
+        with self._lock:
+            job.build.stats['completed'] += 1
+        job.future.set_result(result)
+
+    def submit(self, kind: str, key: str, fn: Callable, *args, timeout: Optional[float] = None) -> bool:
+        """
+        异步提交一个渲染任务
+
+        Args:
+            kind: 任务类型（'svg'、'html'、'icon' 等，用于统计）
+            key: 内容键（相同键只执行一次）
+            fn: 渲染函数，返回 PNG bytes 或 None
+            *args: 渲染函数参数
+            timeout: 截止时间（秒）
+
+        Returns:
+            True 表示新提交，False 表示已存在相同任务或转换预算已耗尽
+        """
+        deadline = get_deadline()
+        if deadline.is_low():
+            deadline.record(f'{kind}_prerender_skipped')
+            return False
+
+        build = self._build()
+        with self._lock:
+            if key in build.jobs:
+                build.stats['deduplicated'] += 1
+                return False
+            job = _RenderJob(kind, timeout or self.default_timeout, build)
+            build.jobs[key] = job
+            build.stats['submitted'] += 1
+            build.count_kind(kind)
+            self._queued.add(job)
+
+        self._get_executor().submit(contextvars.copy_context().run, self._execute, job, fn, args)
+        return True
+
+    def submit_batch(self, kind: str, keys: Iterable[str], fn: Callable, *args,
+                     timeout: Optional[float] = None) -> int:
+        """
+        异步提交批量渲染任务（如 SVG 精灵图）：fn 返回 {key: png_bytes}，各键共享同一任务
+
+        Args:
+            kind: 任务类型
+            keys: 该批次覆盖的内容键
+            fn: 批量渲染函数
+            *args: 渲染函数参数
+            timeout: 整个批次的截止时间（秒）
+
+        Returns:
+            新登记的键数量
+        """
+        deadline = get_deadline()
+        if deadline.is_low():
+            deadline.record(f'{kind}_prerender_skipped')
+            return 0
+
+        build = self._build()
+        job = _RenderJob(kind, timeout or self.default_timeout, build, batch=True)
+        added = 0
+        with self._lock:
+            for key in keys:
+                if key in build.jobs:
+                    build.stats['deduplicated'] += 1
+                    continue
+                build.jobs[key] = job
+                added += 1
+            if added:
+                build.stats['submitted'] += added
+                build.count_kind(kind)
+                self._queued.add(job)
+
+        if added:
+            self._get_executor().submit(contextvars.copy_context().run, self._execute, job, fn, args)
+        return added
+
+    def _wait(self, key: str, job: _RenderJob) -> Any:
+        """等待任务完成；超过任务截止时间或转换预算耗尽时返回 None"""
+        deadline = get_deadline()
+        while True:
+            started_at = job.started_at
+            if started_at is None:
+                # 尚在排队：短暂等待后重新检查
+                wait = 0.5
+            else:
+                wait = started_at + job.timeout - time.time()
+                if wait <= 0:
+                    wait = 0
+            budget = max(0.0, deadline.render_budget())
+            try:
+                result = job.future.result(timeout=min(wait, budget))
+            except FutureTimeoutError:
+                if budget <= wait:
+                    # 转换预算耗尽：放弃等待，任务继续在后台完成并写入渲染缓存
+                    deadline.record(f'{job.kind}_render_abandoned')
+                    return None
+                if started_at is not None:
+                    with self._lock:
+                        job.build.stats['timed_out'] += 1
+                    logger.warning(f"Render job ({job.kind}) exceeded its {job.timeout:.0f}s deadline")
+                    return None
+                continue
+            except CancelledError:
+                return None
+
+            if job.batch:
+                return result.get(key) if result else None
+            return result
+
+    def run(self, kind: str, key: str, fn: Callable, *args) -> Any:
+        """
+        获取渲染结果：已提交（或已执行过）的任务等待其结果，否则在当前线程执行
+
+        批量任务未产出该键（例如批次开始前已在缓存中）时，同样在当前线程执行 fn，
+        fn 应自行查询渲染缓存。
+
+        Args:
+            kind: 任务类型
+            key: 内容键
+            fn: 渲染函数
+            *args: 渲染函数参数
+
+        Returns:
+            渲染结果或 None（预算耗尽且缓存中没有结果时也返回 None，由调用方使用低代价回退）
+        """
+        deadline = get_deadline()
+        build = self._build()
+        with self._lock:
+            job = build.jobs.get(key)
+
+        if job is not None:
+            result = self._wait(key, job)
+            if result is not None:
+                return result
+            if deadline.is_low():
+                return self._cached_only(kind, key)
+            # 任务失败或超过截止时间：不再重复渲染
+            # 批次已完成但未产出该键、或任务被取消时，回退到当前线程执行
+            if not job.future.cancelled() and (not job.batch or not job.future.done()):
+                return None
+
+        if deadline.is_low():
+            return self._cached_only(kind, key)
+
+        if deadline.limited:
+            # 有截止时间时交给工作线程执行，等待时间受剩余预算限制
+            with self._lock:
+                build.jobs.pop(key, None)
+            self.submit(kind, key, fn, *args)
+            with self._lock:
+                job = build.jobs.get(key)
+            result = self._wait(key, job) if job is not None else None
+            if result is None and deadline.is_low():
+                return self._cached_only(kind, key)
+            return result
+
+        # 在当前线程执行，并登记结果供相同内容键的后续调用复用
+        inline_job = _RenderJob(kind, self.default_timeout, build)
+        with self._lock:
+            build.jobs[key] = inline_job
+            build.stats['inline'] += 1
+            build.count_kind(kind)
+        self._execute(inline_job, fn, args)
+        return inline_job.future.result()
+
+    @staticmethod
+    def _cached_only(kind: str, key: str) -> Any:
+        """转换预算耗尽：只返回渲染缓存中已有的结果（内容键即渲染缓存键）"""
+        deadline = get_deadline()
+        cached = get_render_cache().get(key)
+        deadline.record(f'{kind}_cached_only' if cached else f'{kind}_render_skipped')
+        return cached
+
+    def shutdown(self, wait: bool = False):
+        """关闭工作线程池（未开始的任务被取消；进程退出时自动调用）"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            jobs = list(self._queued)
+            self._queued.clear()
+        # 排队中的任务取消其 future，工作线程取到后直接跳过（_execute）
+        for job in jobs:
+            job.future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# 全局单例
+_render_scheduler: Optional[RenderScheduler] = None
+_render_scheduler_lock = threading.Lock()
+
+
+def get_render_scheduler() -> RenderScheduler:
+    """获取渲染调度器单例"""
+    global _render_scheduler
+    if _render_scheduler is None:
+        with _render_scheduler_lock:
+            if _render_scheduler is None:
+                scheduler = RenderScheduler()
+                atexit.register(scheduler.shutdown)
+                _render_scheduler = scheduler
+    return _render_scheduler
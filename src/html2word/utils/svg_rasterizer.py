@@ -0,0 +1,874 @@
+"""
+进程内 SVG 光栅化
+按 SVG 使用的特性选择后端：简单图形（图标、纯路径图表）在进程内渲染，
+复杂 SVG（文字、渐变、滤镜、裁剪等）交给浏览器。
+"""
+import logging
+import math
+import os
+import re
+import threading
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from html2word.utils.colors import ColorConverter
+from html2word.utils.raster_sizing import encode_png
+
+logger = logging.getLogger(__name__)
+
+SVG_NS = '{http://www.w3.org/2000/svg}'
+
+# 绘制类元素与容器元素
+SHAPE_TAGS = frozenset({'path', 'rect', 'circle', 'ellipse', 'line', 'polyline', 'polygon'})
+CONTAINER_TAGS = frozenset({'svg', 'g'})
+# 不产生图形输出的元素
+METADATA_TAGS = frozenset({'title', 'desc', 'metadata'})
+
+
+def classify_svg(svg_content: str) -> Optional[FrozenSet[str]]:
+    """
+    SVG 特性分类：返回 SVG 使用的元素与高级特性集合
+
+    元素以标签名表示（如 'path'、'text'），高级特性以 'feature:' 前缀表示：
+    feature:paint-server（url(#...) 引用：渐变、图案）、feature:clip、feature:mask、
+    feature:filter、feature:dash、feature:marker、feature:percent（百分比几何尺寸）、
+    feature:css（<style> 规则）、feature:css-transform（style 中的 CSS transform）。
+
+    Args:
+        svg_content: SVG XML字符串
+
+    Returns:
+        特性集合；无法解析时返回 None
+    """
+    try:
+        from lxml import etree
+        root = etree.fromstring(svg_content.encode('utf-8'))
+    except Exception:
+        return None
+
+    features: Set[str] = set()
+    for element in root.iter():
+        if not isinstance(element.tag, str):
+            continue
+        tag = element.tag.replace(SVG_NS, '')
+        features.add(tag)
+        if tag == 'style':
+            features.add('feature:css')
+
+        attrs = dict(element.attrib)
+        style = attrs.pop('style', '')
+        if style:
+            declarations = _parse_style(style)
+            if declarations.get('transform', 'none') != 'none':
+                features.add('feature:css-transform')
+            attrs.update(declarations)
+
+        for name, value in attrs.items():
+            value = str(value)
+            if name in ('clip-path',) and value != 'none':
+                features.add('feature:clip')
+            elif name == 'mask' and value != 'none':
+                features.add('feature:mask')
+            elif name == 'filter' and value != 'none':
+                features.add('feature:filter')
+            elif name == 'stroke-dasharray' and value not in ('none', '0', ''):
+                features.add('feature:dash')
+            elif name.startswith('marker') and value != 'none':
+                features.add('feature:marker')
+            elif 'url(' in value:
+                features.add('feature:paint-server')
+            elif name in ('x', 'y', 'width', 'height', 'cx', 'cy', 'r', 'rx', 'ry',
+                          'x1', 'y1', 'x2', 'y2') and '%' in value and tag != 'svg':
+                features.add('feature:percent')
+
+    return frozenset(features)
+
+
+def _parse_style(style: str) -> Dict[str, str]:
+    """解析 style 属性为字典"""
+    result = {}
+    for declaration in style.split(';'):
+        if ':' in declaration:
+            name, value = declaration.split(':', 1)
+            result[name.strip().lower()] = value.strip()
+    return result
+
+
+class RasterizerBackend:
+    """光栅化后端接口"""
+
+    name = 'base'
+
+    def is_available(self) -> bool:
+        """后端依赖是否可用"""
+        return True
+
+    def supports(self, features: FrozenSet[str]) -> bool:
+        """是否能正确渲染使用了这些特性的 SVG"""
+        raise NotImplementedError
+
+    def render(self, svg_content: str, width: int, height: int, scale: float) -> Optional[bytes]:
+        """
+        渲染 SVG 为 PNG（白色背景，尺寸为 width*scale x height*scale，与浏览器截图一致）
+
+        Args:
+            svg_content: SVG XML字符串
+            width: 目标宽度（CSS 像素）
+            height: 目标高度（CSS 像素）
+            scale: 缩放因子
+
+        Returns:
+            PNG 数据或 None
+        """
+        raise NotImplementedError
+
+
+class CairoSVGBackend(RasterizerBackend):
+    """cairosvg 后端（可选依赖，支持大部分静态 SVG 特性，包括文字和渐变）"""
+
+    name = 'cairosvg'
+
+    UNSUPPORTED = frozenset({'foreignObject', 'script', 'feature:css'})
+
+    def __init__(self):
+        self._module = None
+        self._checked = False
+
+    def is_available(self) -> bool:
+        if not self._checked:
+            self._checked = True
+            try:
+                import cairosvg
+                self._module = cairosvg
+            except (ImportError, OSError):
+                # OSError: cairo 动态库缺失
+                self._module = None
+        return self._module is not None
+
+    def supports(self, features: FrozenSet[str]) -> bool:
+        return not (features & self.UNSUPPORTED)
+
+    def render(self, svg_content: str, width: int, height: int, scale: float) -> Optional[bytes]:
+        return self._module.svg2png(
+            bytestring=svg_content.encode('utf-8'),
+            output_width=int(round(width * scale)),
+            output_height=int(round(height * scale)),
+            background_color='white'
+        )
+
+
+class _Unsupported(Exception):
+    """内置渲染器遇到无法处理的内容"""
+
+
+class BuiltinBackend(RasterizerBackend):
+    """
+    内置 PIL 渲染器：支持基本图形（path/rect/circle/ellipse/line/polyline/polygon）、
+    分组与 transform、纯色填充（nonzero/evenodd 填充规则）/描边及透明度，
+    viewBox 按 preserveAspectRatio 映射。超采样后缩小以获得抗锯齿效果。
+    """
+
+    name = 'builtin'
+
+    SUPPORTED = CONTAINER_TAGS | SHAPE_TAGS | METADATA_TAGS | frozenset({'defs'})
+    SUPERSAMPLE = 2
+    # 曲线与圆弧的分段数
+    CURVE_SEGMENTS = 16
+
+    def supports(self, features: FrozenSet[str]) -> bool:
+        for feature in features:
+            if feature.startswith('feature:') or feature not in self.SUPPORTED:
+                return False
+        return True
+
+    def render(self, svg_content: str, width: int, height: int, scale: float) -> Optional[bytes]:
+        from lxml import etree
+        from PIL import Image, ImageDraw
+
+        root = etree.fromstring(svg_content.encode('utf-8'))
+        factor = scale * self.SUPERSAMPLE
+        canvas_w = max(1, int(round(width * factor)))
+        canvas_h = max(1, int(round(height * factor)))
+
+        image = Image.new('RGB', (canvas_w, canvas_h), 'white')
+        draw = ImageDraw.Draw(image, 'RGBA')
+
+        matrix = _multiply((factor, 0.0, 0.0, factor, 0.0, 0.0), self._viewbox_matrix(root, width, height))
+
+        self._render_children(root, image, draw, matrix, self._root_style())
+
+        if self.SUPERSAMPLE > 1:
+            image = image.resize((int(round(width * scale)), int(round(height * scale))), Image.LANCZOS)
+
+        return encode_png(image)
+
+    @staticmethod
+    def _viewbox_matrix(root, width: int, height: int) -> "Matrix":
+        """viewBox 到视口（CSS 像素）的映射，按 preserveAspectRatio 对齐与缩放"""
+        viewbox = root.get('viewBox')
+        if not viewbox:
+            return (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+        parts = [float(v) for v in _NUMBER_RE.findall(viewbox)]
+        if len(parts) != 4 or parts[2] <= 0 or parts[3] <= 0:
+            raise _Unsupported('invalid viewBox')
+        vx, vy, vw, vh = parts
+
+        # preserveAspectRatio="[defer] <align> [meet|slice]"，默认 xMidYMid meet
+        tokens = (root.get('preserveAspectRatio') or 'xMidYMid meet').split()
+        if tokens and tokens[0] == 'defer':
+            tokens = tokens[1:]
+        align = tokens[0] if tokens else 'xMidYMid'
+        mode = tokens[1] if len(tokens) > 1 else 'meet'
+        if mode not in ('meet', 'slice'):
+            raise _Unsupported(f'preserveAspectRatio {mode}')
+
+        if align == 'none':
+            scale_x, scale_y = width / vw, height / vh
+            return (scale_x, 0.0, 0.0, scale_y, -vx * scale_x, -vy * scale_y)
+
+        match = re.fullmatch(r'x(Min|Mid|Max)Y(Min|Mid|Max)', align)
+        if not match:
+            raise _Unsupported(f'preserveAspectRatio {align}')
+        ratio = min(width / vw, height / vh) if mode == 'meet' else max(width / vw, height / vh)
+        position = {'Min': 0.0, 'Mid': 0.5, 'Max': 1.0}
+        offset_x = (width - vw * ratio) * position[match.group(1)] - vx * ratio
+        offset_y = (height - vh * ratio) * position[match.group(2)] - vy * ratio
+        return (ratio, 0.0, 0.0, ratio, offset_x, offset_y)
+
+    # ------------------------------------------------------------------
+    # 样式
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _root_style() -> Dict[str, str]:
+        return {'fill': 'black', 'stroke': 'none', 'stroke-width': '1', 'color': 'black',
+                'fill-opacity': '1', 'stroke-opacity': '1', 'fill-rule': 'nonzero'}
+
+    INHERITED = ('fill', 'stroke', 'stroke-width', 'color', 'fill-opacity', 'stroke-opacity',
+                 'fill-rule', 'visibility')
+
+    def _element_style(self, element, parent_style: Dict[str, str]) -> Tuple[Dict[str, str], float]:
+        """计算元素样式（继承属性 + 自身属性 + style），返回 (样式, 元素 opacity)"""
+        style = {name: parent_style[name] for name in self.INHERITED if name in parent_style}
+        own = {name: str(value) for name, value in element.attrib.items()}
+        inline = own.pop('style', '')
+        if inline:
+            own.update(_parse_style(inline))
+        style.update(own)
+        opacity = float(own.get('opacity', '1') or 1)
+        return style, opacity
+
+    @staticmethod
+    def _paint(value: str, style: Dict[str, str], opacity: float) -> Optional[Tuple[int, int, int, int]]:
+        """解析填充/描边颜色为 RGBA；none/transparent 返回 None"""
+        if not value or value in ('none', 'transparent'):
+            return None
+        if value == 'currentColor':
+            value = style.get('color', 'black')
+        rgb = ColorConverter.parse_color(value)
+        if rgb is None:
+            raise _Unsupported(f'paint {value}')
+        alpha = opacity
+        match = ColorConverter.RGB_PATTERN.match(value.strip().lower())
+        if match and match.group(4) is not None:
+            alpha *= float(match.group(4))
+        if alpha <= 0:
+            return None
+        return rgb[0], rgb[1], rgb[2], int(round(min(alpha, 1.0) * 255))
+
+    # ------------------------------------------------------------------
+    # 遍历
+    # ------------------------------------------------------------------
+
+    def _render_children(self, parent, image, draw, matrix, parent_style):
+        for element in parent:
+            if not isinstance(element.tag, str):
+                continue
+            tag = element.tag.replace(SVG_NS, '')
+            if tag in METADATA_TAGS or tag == 'defs':
+                continue
+
+            style, opacity = self._element_style(element, parent_style)
+            if style.get('display') == 'none':
+                continue
+            element_matrix = matrix
+            transform = element.get('transform')
+            if transform:
+                element_matrix = _multiply(matrix, _parse_transform(transform))
+
+            if tag == 'g' or tag == 'svg':
+                if opacity < 1:
+                    # 组透明度需要离屏合成，内置渲染器不支持
+                    raise _Unsupported('group opacity')
+                self._render_children(element, image, draw, element_matrix, style)
+            elif tag in SHAPE_TAGS:
+                if style.get('visibility') == 'hidden':
+                    continue
+                subpaths, closed = self._shape_subpaths(tag, element)
+                if subpaths:
+                    self._draw_shape(image, draw, tag, subpaths, closed, element_matrix, style, opacity)
+            else:
+                raise _Unsupported(tag)
+
+    def _draw_shape(self, image, draw, tag, subpaths, closed, matrix, style, opacity):
+        points_list = [[_apply(matrix, x, y) for x, y in points] for points in subpaths]
+
+        fill = None
+        if tag != 'line':
+            fill = self._paint(style.get('fill', 'black'),
+                               style, opacity * float(style.get('fill-opacity', '1') or 1))
+
+        if fill is not None:
+            fillable = [points for points in points_list if len(points) >= 3]
+            if fillable:
+                # 所有子路径一起按填充规则扫描（自相交路径、同向/反向嵌套子路径）
+                nonzero = style.get('fill-rule', 'nonzero').strip() != 'evenodd'
+                filled = _fill_mask(image.size, fillable, nonzero)
+                if filled is not None:
+                    (left, top), mask = filled
+                    if fill[3] < 255:
+                        mask = mask.point(lambda v: fill[3] if v else 0)
+                    image.paste(fill[:3], (left, top, left + mask.width, top + mask.height), mask)
+
+        stroke = self._paint(style.get('stroke', 'none'),
+                             style, opacity * float(style.get('stroke-opacity', '1') or 1))
+        if stroke is not None:
+            stroke_width = _parse_length(style.get('stroke-width', '1'))
+            # 线宽随 transform 缩放
+            width_px = stroke_width * math.sqrt(abs(matrix[0] * matrix[3] - matrix[1] * matrix[2]))
+            if width_px <= 0:
+                return
+            width_px = max(1, int(round(width_px)))
+            for points, is_closed in zip(points_list, closed):
+                if len(points) < 2:
+                    continue
+                line = points + [points[0]] if is_closed else points
+                draw.line(line, fill=stroke, width=width_px, joint='curve')
+
+    # ------------------------------------------------------------------
+    # 几何
+    # ------------------------------------------------------------------
+
+    def _shape_subpaths(self, tag, element) -> Tuple[List[List[Tuple[float, float]]], List[bool]]:
+        """将图形元素转换为折线子路径（用户坐标），返回 (子路径列表, 是否闭合列表)"""
+        get = lambda name, default='0': _parse_length(element.get(name, default))
+
+        if tag == 'path':
+            return _flatten_path(element.get('d', ''), self.CURVE_SEGMENTS)
+        if tag == 'rect':
+            x, y, w, h = get('x'), get('y'), get('width'), get('height')
+            if w <= 0 or h <= 0:
+                return [], []
+            rx = element.get('rx')
+            ry = element.get('ry')
+            rx = _parse_length(rx) if rx is not None else None
+            ry = _parse_length(ry) if ry is not None else None
+            if rx is None:
+                rx = ry or 0
+            if ry is None:
+                ry = rx
+            rx, ry = min(rx, w / 2), min(ry, h / 2)
+            if rx <= 0 or ry <= 0:
+                return [[(x, y), (x + w, y), (x + w, y + h), (x, y + h)]], [True]
+            points = []
+            for cx, cy, start in ((x + w - rx, y + ry, -90), (x + w - rx, y + h - ry, 0),
+                                  (x + rx, y + h - ry, 90), (x + rx, y + ry, 180)):
+                points.extend(_ellipse_points(cx, cy, rx, ry, start, start + 90, self.CURVE_SEGMENTS // 2))
+            return [points], [True]
+        if tag == 'circle':
+            r = get('r')
+            if r <= 0:
+                return [], []
+            return [_ellipse_points(get('cx'), get('cy'), r, r, 0, 360, self.CURVE_SEGMENTS * 4)], [True]
+        if tag == 'ellipse':
+            rx, ry = get('rx'), get('ry')
+            if rx <= 0 or ry <= 0:
+                return [], []
+            return [_ellipse_points(get('cx'), get('cy'), rx, ry, 0, 360, self.CURVE_SEGMENTS * 4)], [True]
+        if tag == 'line':
+            return [[(get('x1'), get('y1')), (get('x2'), get('y2'))]], [False]
+        if tag in ('polyline', 'polygon'):
+            numbers = [float(v) for v in _NUMBER_RE.findall(element.get('points', ''))]
+            points = list(zip(numbers[0::2], numbers[1::2]))
+            return [points], [tag == 'polygon']
+        raise _Unsupported(tag)
+
+
+# ----------------------------------------------------------------------
+# 几何辅助函数
+# ----------------------------------------------------------------------
+
+_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+_PATH_TOKEN_RE = re.compile(r'([MmLlHhVvCcSsQqTtAaZz])|([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)')
+_TRANSFORM_RE = re.compile(r'(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)')
+
+Matrix = Tuple[float, float, float, float, float, float]
+
+
+def _parse_length(value) -> float:
+    """解析长度（仅支持无单位与 px）"""
+    if value is None:
+        return 0.0
+    value = str(value).strip()
+    if not value:
+        return 0.0
+    if value.endswith('px'):
+        value = value[:-2]
+    try:
+        return float(value)
+    except ValueError:
+        raise _Unsupported(f'length {value}')
+
+
+def _multiply(m1: Matrix, m2: Matrix) -> Matrix:
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return (a1 * a2 + c1 * b2, b1 * a2 + d1 * b2,
+            a1 * c2 + c1 * d2, b1 * c2 + d1 * d2,
+            a1 * e2 + c1 * f2 + e1, b1 * e2 + d1 * f2 + f1)
+
+
+def _apply(m: Matrix, x: float, y: float) -> Tuple[float, float]:
+    return m[0] * x + m[2] * y + m[4], m[1] * x + m[3] * y + m[5]
+
+
+def _parse_transform(value: str) -> Matrix:
+    """解析 transform 属性为仿射矩阵"""
+    matrix: Matrix = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+    for name, args in _TRANSFORM_RE.findall(value):
+        nums = [float(v) for v in _NUMBER_RE.findall(args)]
+        if name == 'matrix' and len(nums) == 6:
+            step = tuple(nums)
+        elif name == 'translate' and nums:
+            step = (1.0, 0.0, 0.0, 1.0, nums[0], nums[1] if len(nums) > 1 else 0.0)
+        elif name == 'scale' and nums:
+            step = (nums[0], 0.0, 0.0, nums[1] if len(nums) > 1 else nums[0], 0.0, 0.0)
+        elif name == 'rotate' and nums:
+            angle = math.radians(nums[0])
+            cos_a, sin_a = math.cos(angle), math.sin(angle)
+            step = (cos_a, sin_a, -sin_a, cos_a, 0.0, 0.0)
+            if len(nums) == 3:
+                cx, cy = nums[1], nums[2]
+                step = _multiply(_multiply((1.0, 0.0, 0.0, 1.0, cx, cy), step), (1.0, 0.0, 0.0, 1.0, -cx, -cy))
+        elif name == 'skewX' and nums:
+            step = (1.0, 0.0, math.tan(math.radians(nums[0])), 1.0, 0.0, 0.0)
+        elif name == 'skewY' and nums:
+            step = (1.0, math.tan(math.radians(nums[0])), 0.0, 1.0, 0.0, 0.0)
+        else:
+            raise _Unsupported(f'transform {name}')
+        matrix = _multiply(matrix, step)
+    return matrix
+
+
+def _fill_mask(size: Tuple[int, int], polygons: List[List[Tuple[float, float]]], nonzero: bool):
+    """
+    按填充规则扫描多边形（像素中心采样，活动边表）
+
+    Args:
+        size: 画布尺寸
+        polygons: 闭合多边形（画布坐标）
+        nonzero: True 为 nonzero 规则，False 为 evenodd
+
+    Returns:
+        (左上角坐标, 'L' 掩码) ；与画布无交集时返回 None
+    """
+    from PIL import Image
+
+    # 边：(y_min, y_max, y_min 处的 x, dx/dy, 绕向)
+    edges = []
+    for points in polygons:
+        count = len(points)
+        for i in range(count):
+            x0, y0 = points[i]
+            x1, y1 = points[(i + 1) % count]
+            if y0 == y1:
+                continue
+            direction = 1 if y1 > y0 else -1
+            if y0 > y1:
+                x0, y0, x1, y1 = x1, y1, x0, y0
+            edges.append((y0, y1, x0, (x1 - x0) / (y1 - y0), direction))
+    if not edges:
+        return None
+
+    xs = [x for points in polygons for x, _ in points]
+    left = max(0, int(math.floor(min(xs))))
+    right = min(size[0], int(math.ceil(max(xs))) + 1)
+    top = max(0, int(math.floor(min(edge[0] for edge in edges))))
+    bottom = min(size[1], int(math.ceil(max(edge[1] for edge in edges))) + 1)
+    width, height = right - left, bottom - top
+    if width <= 0 or height <= 0:
+        return None
+
+    edges.sort()
+    edge_count = len(edges)
+    mask = bytearray(width * height)
+    span = b'\xff' * width
+    active = []
+    next_edge = 0
+    first_end = math.inf  # 活动边中最早结束的 y，到达后才重建活动边表
+    for row in range(top, bottom):
+        center_y = row + 0.5
+        while next_edge < edge_count and edges[next_edge][0] <= center_y:
+            edge = edges[next_edge]
+            active.append(edge)
+            first_end = min(first_end, edge[1])
+            next_edge += 1
+        if first_end <= center_y:
+            active = [edge for edge in active if edge[1] > center_y]
+            first_end = min((edge[1] for edge in active), default=math.inf)
+        if not active:
+            if next_edge >= edge_count:
+                break
+            continue
+
+        offset = (row - top) * width - left
+        if len(active) == 2:
+            # 只有两个交点：两者之间在任一规则下都属于内部
+            (y0, _, x0, slope, _), (y1, _, x1, slope1, _) = active
+            xa, xb = x0 + (center_y - y0) * slope, x1 + (center_y - y1) * slope1
+            if xa > xb:
+                xa, xb = xb, xa
+            start = max(left, int(math.ceil(xa - 0.5)))
+            end = min(right, int(math.ceil(xb - 0.5)))
+            if end > start:
+                mask[offset + start:offset + end] = span[:end - start]
+            continue
+
+        crossings = sorted([(x0 + (center_y - y0) * slope, direction)
+                            for y0, _, x0, slope, direction in active])
+        winding = 0
+        for i in range(len(crossings) - 1):
+            winding += crossings[i][1]
+            if (winding == 0) if nonzero else (winding % 2 == 0):
+                continue
+            # 覆盖像素中心落在 [x_left, x_right) 内的像素
+            start = max(left, int(math.ceil(crossings[i][0] - 0.5)))
+            end = min(right, int(math.ceil(crossings[i + 1][0] - 0.5)))
+            if end > start:
+                mask[offset + start:offset + end] = span[:end - start]
+
+    return (left, top), Image.frombytes('L', (width, height), bytes(mask))
+
+
+def _ellipse_points(cx, cy, rx, ry, start_deg, end_deg, segments) -> List[Tuple[float, float]]:
+    points = []
+    for i in range(segments + 1):
+        angle = math.radians(start_deg + (end_deg - start_deg) * i / segments)
+        points.append((cx + rx * math.cos(angle), cy + ry * math.sin(angle)))
+    return points
+
+
+def _arc_points(x1, y1, rx, ry, phi_deg, large_arc, sweep, x2, y2, segments) -> List[Tuple[float, float]]:
+    """SVG 椭圆弧（端点参数化）采样，不含起点"""
+    if rx == 0 or ry == 0 or (x1 == x2 and y1 == y2):
+        return [(x2, y2)]
+    rx, ry = abs(rx), abs(ry)
+    phi = math.radians(phi_deg)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+    dx, dy = (x1 - x2) / 2, (y1 - y2) / 2
+    x1p = cos_phi * dx + sin_phi * dy
+    y1p = -sin_phi * dx + cos_phi * dy
+
+    # 半径过小时按比例放大
+    lam = (x1p * x1p) / (rx * rx) + (y1p * y1p) / (ry * ry)
+    if lam > 1:
+        factor = math.sqrt(lam)
+        rx, ry = rx * factor, ry * factor
+
+    num = rx * rx * ry * ry - rx * rx * y1p * y1p - ry * ry * x1p * x1p
+    den = rx * rx * y1p * y1p + ry * ry * x1p * x1p
+    coef = math.sqrt(max(0.0, num / den)) if den else 0.0
+    if large_arc == sweep:
+        coef = -coef
+    cxp = coef * rx * y1p / ry
+    cyp = -coef * ry * x1p / rx
+    cx = cos_phi * cxp - sin_phi * cyp + (x1 + x2) / 2
+    cy = sin_phi * cxp + cos_phi * cyp + (y1 + y2) / 2
+
+    def angle(ux, uy, vx, vy):
+        value = math.atan2(ux * vy - uy * vx, ux * vx + uy * vy)
+        return value
+
+    theta1 = angle(1, 0, (x1p - cxp) / rx, (y1p - cyp) / ry)
+    delta = angle((x1p - cxp) / rx, (y1p - cyp) / ry, (-x1p - cxp) / rx, (-y1p - cyp) / ry)
+    if not sweep and delta > 0:
+        delta -= 2 * math.pi
+    elif sweep and delta < 0:
+        delta += 2 * math.pi
+
+    count = max(2, int(segments * abs(delta) / (math.pi / 2)))
+    points = []
+    for i in range(1, count + 1):
+        t = theta1 + delta * i / count
+        x = rx * math.cos(t)
+        y = ry * math.sin(t)
+        points.append((cos_phi * x - sin_phi * y + cx, sin_phi * x + cos_phi * y + cy))
+    return points
+
+
+def _tokenize_path(d: str):
+    """路径数据分词；圆弧标志位可以紧挨着书写（如 "a1 1 0 00 1 1"），单独处理"""
+    tokens = []
+    pos = 0
+    length = len(d)
+    arc_index = None
+    while pos < length:
+        ch = d[pos]
+        if ch in ' \t\r\n,':
+            pos += 1
+            continue
+        if ch.isalpha():
+            if ch not in 'MmLlHhVvCcSsQqTtAaZz':
+                raise _Unsupported(f'path command {ch}')
+            tokens.append(ch)
+            arc_index = 0 if ch in 'Aa' else None
+            pos += 1
+            continue
+        if arc_index is not None and arc_index % 7 in (3, 4) and ch in '01':
+            tokens.append(float(ch))
+            arc_index += 1
+            pos += 1
+            continue
+        match = _NUMBER_RE.match(d, pos)
+        if not match:
+            raise _Unsupported('path data')
+        tokens.append(float(match.group(0)))
+        if arc_index is not None:
+            arc_index += 1
+        pos = match.end()
+    return tokens
+
+
+def _flatten_path(d: str, segments: int) -> Tuple[List[List[Tuple[float, float]]], List[bool]]:
+    """将路径数据展开为折线子路径"""
+    arg_counts = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'C': 6, 'S': 4, 'Q': 4, 'T': 2, 'A': 7, 'Z': 0}
+    tokens = _tokenize_path(d)
+
+    subpaths: List[List[Tuple[float, float]]] = []
+    closed: List[bool] = []
+    current: List[Tuple[float, float]] = []
+    x = y = start_x = start_y = 0.0
+    last_control = None
+    last_command = ''
+    index = 0
+    command = None
+
+    def finish(is_closed):
+        nonlocal current
+        if len(current) > 1:
+            subpaths.append(current)
+            closed.append(is_closed)
+        current = []
+
+    while index < len(tokens):
+        token = tokens[index]
+        if isinstance(token, str):
+            command = token
+            index += 1
+            if command in 'Zz':
+                finish(True)
+                x, y = start_x, start_y
+                last_command = 'Z'
+                last_control = None
+                continue
+        elif command is None:
+            raise _Unsupported('path data')
+
+        upper = command.upper()
+        count = arg_counts[upper]
+        args = tokens[index:index + count]
+        if len(args) < count or any(isinstance(a, str) for a in args):
+            raise _Unsupported('path data')
+        index += count
+        relative = command.islower()
+
+        if upper == 'M':
+            finish(False)
+            nx, ny = args
+            if relative:
+                nx, ny = x + nx, y + ny
+            x, y = start_x, start_y = nx, ny
+            current = [(x, y)]
+            # M 之后的坐标对按 L 处理
+            command = 'l' if relative else 'L'
+            last_control = None
+        elif upper in ('L', 'H', 'V'):
+            if upper == 'L':
+                nx, ny = args
+                if relative:
+                    nx, ny = x + nx, y + ny
+            elif upper == 'H':
+                nx, ny = (x + args[0] if relative else args[0]), y
+            else:
+                nx, ny = x, (y + args[0] if relative else args[0])
+            if not current:
+                current = [(x, y)]
+            x, y = nx, ny
+            current.append((x, y))
+            last_control = None
+        elif upper in ('C', 'S', 'Q', 'T'):
+            if upper == 'C':
+                c1x, c1y, c2x, c2y, nx, ny = args
+                if relative:
+                    c1x, c1y, c2x, c2y, nx, ny = x + c1x, y + c1y, x + c2x, y + c2y, x + nx, y + ny
+            elif upper == 'S':
+                c2x, c2y, nx, ny = args
+                if relative:
+                    c2x, c2y, nx, ny = x + c2x, y + c2y, x + nx, y + ny
+                if last_control is not None and last_command in 'CS':
+                    c1x, c1y = 2 * x - last_control[0], 2 * y - last_control[1]
+                else:
+                    c1x, c1y = x, y
+            elif upper == 'Q':
+                qx, qy, nx, ny = args
+                if relative:
+                    qx, qy, nx, ny = x + qx, y + qy, x + nx, y + ny
+            else:
+                nx, ny = args
+                if relative:
+                    nx, ny = x + nx, y + ny
+                if last_control is not None and last_command in 'QT':
+                    qx, qy = 2 * x - last_control[0], 2 * y - last_control[1]
+                else:
+                    qx, qy = x, y
+
+            if not current:
+                current = [(x, y)]
+            if upper in ('Q', 'T'):
+                for i in range(1, segments + 1):
+                    t = i / segments
+                    mt = 1 - t
+                    current.append((mt * mt * x + 2 * mt * t * qx + t * t * nx,
+                                    mt * mt * y + 2 * mt * t * qy + t * t * ny))
+                last_control = (qx, qy)
+            else:
+                for i in range(1, segments + 1):
+                    t = i / segments
+                    mt = 1 - t
+                    current.append((mt ** 3 * x + 3 * mt * mt * t * c1x + 3 * mt * t * t * c2x + t ** 3 * nx,
+                                    mt ** 3 * y + 3 * mt * mt * t * c1y + 3 * mt * t * t * c2y + t ** 3 * ny))
+                last_control = (c2x, c2y)
+            x, y = nx, ny
+        elif upper == 'A':
+            rx, ry, phi, large_arc, sweep, nx, ny = args
+            if relative:
+                nx, ny = x + nx, y + ny
+            if not current:
+                current = [(x, y)]
+            current.extend(_arc_points(x, y, rx, ry, phi, int(large_arc) != 0, int(sweep) != 0,
+                                       nx, ny, segments // 2))
+            x, y = nx, ny
+            last_control = None
+
+        last_command = upper
+
+    finish(False)
+    return subpaths, closed
+
+
+# ----------------------------------------------------------------------
+# 后端选择
+# ----------------------------------------------------------------------
+
+class SVGRasterizer:
+    """
+    进程内 SVG 光栅化入口：对 SVG 做特性分类，交给第一个支持这些特性的后端；
+    都不支持时返回 None，由调用方交给浏览器。统计每个后端处理的 SVG 数量。
+    """
+
+    BACKENDS = {
+        'cairosvg': CairoSVGBackend,
+        'builtin': BuiltinBackend,
+    }
+
+    def __init__(self, backends: Optional[List[str]] = None):
+        """
+        Args:
+            backends: 启用的后端（按优先级），默认读取 HTML2WORD_SVG_RASTERIZER：
+                'auto'（cairosvg,builtin）、'browser'（不使用进程内渲染）或逗号分隔的后端列表
+        """
+        if backends is None:
+            setting = os.environ.get('HTML2WORD_SVG_RASTERIZER', 'auto').strip().lower()
+            if setting == 'auto':
+                backends = ['cairosvg', 'builtin']
+            elif setting == 'browser':
+                backends = []
+            else:
+                backends = [name.strip() for name in setting.split(',') if name.strip()]
+
+        self.backends: List[RasterizerBackend] = []
+        for name in backends:
+            backend_class = self.BACKENDS.get(name)
+            if backend_class is None:
+                logger.warning(f"Unknown SVG rasterizer backend: {name}")
+                continue
+            backend = backend_class()
+            if backend.is_available():
+                self.backends.append(backend)
+            else:
+                logger.debug(f"SVG rasterizer backend not available: {name}")
+
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        """重置各后端计数（每次构建文档开始时调用）"""
+        with self._lock:
+            self.stats = {backend.name: 0 for backend in self.backends}
+            self.stats['browser'] = 0
+            self.stats['failed'] = 0
+
+    def record(self, backend_name: str):
+        """记录由某个后端（包括浏览器）完成的 SVG"""
+        with self._lock:
+            self.stats[backend_name] = self.stats.get(backend_name, 0) + 1
+
+    def rasterize(self, svg_content: str, width: int, height: int, scale: float) -> Optional[bytes]:
+        """
+        进程内渲染 SVG
+
+        Args:
+            svg_content: SVG XML字符串
+            width: 目标宽度（CSS 像素）
+            height: 目标高度（CSS 像素）
+            scale: 缩放因子（与浏览器截图一致）
+
+        Returns:
+            PNG 数据；没有后端支持该 SVG 时返回 None
+        """
+        if not self.backends or width <= 0 or height <= 0:
+            return None
+
+        features = classify_svg(svg_content)
+        if features is None:
+            return None
+
+        for backend in self.backends:
+            if not backend.supports(features):
+                continue
+            try:
+                png_data = backend.render(svg_content, width, height, scale)
+            except _Unsupported as e:
+                logger.debug(f"{backend.name} rasterizer skipped SVG: {e}")
+                continue
+            except Exception as e:
+                logger.debug(f"{backend.name} rasterizer failed: {e}")
+                with self._lock:
+                    self.stats['failed'] += 1
+                continue
+            if png_data:
+                self.record(backend.name)
+                return png_data
+        return None
+
+
+# 全局单例
+_svg_rasterizer: Optional[SVGRasterizer] = None
+
+
+def get_svg_rasterizer() -> SVGRasterizer:
+    """获取进程内 SVG 光栅化器单例"""
+    global _svg_rasterizer
+    if _svg_rasterizer is None:
+        _svg_rasterizer = SVGRasterizer()
+    return _svg_rasterizer
@@ -10,8 +10,12 @@ import re
 from typing import Optional, List
 from docx import Document
 
+from html2word.layout.table_layout import TableLayout
 from html2word.parser.dom_tree import DOMNode, DOMTree
+from html2word.utils.image_cache import add_picture, get_image_cache
 from html2word.word_builder.paragraph_builder import ParagraphBuilder
+from html2word.word_builder.post_processor import BodyPostProcessor
+from html2word.word_builder.style_extractor import NamedStyleExtractor, named_styles_enabled
 from html2word.word_builder.table_builder import TableBuilder
 from html2word.word_builder.image_builder import ImageBuilder
 from html2word.word_builder.header_footer_builder import HeaderFooterBuilder
@@ -36,24 +40,81 @@ class DocumentBuilder:
         self.table_builder = TableBuilder(self.document)
         self.image_builder = ImageBuilder(self.document, base_path)
         self.header_footer_builder = HeaderFooterBuilder(self.document, base_path)
+        self.post_processor = BodyPostProcessor()  # Whole-document XML fix-ups
         self.enable_header_footer = enable_header_footer
         self.in_table_cell = False  # Track if we're processing content inside a table cell
         self.processed_nodes = set()  # Track nodes that have been processed (for el-table merging)
+        self.dom_tree = None  # Current DOM tree (indexes used for lookups)
         # 性能优化：缓存递归检查结果
         self._svg_cache = {}  # node id -> bool (是否包含SVG)
         self._bg_image_cache = {}  # node id -> bool (是否有背景图片)
         self._el_table_pairs = {}  # header node id -> body node (el-table配对缓存)
+        self._stream_writer = None  # StreamingDocxWriter while building with stream_to
+        self._style_extractor = None  # NamedStyleExtractor for the streamed blocks
+        self.named_style_report = None  # Size report of the named-style extraction pass
+        self.run_report = None  # Text runs requested vs runs created after coalescing
+        self.image_report = None  # Processed-image cache hits and image part reuse
+        self.image_prefetch_report = None  # Pre-build image prefetch stage
 
-    def build(self, tree: DOMTree) -> Document:
+    def build(self, tree: DOMTree, stream_to: Optional[str] = None) -> Document:
         """
         Build Word document from DOM tree.
 
         Args:
             tree: DOM tree
+            stream_to: Output .docx path for the streaming backend. Finished blocks are
+                written to the file during the build and dropped from memory, and the
+                package is complete when build returns (no document.save needed).
 
         Returns:
-            python-docx Document object
-        """
+            python-docx Document object (with an emptied body when streamed)
+        """
+        self.named_style_report = None
+        self.image_prefetch_report = None
+        self.post_processor.reset_stats()
+        for mapper in (self.paragraph_builder.style_mapper, self.table_builder.style_mapper):
+            mapper.reset_run_stats()
+        if stream_to is None:
+            return self._build(tree)
+
+        from html2word.word_builder.streaming_writer import StreamingDocxWriter
+        if named_styles_enabled():
+            # Blocks leave memory as they are written, so styles are extracted on the fly
+            self._style_extractor = NamedStyleExtractor(self.document)
+        self._stream_writer = StreamingDocxWriter(
+            self.document, stream_to, before_write=self._finalize_streamed_block
+        )
+        try:
+            document = self._build(tree)
+            self._stream_writer.close()
+        except BaseException:
+            self._stream_writer.abort()
+            raise
+        finally:
+            self._stream_writer = None
+        if self._style_extractor is not None:
+            self._log_named_styles(self._style_extractor.report())
+            self._style_extractor = None
+        return document
+
+    def _finalize_streamed_block(self, element):
+        """Apply the whole-document post-processing of _build to a block about to be streamed."""
+        self.post_processor.process_block(element)
+        if self._style_extractor is not None:
+            self._style_extractor.extract_incremental(element)
+
+    def _log_named_styles(self, report):
+        """Keep and log the size report of the named-style extraction pass."""
+        self.named_style_report = report
+        if report['bytes_before']:
+            logger.info(
+                f"Named styles: {report['character_styles']} character / {report['paragraph_styles']} paragraph "
+                f"styles for {report['runs_styled']} runs / {report['paragraphs_styled']} paragraphs, "
+                f"formatting XML {report['bytes_before'] / 1024:.1f} KB -> {report['bytes_after'] / 1024:.1f} KB"
+            )
+
+    def _build(self, tree: DOMTree) -> Document:
+        """Build the document body, headers and footers (see build)."""
         logger.info("Building Word document")
 
         # Apply cover image FIRST (before any other content)
@@ -65,16 +126,41 @@ class DocumentBuilder:
                 logger.error(f"Failed to add cover image: {e}", exc_info=True)
                 # Continue even if cover image fails
 
-        # Get body content
-        from html2word.parser.html_parser import HTMLParser
-        parser = HTMLParser()
-        body = parser.get_body_content(tree)
+        # Get body content (tag index lookup)
+        self.dom_tree = tree
+        self.image_builder.dom_tree = tree
+        body_nodes = tree.find_by_tag('body')
+        body = body_nodes[0] if body_nodes else None
 
         root_node = body if body else tree.root
 
-        # 性能优化：启用SVG并行预处理
+        # 性能优化：启用SVG并行预处理（渲染调度器异步执行，与构建重叠）
         # 现在的实现已修复序列化不一致问题，可以正确命中缓存
-        self._preprocess_svg_nodes(root_node)
+        from html2word.utils.render_scheduler import get_render_scheduler
+        render_scheduler = get_render_scheduler()
+        render_scheduler.begin_build()
+        from html2word.utils.svg_rasterizer import get_svg_rasterizer
+        svg_rasterizer = get_svg_rasterizer()
+        svg_rasterizer.reset_stats()
+        from html2word.utils.raster_sizing import get_raster_metrics
+        raster_metrics = get_raster_metrics()
+        raster_metrics.reset()
+        image_cache = get_image_cache()
+        image_cache.reset_stats()
+        image_cache.begin_build()
+        from html2word.utils.deadline import get_deadline
+        deadline = get_deadline()
+        if deadline.is_low():
+            # 转换预算已不足：不再预渲染和预取图片，构建时使用缓存结果或低代价回退
+            deadline.record('prerender_skipped')
+        else:
+            self._preprocess_svg_nodes(root_node)
+
+            # 性能优化：图片并行预取（与 SVG 渲染重叠），构建时只查询图片缓存
+            self._prefetch_images(root_node)
+
+            # 性能优化：背景图+文字块预先序列化并并行渲染，构建时直接取结果
+            self._preprocess_background_composites(root_node)
 
         # 性能优化：预索引el-table配对
         self._preindex_el_tables(root_node)
@@ -86,6 +172,35 @@ class DocumentBuilder:
             # No body found, process root
             self._process_children(tree.root)
 
+        render_stats = render_scheduler.stats
+        if render_stats['submitted'] or render_stats['inline']:
+            logger.info(
+                f"Render scheduler: {render_stats['submitted']} queued, {render_stats['inline']} inline, "
+                f"{render_stats['deduplicated']} deduplicated, {render_stats['timed_out']} timed out "
+                f"({render_scheduler.max_workers} workers)"
+            )
+
+        backend_counts = {name: count for name, count in svg_rasterizer.stats.items() if count}
+        if backend_counts:
+            logger.info(f"SVG backends: {backend_counts}")
+
+        raster_stats = raster_metrics.stats
+        if raster_stats['images']:
+            logger.info(
+                f"Rasterized {raster_stats['images']} images: {raster_stats['pixels'] / 1e6:.1f} Mpx, "
+                f"{raster_stats['bytes'] / 1024:.0f} KB in {raster_stats['seconds']:.2f}s"
+            )
+
+        self.image_report = image_cache.report()
+        if self.image_prefetch_report:
+            self.image_report['prefetch'] = self.image_prefetch_report
+        if self.image_report['hits'] or self.image_report['parts_reused']:
+            logger.info(
+                f"Image cache: {self.image_report['hits']} hits / {self.image_report['misses']} misses "
+                f"({self.image_report['hit_rate']:.0%}), {self.image_report['bytes_saved'] / 1024:.0f} KB not re-encoded, "
+                f"{self.image_report['parts_reused']} image parts reused"
+            )
+
         # Apply headers and footers if enabled
         if self.enable_header_footer:
             try:
@@ -95,19 +210,29 @@ class DocumentBuilder:
                 logger.error(f"Failed to apply headers/footers: {e}", exc_info=True)
                 # Continue even if headers/footers fail
 
-        # FIXED: Keep table cell content left-aligned by default for better readability
-        # This is a global safety net for all tables in the document
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-        for table in self.document.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for para in cell.paragraphs:
-                        if para.text.strip():  # Only process non-empty paragraphs
-                            current_align = para.paragraph_format.alignment
-                            # FIXED: Keep left alignment (0) for table cells, don't convert to justify
-                            # Left alignment is more appropriate for tabular data
-                            if current_align is None:
-                                para.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.LEFT
+        # Global safety net for all tables in the document, e.g. default cell alignment
+        # (tables already streamed out were handled by _finalize_streamed_block)
+        self.post_processor.process_body(self.document.element.body)
+        fixups = {name: count for name, count in self.post_processor.stats.items() if count}
+        if fixups:
+            logger.debug(f"Post-processing fix-ups: {fixups}")
+
+        text_runs = runs = 0
+        for mapper in (self.paragraph_builder.style_mapper, self.table_builder.style_mapper):
+            text_runs += mapper.run_stats['text_runs']
+            runs += mapper.run_stats['runs']
+        self.run_report = {'text_runs': text_runs, 'runs': runs}
+        if text_runs:
+            logger.info(f"Text runs: {text_runs} coalesced into {runs} ({text_runs - runs} merged)")
+
+        # Deduplicate repeated direct formatting into named styles (streamed blocks are
+        # handled block by block in _finalize_streamed_block)
+        if self._stream_writer is None and named_styles_enabled():
+            try:
+                extractor = NamedStyleExtractor(self.document)
+                self._log_named_styles(extractor.extract(self.document.element.body))
+            except Exception as e:
+                logger.error(f"Failed to extract named styles: {e}", exc_info=True)
 
         logger.info("Document built successfully")
         return self.document
@@ -121,6 +246,10 @@ class DocumentBuilder:
         """
         for child in node.children:
             self._process_node(child)
+            # Streaming backend: only flush at the document level (not while building cell content)
+            if (self._stream_writer is not None and not self.in_table_cell
+                    and self.document is self._stream_writer.document):
+                self._stream_writer.flush()
 
     def _process_node(self, node: DOMNode):
         """
@@ -191,9 +320,7 @@ class DocumentBuilder:
         elif tag == 'div':
             # CRITICAL: Skip Element UI table wrapper divs - process children directly
             # These are structural divs that should not be converted to tables
-            div_classes = node.attributes.get('class', '')
-            if isinstance(div_classes, list):
-                div_classes = ' '.join(div_classes)
+            div_classes = node.class_string
 
             # Skip Element UI hidden-columns div (contains column templates, not visible content)
             if 'hidden-columns' in div_classes:
@@ -434,11 +561,7 @@ class DocumentBuilder:
             True if node contains important content
         """
         # Check if node has classes that indicate it's a cover page or important container
-        class_attr = node.attributes.get('class', '')
-        if isinstance(class_attr, list):
-            node_classes = class_attr
-        else:
-            node_classes = class_attr.split() if class_attr else []
+        node_classes = node.class_list
         important_classes = [
             'cover-info--wrapper',  # Cover page wrapper
             'cover-info--title',    # Cover title
@@ -697,12 +820,8 @@ class DocumentBuilder:
         if not node.is_element:
             return False
 
-        # Get element classes
-        classes = node.attributes.get('class', '')
-        if isinstance(classes, list):
-            classes = ' '.join(classes)
-        elif not isinstance(classes, str):
-            classes = ''
+        # Get element classes (pre-joined by the parser)
+        classes = node.class_string
 
         # Skip Element UI hidden-columns (column definition templates)
         if 'hidden-columns' in classes:
@@ -808,6 +927,11 @@ class DocumentBuilder:
         svg_list = []
         for svg_node in svg_nodes:
             try:
+                # 引用缺失符号的图标由 IconFactory 在进程内绘制，不需要浏览器渲染
+                use_element = self.image_builder._find_use_element(svg_node)
+                if use_element and self.image_builder._is_missing_symbol(use_element, svg_node):
+                    continue
+
                 # 1. 获取宽高等属性 (逻辑与 ImageBuilder.build_svg 保持一致)
                 width_str = svg_node.get_attribute('width') or svg_node.computed_styles.get('width', '100')
                 height_str = svg_node.get_attribute('height') or svg_node.computed_styles.get('height', '100')
@@ -847,13 +971,150 @@ class DocumentBuilder:
                 logger.debug(f"Failed to prepare SVG for batch conversion: {e}")
 
         if svg_list:
-            # 批量并行转换
+            # 批量转换交给渲染调度器异步执行，文档构建同时进行
             # Windows上Chrome进程开销较大，并发数过高容易卡死，降低到 2 以保证稳定性
             from html2word.utils.browser_svg_converter import get_browser_converter
+            from html2word.utils.render_scheduler import get_render_scheduler
             converter = get_browser_converter()
-            # 这里生成的缓存 Key = MD5(svg_content + width_px + height_px)
-            # 后续 ImageBuilder 会使用完全相同的参数查询缓存，从而命中
-            converter.convert_batch(svg_list, max_workers=2)
+            # 这里登记的 Key 与 ImageBuilder 构建时使用完全相同的参数计算，
+            # 构建到该 SVG 时等待批量任务的结果即可
+            keys = [converter._get_svg_hash(svg, w, h) for svg, w, h in svg_list]
+            get_render_scheduler().submit_batch('svg', keys, converter.convert_batch, svg_list, 2)
+
+    def _prefetch_images(self, root: DOMNode):
+        """
+        并发预取文档中的全部图片（<img> 与 base64 背景图），写入处理后图片缓存。
+
+        <img> 按构建阶段的参数（srcset 选取结果、transform、filter）预处理，
+        背景图只预先解码源数据；构建阶段遇到同一图片时只做缓存查询。
+
+        Args:
+            root: Root node to scan
+        """
+        from html2word.utils.image_prefetch import get_image_prefetcher
+
+        tasks = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for child in node.children:
+                if not child.is_element or self._should_skip_hidden_element(child):
+                    continue
+                if child.tag == 'img':
+                    src = self.image_builder._get_best_image_src(child)
+                    if src:
+                        tasks.append((
+                            'image', src,
+                            child.computed_styles.get('transform'), child.computed_styles.get('filter')
+                        ))
+                    continue
+                if self._has_background_image(child):
+                    data_uri = self._background_data_uri(child)
+                    if data_uri:
+                        tasks.append(('source', data_uri))
+                stack.append(child)
+
+        if not tasks:
+            return
+
+        stats = get_image_prefetcher().prefetch(self.image_builder.image_processor, tasks)
+        self.image_prefetch_report = dict(stats)
+        logger.info(
+            f"Image prefetch: {stats['prefetched']}/{stats['tasks']} images, "
+            f"{stats['bytes'] / 1024:.0f} KB in {stats['seconds']:.2f}s "
+            f"({stats['failed']} failed, {stats['skipped']} over budget)"
+        )
+
+    def _background_data_uri(self, node: DOMNode) -> Optional[str]:
+        """
+        Get the base64 data URI of a node's background-image (cached on the node).
+
+        Args:
+            node: DOM node
+
+        Returns:
+            data:image/...;base64,... string or None
+        """
+        cached = getattr(node, '_background_data_uri', False)
+        if cached is not False:
+            return cached
+
+        bg_image = node.computed_styles.get('background-image', '')
+        if not bg_image and hasattr(node, 'inline_styles'):
+            bg_image = node.inline_styles.get('background-image', '')
+
+        data_uri = None
+        match = re.search(r'url\(["\']?data:image/([^;]+);base64,([^)"\'\s]+)', bg_image or '')
+        if match:
+            data_uri = f"data:image/{match.group(1)};base64,{match.group(2)}"
+        node._background_data_uri = data_uri
+        return data_uri
+
+    def _load_background_source(self, node: DOMNode):
+        """
+        Get the decoded background image of a node through the image cache.
+
+        Args:
+            node: DOM node with a base64 background-image
+
+        Returns:
+            (image_data, (width_px, height_px)) or None
+        """
+        data_uri = self._background_data_uri(node)
+        if data_uri is None:
+            return None
+        return self.image_builder.image_processor.load_source_image(data_uri)
+
+    def _preprocess_background_composites(self, root: DOMNode):
+        """
+        Pre-process "background image + positioned text" blocks and render them in parallel.
+        Performance optimization: each block is serialized via _build_html_for_screenshot up
+        front and queued on the render scheduler, so the builder only waits for finished PNGs.
+        """
+        import re
+        from html2word.utils.browser_html_converter import get_browser_html_converter
+        from html2word.utils.render_scheduler import get_render_scheduler
+
+        # 收集带 base64 背景图且有文字子元素的 div（与 _process_node 的判断一致，不进入其内部）
+        # <table> 内容由 TableBuilder 构建，不会走背景图截图路径
+        blocks = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for child in node.children:
+                if not child.is_element or child.tag == 'table' or self._should_skip_hidden_element(child):
+                    continue
+                if child.tag == 'div' and self._has_background_image(child):
+                    bg_image = child.computed_styles.get('background-image', '') or \
+                              child.inline_styles.get('background-image', '')
+                    if re.search(r'url\(["\']?data:image/[^;]+;base64,', bg_image) and self._has_text_children(child):
+                        blocks.append(child)
+                    continue
+                stack.append(child)
+
+        if not blocks:
+            return
+
+        logger.info(f"Found {len(blocks)} background+text blocks, queueing screenshots...")
+        converter = get_browser_html_converter()
+        scheduler = get_render_scheduler()
+
+        for node in blocks:
+            try:
+                # 渲染尺寸取自 CSS，通常与单元格上下文无关；不一致时构建阶段会直接渲染
+                layout = self._compute_background_image_layout(node, False)
+                if layout is None:
+                    continue
+                _, width_pt, height_pt = layout
+
+                html_content, render_width_px, render_height_px, _, _ = \
+                    self._prepare_background_screenshot(node, width_pt, height_pt)
+                scheduler.submit(
+                    'html', converter._get_html_hash(html_content, render_width_px, render_height_px, width_pt),
+                    converter.convert, html_content, render_width_px, render_height_px, width_pt
+                )
+            except Exception as e:
+                logger.debug(f"Failed to prepare background block for batch rendering: {e}")
 
     def _preindex_el_tables(self, root: DOMNode):
         """
@@ -868,14 +1129,7 @@ class DocumentBuilder:
         headers = []
 
         def has_class(node: DOMNode, class_name: str) -> bool:
-            if not node.is_element:
-                return False
-            classes = node.attributes.get('class', '')
-            if isinstance(classes, list):
-                return class_name in classes
-            elif isinstance(classes, str):
-                return class_name in classes.split()
-            return False
+            return node.is_element and class_name in node.class_set
 
         # 1. 收集所有 header
         def collect_headers(node: DOMNode):
@@ -1322,11 +1576,9 @@ html, body {{
                 return
 
             # 检查是否是 name-tag
-            node_class = n.attributes.get('class', '')
-            if isinstance(node_class, list):
-                node_class = ' '.join(node_class)
+            node_class = n.class_string
 
-            is_name_tag = 'name-tag' in str(node_class)
+            is_name_tag = 'name-tag' in node_class
 
             if is_name_tag:
                 # 在 name-tag 内查找 span 元素
@@ -1467,11 +1719,7 @@ html, body {{
                 return
 
             # 获取当前元素的 class
-            node_class = n.attributes.get('class', '')
-            if isinstance(node_class, list):
-                node_class_str = ' '.join(node_class)
-            else:
-                node_class_str = str(node_class) if node_class else ''
+            node_class_str = n.class_string
 
             # 检查当前元素是否是徽章（传递父元素的 class）
             if self._is_badge_element(n, parent_class=parent_class, debug=False):
@@ -1573,6 +1821,98 @@ html, body {{
             return f".{class_name} {{\n" + "\n".join(style_parts) + "\n}"
         return ''
 
+    def _prepare_background_screenshot(self, node: DOMNode, width_pt: float, height_pt: float):
+        """
+        计算背景图+文字块的渲染尺寸并生成截图用 HTML。
+
+        结果缓存在节点上（按目标尺寸），预处理阶段与构建阶段共用同一份 HTML，
+        从而使用相同的渲染缓存键。
+
+        Args:
+            node: DOM node with background-image
+            width_pt: Target width in points
+            height_pt: Target height in points
+
+        Returns:
+            (html_content, render_width_px, render_height_px, target_width_px, target_height_px)
+        """
+        cached = getattr(node, '_preprocessed_background', None)
+        if cached is not None and cached[0] == (width_pt, height_pt):
+            return cached[1]
+
+        # 目标尺寸（像素）
+        target_width_px = int(width_pt * 96 / 72)
+        target_height_px = int(height_pt * 96 / 72)
+
+        # 获取原始容器尺寸（用于渲染）
+        # 文字的 left/top 坐标是基于这个尺寸的
+        original_width_str = node.computed_styles.get('width') or \
+                            (node.inline_styles.get('width') if hasattr(node, 'inline_styles') else None)
+        original_height_str = node.computed_styles.get('height') or \
+                             (node.inline_styles.get('height') if hasattr(node, 'inline_styles') else None)
+
+        # 获取背景图信息（用于计算尺寸）
+        bg_width, bg_height = 0, 0
+        source = self._load_background_source(node)
+        if source is not None:
+            bg_width, bg_height = source[1]
+            logger.debug(f"Background image size: {bg_width}x{bg_height}")
+
+        # 确定渲染尺寸
+        # 关键问题：CSS 中 width: 100% 和 height: 573px 不是实际渲染尺寸
+        # 实际渲染尺寸取决于：
+        # 1. 容器在文档中的实际宽度（约 969px，由父元素决定）
+        # 2. background-size: contain 会按比例缩放背景图
+
+        # 解析 CSS 宽度
+        if original_width_str and 'px' in str(original_width_str):
+            render_width_px = int(float(str(original_width_str).replace('px', '')))
+        else:
+            # 宽度是 100% 或 auto，使用典型文档内容宽度
+            # 这个值基于实际浏览器渲染测试确定（约 969px）
+            render_width_px = 969
+            logger.debug(f"Using default document width: {render_width_px}px (CSS width was '{original_width_str}')")
+
+        # 解析 CSS 高度
+        css_height_px = None
+        if original_height_str and 'px' in str(original_height_str):
+            css_height_px = int(float(str(original_height_str).replace('px', '')))
+
+        # 计算实际渲染高度
+        # 当使用 background-size: contain 时，需要考虑：
+        # - 如果背景图比容器宽，会按宽度缩放，高度按比例
+        # - 实际容器高度可能小于 CSS 指定的高度
+        bg_size = node.computed_styles.get('background-size', '') or \
+                 (node.inline_styles.get('background-size', '') if hasattr(node, 'inline_styles') else '')
+
+        if bg_width > 0 and bg_height > 0 and 'contain' in str(bg_size):
+            # 计算 background-size: contain 时的实际背景尺寸
+            bg_aspect = bg_width / bg_height
+            # 如果背景图更宽，按容器宽度缩放
+            scaled_bg_height = int(render_width_px / bg_aspect)
+
+            if css_height_px:
+                # 使用 CSS 高度和计算高度中的较小值
+                # 因为 contain 会确保背景图完全显示
+                render_height_px = min(css_height_px, scaled_bg_height)
+            else:
+                render_height_px = scaled_bg_height
+
+            logger.debug(f"Calculated height for contain: scaled_bg={scaled_bg_height}, css={css_height_px}, final={render_height_px}")
+        elif css_height_px:
+            render_height_px = css_height_px
+        else:
+            render_height_px = target_height_px
+
+        logger.debug(f"Render size: {render_width_px}x{render_height_px}px, Target size: {target_width_px}x{target_height_px}px")
+
+        # 构建 HTML（使用原始渲染尺寸）
+        html_content = self._build_html_for_screenshot(node, render_width_px, render_height_px)
+
+        result = (html_content, render_width_px, render_height_px, target_width_px, target_height_px)
+        node._preprocessed_background = ((width_pt, height_pt), result)
+        return result
+
     def _render_background_with_chrome(self, node: DOMNode, width_pt: float, height_pt: float) -> bytes:
         """
         使用 Chrome headless 渲染背景图+文字叠加层。
@@ -1596,87 +1936,17 @@ html, body {{
             import io
             from PIL import Image
             from html2word.utils.browser_html_converter import get_browser_html_converter
-            from html2word.utils.units import UnitConverter
-
-            # 目标尺寸（像素）
-            target_width_px = int(width_pt * 96 / 72)
-            target_height_px = int(height_pt * 96 / 72)
-
-            # 获取原始容器尺寸（用于渲染）
-            # 文字的 left/top 坐标是基于这个尺寸的
-            original_width_str = node.computed_styles.get('width') or \
-                                (node.inline_styles.get('width') if hasattr(node, 'inline_styles') else None)
-            original_height_str = node.computed_styles.get('height') or \
-                                 (node.inline_styles.get('height') if hasattr(node, 'inline_styles') else None)
-
-            # 获取背景图信息（用于计算尺寸）
-            import re
-            import base64
-            bg_image_css = node.computed_styles.get('background-image', '') or \
-                          (node.inline_styles.get('background-image', '') if hasattr(node, 'inline_styles') else '')
-            bg_width, bg_height = 0, 0
-            match = re.search(r'url\(["\']?data:image/([^;]+);base64,([^)"\'\s]+)', bg_image_css)
-            if match:
-                base64_data = match.group(2)
-                image_data_raw = base64.b64decode(base64_data)
-                bg_img = Image.open(io.BytesIO(image_data_raw))
-                bg_width, bg_height = bg_img.size
-                logger.debug(f"Background image size: {bg_width}x{bg_height}")
-
-            # 确定渲染尺寸
-            # 关键问题：CSS 中 width: 100% 和 height: 573px 不是实际渲染尺寸
-            # 实际渲染尺寸取决于：
-            # 1. 容器在文档中的实际宽度（约 969px，由父元素决定）
-            # 2. background-size: contain 会按比例缩放背景图
-
-            # 解析 CSS 宽度
-            if original_width_str and 'px' in str(original_width_str):
-                render_width_px = int(float(str(original_width_str).replace('px', '')))
-            else:
-                # 宽度是 100% 或 auto，使用典型文档内容宽度
-                # 这个值基于实际浏览器渲染测试确定（约 969px）
-                render_width_px = 969
-                logger.debug(f"Using default document width: {render_width_px}px (CSS width was '{original_width_str}')")
-
-            # 解析 CSS 高度
-            css_height_px = None
-            if original_height_str and 'px' in str(original_height_str):
-                css_height_px = int(float(str(original_height_str).replace('px', '')))
-
-            # 计算实际渲染高度
-            # 当使用 background-size: contain 时，需要考虑：
-            # - 如果背景图比容器宽，会按宽度缩放，高度按比例
-            # - 实际容器高度可能小于 CSS 指定的高度
-            bg_size = node.computed_styles.get('background-size', '') or \
-                     (node.inline_styles.get('background-size', '') if hasattr(node, 'inline_styles') else '')
-
-            if bg_width > 0 and bg_height > 0 and 'contain' in str(bg_size):
-                # 计算 background-size: contain 时的实际背景尺寸
-                bg_aspect = bg_width / bg_height
-                # 如果背景图更宽，按容器宽度缩放
-                scaled_bg_height = int(render_width_px / bg_aspect)
-
-                if css_height_px:
-                    # 使用 CSS 高度和计算高度中的较小值
-                    # 因为 contain 会确保背景图完全显示
-                    render_height_px = min(css_height_px, scaled_bg_height)
-                else:
-                    render_height_px = scaled_bg_height
-
-                logger.debug(f"Calculated height for contain: scaled_bg={scaled_bg_height}, css={css_height_px}, final={render_height_px}")
-            elif css_height_px:
-                render_height_px = css_height_px
-            else:
-                render_height_px = target_height_px
-
-            logger.debug(f"Render size: {render_width_px}x{render_height_px}px, Target size: {target_width_px}x{target_height_px}px")
 
-            # 构建 HTML（使用原始渲染尺寸）
-            html_content = self._build_html_for_screenshot(node, render_width_px, render_height_px)
+            html_content, render_width_px, render_height_px, target_width_px, target_height_px = \
+                self._prepare_background_screenshot(node, width_pt, height_pt)
 
-            # 使用 Chrome 渲染
+            # 使用 Chrome 渲染（经渲染调度器，相同内容只渲染一次）
+            from html2word.utils.render_scheduler import get_render_scheduler
             converter = get_browser_html_converter()
-            png_data = converter.convert(html_content, render_width_px, render_height_px)
+            png_data = get_render_scheduler().run(
+                'html', converter._get_html_hash(html_content, render_width_px, render_height_px, width_pt),
+                converter.convert, html_content, render_width_px, render_height_px, width_pt
+            )
 
             if not png_data:
                 logger.debug("Chrome rendering returned None")
@@ -1721,22 +1991,16 @@ html, body {{
             PNG image data as bytes, or None if failed
         """
         try:
-            import base64
-            import re
             import io
             from PIL import Image, ImageDraw, ImageFont
 
             # Extract background image
-            bg_image_css = node.computed_styles.get('background-image', '') or \
-                          (node.inline_styles.get('background-image', '') if hasattr(node, 'inline_styles') else '')
-
-            match = re.search(r'url\(["\']?data:image/([^;]+);base64,([^)"\'\s]+)', bg_image_css)
-            if not match:
+            source = self._load_background_source(node)
+            if source is None:
                 logger.warning("Cannot extract base64 image from background-image")
                 return None
 
-            base64_data = match.group(2)
-            image_data = base64.b64decode(base64_data)
+            image_data = source[0]
 
             # Load background image
             bg_img = Image.open(io.BytesIO(image_data))
@@ -1912,6 +2176,99 @@ html, body {{
             logger.error(f"Failed to composite image: {e}", exc_info=True)
             return None
 
+    @staticmethod
+    def _has_text_children(node: DOMNode) -> bool:
+        """Check whether a background-image element has child elements with text to composite."""
+        return any(
+            child.is_element and hasattr(child, 'get_text_content') and child.get_text_content().strip()
+            for child in node.children
+        )
+
+    def _compute_background_image_layout(self, node: DOMNode, in_cell: bool):
+        """
+        Decode the background image and compute its display size in points.
+
+        Args:
+            node: DOM node with background-image
+            in_cell: Whether the element is rendered inside a table cell
+
+        Returns:
+            (image_data, width_pt, height_pt) or None if no base64 background image
+        """
+        from html2word.utils.units import UnitConverter
+
+        # Get background-image from computed_styles or inline_styles
+        bg_image = node.computed_styles.get('background-image', '')
+        if not bg_image and hasattr(node, 'inline_styles'):
+            bg_image = node.inline_styles.get('background-image', '')
+
+        if not bg_image or 'url(' not in bg_image:
+            logger.warning("No valid background-image found")
+            return None
+
+        # Extract data URI from url(data:image/png;base64,...)
+        if self._background_data_uri(node) is None:
+            logger.warning("Background-image is not a base64 data URI")
+            return None
+
+        # Decoded once (usually by the prefetch stage) and shared through the image cache
+        source = self._load_background_source(node)
+        if source is None:
+            return None
+        image_data, (actual_width_px, actual_height_px) = source
+        logger.debug(f"Decoded image size: {len(image_data)} bytes")
+
+        # Get element dimensions, fallback to inline_styles if needed
+        width_str = node.computed_styles.get('width') or \
+                   (node.inline_styles.get('width') if hasattr(node, 'inline_styles') else None) or \
+                   '800px'
+        height_str = node.computed_styles.get('height') or \
+                    (node.inline_styles.get('height') if hasattr(node, 'inline_styles') else None) or \
+                    '400px'
+
+        width_pt = UnitConverter.to_pt(width_str)
+        height_pt = UnitConverter.to_pt(height_str)
+
+        # Actual image dimensions for aspect ratio calculation
+        aspect_ratio = actual_width_px / actual_height_px
+
+        # If width is 0 or auto, use document default width (969px)
+        # This matches the render width used in _render_background_with_chrome
+        # to avoid resize distortion
+        if width_pt == 0 or width_str.lower() in ('auto', 'none', '100%'):
+            # Use typical document content width: 969px = 726.75pt
+            width_pt = 969 * 72 / 96  # Convert px to pt
+            logger.debug(f"Using default document width: {width_pt:.1f}pt (CSS width was '{width_str}')")
+
+            # If height is also missing, calculate from background-size: contain behavior
+            if height_pt == 0 or height_str.lower() in ('auto', 'none'):
+                # With contain, height is based on width and aspect ratio
+                height_pt = width_pt / aspect_ratio
+                logger.debug(f"Calculated height from contain: {height_pt:.1f}pt")
+        elif height_pt == 0 or height_str.lower() in ('auto', 'none'):
+            # Width is set, calculate height from aspect ratio
+            height_pt = width_pt / aspect_ratio
+
+        logger.debug(f"Final dimensions for background-image: {width_pt:.1f}x{height_pt:.1f}pt")
+
+        # Limit to page width or cell width
+        if in_cell:
+            # In table cells, use reduced width to account for cell padding
+            max_width_pt = 432  # 468 - 36 = 432pt (accounting for padding)
+            logger.debug("Background image in table cell, using reduced max width")
+        else:
+            # Standard page width (6.5 inches = 468pt for standard Word page with margins)
+            max_width_pt = 468
+
+        if width_pt > max_width_pt:
+            # Scale down to fit width while maintaining aspect ratio
+            scale_factor = max_width_pt / width_pt
+            width_pt = max_width_pt
+            height_pt = height_pt * scale_factor
+            logger.debug(f"Scaled down to fit {'cell' if in_cell else 'page'}: {width_pt:.1f}x{height_pt:.1f}pt")
+
+        return image_data, width_pt, height_pt
+
     def _convert_background_image_element(self, node: DOMNode) -> bool:
         """
         Convert an element with background-image to an embedded image.
@@ -1927,99 +2284,22 @@ html, body {{
             True if conversion succeeded, False otherwise
         """
         try:
-            import base64
-            import re
             import io
             from docx.shared import Inches
-            from html2word.utils.units import UnitConverter
-
-            # Get background-image from computed_styles or inline_styles
-            bg_image = node.computed_styles.get('background-image', '')
-            if not bg_image and hasattr(node, 'inline_styles'):
-                bg_image = node.inline_styles.get('background-image', '')
-
-            if not bg_image or 'url(' not in bg_image:
-                logger.warning("No valid background-image found")
-                return False
-
-            # Extract data URI from url(data:image/png;base64,...)
-            match = re.search(r'url\(["\']?data:image/([^;]+);base64,([^)"\'\s]+)', bg_image)
-            if not match:
-                logger.warning("Background-image is not a base64 data URI")
-                return False
-
-            image_format = match.group(1)  # e.g., 'png', 'jpeg'
-            base64_data = match.group(2)
-
-            logger.debug(f"Extracting {image_format} image from background-image ({len(base64_data)} base64 chars)")
-
-            # Decode base64 to binary
-            image_data = base64.b64decode(base64_data)
-            logger.debug(f"Decoded image size: {len(image_data)} bytes")
-
-            # Get element dimensions, fallback to inline_styles if needed
-            width_str = node.computed_styles.get('width') or \
-                       (node.inline_styles.get('width') if hasattr(node, 'inline_styles') else None) or \
-                       '800px'
-            height_str = node.computed_styles.get('height') or \
-                        (node.inline_styles.get('height') if hasattr(node, 'inline_styles') else None) or \
-                        '400px'
+            from html2word.utils.deadline import get_deadline
 
-            width_pt = UnitConverter.to_pt(width_str)
-            height_pt = UnitConverter.to_pt(height_str)
-
-            # Get actual image dimensions for aspect ratio calculation
-            from PIL import Image
-            image_stream_temp = io.BytesIO(image_data)
-            img = Image.open(image_stream_temp)
-            actual_width_px, actual_height_px = img.size
-            aspect_ratio = actual_width_px / actual_height_px
-
-            # If width is 0 or auto, use document default width (969px)
-            # This matches the render width used in _render_background_with_chrome
-            # to avoid resize distortion
-            if width_pt == 0 or width_str.lower() in ('auto', 'none', '100%'):
-                # Use typical document content width: 969px = 726.75pt
-                width_pt = 969 * 72 / 96  # Convert px to pt
-                logger.debug(f"Using default document width: {width_pt:.1f}pt (CSS width was '{width_str}')")
-
-                # If height is also missing, calculate from background-size: contain behavior
-                if height_pt == 0 or height_str.lower() in ('auto', 'none'):
-                    # With contain, height is based on width and aspect ratio
-                    height_pt = width_pt / aspect_ratio
-                    logger.debug(f"Calculated height from contain: {height_pt:.1f}pt")
-            elif height_pt == 0 or height_str.lower() in ('auto', 'none'):
-                # Width is set, calculate height from aspect ratio
-                height_pt = width_pt / aspect_ratio
-
-            logger.debug(f"Final dimensions for background-image: {width_pt:.1f}x{height_pt:.1f}pt")
+            deadline = get_deadline()
 
             # Check if we're in a table cell context
             in_cell = getattr(self, 'in_table_cell', False)
 
-            # Limit to page width or cell width
-            if in_cell:
-                # In table cells, use reduced width to account for cell padding
-                max_width_pt = 432  # 468 - 36 = 432pt (accounting for padding)
-                logger.debug("Background image in table cell, using reduced max width")
-            else:
-                # Standard page width (6.5 inches = 468pt for standard Word page with margins)
-                max_width_pt = 468
-
-            if width_pt > max_width_pt:
-                # Scale down to fit width while maintaining aspect ratio
-                scale_factor = max_width_pt / width_pt
-                width_pt = max_width_pt
-                height_pt = height_pt * scale_factor
-                logger.debug(f"Scaled down to fit {'cell' if in_cell else 'page'}: {width_pt:.1f}x{height_pt:.1f}pt")
+            layout = self._compute_background_image_layout(node, in_cell)
+            if layout is None:
+                return False
+            image_data, width_pt, height_pt = layout
 
             # Check if there are child text elements that need compositing
-            has_text_children = any(
-                child.is_element and hasattr(child, 'get_text_content') and child.get_text_content().strip()
-                for child in node.children
-            )
-
-            if has_text_children:
+            if self._has_text_children(node):
                 # Try Chrome rendering first (preferred - pixel-perfect CSS support)
                 logger.debug("Attempting Chrome rendering for background+text...")
                 composited_image_data = self._render_background_with_chrome(node, width_pt, height_pt)
@@ -2027,9 +2307,14 @@ html, body {{
                 if composited_image_data:
                     image_data = composited_image_data
                     logger.info("Using Chrome-rendered image")
+                elif deadline.expired():
+                    # Past the conversion deadline: skip compositing, keep the plain background
+                    deadline.record('background_image_only')
                 else:
                     # Fallback to PIL composite method
                     logger.debug("Chrome unavailable, falling back to PIL composite...")
+                    if deadline.is_low():
+                        deadline.record('background_pil_composite')
                     composited_image_data = self._composite_background_with_text(node, width_pt, height_pt)
 
                     if composited_image_data:
@@ -2044,7 +2329,8 @@ html, body {{
             image_stream = io.BytesIO(image_data)
             paragraph = self.document.add_paragraph()
             run = paragraph.add_run()
-            picture = run.add_picture(
+            picture = add_picture(
+                run,
                 image_stream,
                 width=Inches(width_pt / 72)
             )
@@ -2375,18 +2661,17 @@ html, body {{
             for child in node.children:
                 # Check if this child is a chart-panel-wrap section (should be its own table)
                 if child.tag == 'section':
-                    classes = child.attributes.get('class', [])
+                    classes = child.class_list
                     logger.debug(f"Checking child section with classes: {classes}")
-                    if 'chart-panel-wrap' in classes:
+                    if 'chart-panel-wrap' in child.class_set:
                         chart_panel_children.append(child)
                         logger.info(f"Found chart-panel-wrap section that needs separate table (classes: {classes})")
                         continue
 
                 # Check if this child is or contains a chart-panel-header
                 is_header = False
-                if child.attributes.get('class'):
-                    classes = child.attributes.get('class', [])
-                    if 'chart-panel-header' in classes:
+                if child.class_set:
+                    if 'chart-panel-header' in child.class_set:
                         is_header = True
                         logger.debug(f"Found chart-panel-header child: {child.tag}")
 
@@ -2653,8 +2938,7 @@ html, body {{
             box_model = BoxModel(node)
 
             # Special handling for chart-panel-wrap: ensure proper separation
-            classes = node.attributes.get('class', [])
-            is_chart_panel = 'chart-panel-wrap' in classes
+            is_chart_panel = 'chart-panel-wrap' in node.class_set
 
             # Apply margin-bottom as space_before on a spacer paragraph
             # This represents the table's margin-bottom and will be the spacing
@@ -2775,9 +3059,7 @@ html, body {{
             return False
 
         # Check for common tip/hint class names
-        classes = node.attributes.get('class', [])
-        if isinstance(classes, str):
-            classes = classes.split()
+        classes = node.class_set
 
         tip_classes = ['overall-tips', 'tips', 'hint', 'tip', 'info-tip', 'warning-tip']
         if any(tc in classes for tc in tip_classes):
@@ -2943,15 +3225,8 @@ html, body {{
             return False
 
         # Use attributes.get() for consistency with rest of codebase
-        classes = node.attributes.get('class', '')
-
-        # Handle both list and string class attributes
-        if isinstance(classes, list):
-            return 'el-table__header' in classes
-        elif isinstance(classes, str):
-            # Check if 'el-table__header' is a complete class name (not substring)
-            return 'el-table__header' in classes.split()
-        return False
+        # Complete class name match (not substring)
+        return 'el-table__header' in node.class_set
 
     def _find_el_table_body(self, header_node: DOMNode) -> Optional[DOMNode]:
         """
@@ -3004,13 +3279,8 @@ html, body {{
         def has_body_class(node):
             if node.tag != 'table':
                 return False
-            classes = node.attributes.get('class', '')
-            if isinstance(classes, list):
-                return 'el-table__body' in classes
-            elif isinstance(classes, str):
-                # Check if 'el-table__body' is a complete class name (not substring)
-                return 'el-table__body' in classes.split()
-            return False
+            # Complete class name match (not substring)
+            return 'el-table__body' in node.class_set
 
         # Search for el-table__body in subsequent siblings of parent
         logger.debug(f"Searching for el-table__body in {len(grandparent.children) - parent_idx - 1} siblings")
@@ -3048,32 +3318,23 @@ html, body {{
             header_node: The el-table__header node (contains <thead>)
             body_node: The el-table__body node (contains <tbody>)
         """
-        # Extract rows from both tables
-        header_rows = self.table_builder._extract_rows(header_node)
-        body_rows = self.table_builder._extract_rows(body_node)
+        # Layout of the rows from both tables (column widths come from the header table)
+        layout = TableLayout.for_table(header_node, body_node)
 
-        if not header_rows and not body_rows:
+        if not layout.rows:
             logger.warning("No rows found in merged el-table")
             return
 
-        # Merge rows
-        all_rows = header_rows + body_rows
-        num_rows = len(all_rows)
-        num_cols = self.table_builder._calculate_columns(all_rows)
-
-        if num_rows == 0 or num_cols == 0:
+        if layout.num_cols == 0:
             return
 
-        logger.debug(f"Building merged el-table: {num_rows} rows × {num_cols} columns")
-
-        # Create Word table
-        table = self.document.add_table(rows=num_rows, cols=num_cols)
+        logger.debug(f"Building merged el-table: {layout.num_rows} rows × {layout.num_cols} columns")
 
-        # Fill table with merged rows
-        self.table_builder._fill_table(table, all_rows)
+        # Create Word table filled with the merged rows
+        table = self.table_builder._add_table(self.document, layout)
 
         # Apply table-level styles (prefer header_node styles, as it usually has the main table styling)
-        self.table_builder._apply_table_style(table, header_node)
+        self.table_builder._apply_table_style(table, header_node, layout)
 
     def save(self, output_path: str):
         """
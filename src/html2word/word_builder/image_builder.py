@@ -11,6 +11,8 @@ from typing import Optional
 from docx.shared import Inches
 
 from html2word.parser.dom_tree import DOMNode
+from html2word.style.inheritance import StyleInheritance
+from html2word.utils.image_cache import add_picture
 from html2word.utils.image_utils import ImageProcessor
 
 logger = logging.getLogger(__name__)
@@ -29,6 +31,7 @@ class ImageBuilder:
         """
         self.document = document
         self.image_processor = ImageProcessor(base_path)
+        self.dom_tree = None  # Set by DocumentBuilder.build for indexed id lookups
 
     def build_image(self, img_node: DOMNode) -> Optional[object]:
         """
@@ -135,7 +138,8 @@ class ImageBuilder:
             run = paragraph.add_run()
 
             # Add picture
-            picture = run.add_picture(
+            picture = add_picture(
+                run,
                 image_stream,
                 width=Inches(display_width),
                 height=Inches(display_height)
@@ -296,8 +300,8 @@ class ImageBuilder:
         Convert inline SVG to image and insert.
 
         Tries multiple conversion methods in order:
-        1. cairosvg (best quality)
-        2. svglib + reportlab (good compatibility)
+        1. In-process rasterizer (cairosvg or built-in) for SVGs using a supported feature subset
+        2. Browser rendering (Chrome headless) for complex SVGs
         3. PIL placeholder (fallback)
 
         Args:
@@ -357,8 +361,13 @@ class ImageBuilder:
             if png_data:
                 return self._insert_svg_as_image(png_data, width_val, height_val, "Browser", in_table_cell)
 
-            # Fallback: Browser conversion failed
-            logger.warning("SVG conversion failed: Browser conversion not available or failed")
+            # Fallback: Browser conversion failed (or skipped to meet the conversion deadline)
+            from html2word.utils.deadline import get_deadline
+            deadline = get_deadline()
+            if deadline.is_low():
+                deadline.record('svg_placeholder')
+            else:
+                logger.warning("SVG conversion failed: Browser conversion not available or failed")
             return self._create_svg_fallback_placeholder(svg_node, width, height)
 
         except Exception as e:
@@ -389,6 +398,10 @@ class ImageBuilder:
 
         symbol_id = href[1:]
 
+        # Fast path: id index of the DOM tree
+        if self.dom_tree is not None:
+            return not any(node.tag == 'symbol' for node in self.dom_tree.find_by_id(symbol_id))
+
         # Check if symbol exists in the document by looking for it in the root node
         root = svg_node
         while root.parent:
@@ -419,9 +432,16 @@ class ImageBuilder:
             python-docx InlineShape object or None
         """
         try:
-            from PIL import Image, ImageDraw, ImageFont
             import io
             from docx.shared import Inches
+            from html2word.utils.deadline import get_deadline
+            from html2word.utils.icon_factory import get_icon_factory, icon_kind_from_href
+
+            # Decorative icons are the first thing dropped once the conversion deadline has passed
+            deadline = get_deadline()
+            if deadline.expired():
+                deadline.record('icon_skipped')
+                return None
 
             # Get font-size for em/rem unit calculations
             font_size_pt = 12.0  # Default
@@ -446,76 +466,20 @@ class ImageBuilder:
             width_val = max(width_val, 16)
             height_val = max(height_val, 16)
 
-            # Get href to determine icon type
+            # Get href to determine icon type; drawn in-process and memoized by
+            # (glyph, colour, size), so repeated icons share one image part
             href = use_element.get_attribute('xlink:href') or use_element.get_attribute('href')
-            icon_type = 'info'  # Default
-
-            if href:
-                if 'tishi' in href or 'info' in href:
-                    icon_type = 'info'
-                elif 'warning' in href or 'jinggao' in href:
-                    icon_type = 'warning'
-                elif 'error' in href or 'cuowu' in href:
-                    icon_type = 'error'
-                elif 'success' in href or 'zhengque' in href:
-                    icon_type = 'success'
-
-            # Create icon based on type
-            img = Image.new('RGBA', (width_val, height_val), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-
-            # Colors for different icon types
-            colors = {
-                'info': (86, 125, 245, 255),      # Blue from the original style
-                'warning': (255, 193, 7, 255),    # Amber
-                'error': (244, 67, 54, 255),      # Red
-                'success': (76, 175, 80, 255)     # Green
-            }
-
-            color = colors.get(icon_type, colors['info'])
-
-            # Draw appropriate icon shape
-            if icon_type == 'info':
-                # Draw a circle with 'i' in it - outlined style (white background, blue border, blue text)
-                margin = 1
-                border_width = max(2, width_val // 8)
-                # Draw white filled circle with blue outline
-                draw.ellipse([(margin, margin), (width_val - margin - 1, height_val - margin - 1)],
-                           fill=(255, 255, 255, 255), outline=color, width=border_width)
-
-                # Draw 'i' character in blue
-                try:
-                    # Try to use a font
-                    font_size = int(width_val * 0.6)
-                    font = ImageFont.truetype("arial.ttf", font_size)
-                    bbox = draw.textbbox((0, 0), "i", font=font)
-                    text_width = bbox[2] - bbox[0]
-                    text_height = bbox[3] - bbox[1]
-                    x = (width_val - text_width) // 2
-                    y = (height_val - text_height) // 2 - font_size // 8  # Slight adjustment
-                    draw.text((x, y), "i", fill=color, font=font)
-                except:
-                    # Fallback: draw a simple line for the dot and stem in blue
-                    dot_size = max(1, width_val // 12)
-                    stem_width = max(1, width_val // 16)
-                    # Dot
-                    draw.ellipse([(width_val//2 - dot_size, height_val//4 - dot_size),
-                                (width_val//2 + dot_size, height_val//4 + dot_size)],
-                               fill=color)
-                    # Stem
-                    draw.rectangle([(width_val//2 - stem_width, height_val//4 + dot_size*2),
-                                  (width_val//2 + stem_width, height_val*3//4)],
-                                 fill=color)
-
-            # Save to bytes
-            img_stream = io.BytesIO()
-            img.save(img_stream, format='PNG')
-            img_stream.seek(0)
+            icon_type = icon_kind_from_href(href)
+            png_data = get_icon_factory().get_icon(icon_type, width_val, height_val)
+            if not png_data:
+                return None
+            img_stream = io.BytesIO(png_data)
 
             # Insert image
             paragraph = self.document.add_paragraph()
             run = paragraph.add_run()
-            picture = run.add_picture(
+            picture = add_picture(
+                run,
                 img_stream,
                 width=Inches(width_val / 72),
                 height=Inches(height_val / 72)
@@ -542,6 +506,7 @@ class ImageBuilder:
         """
         try:
             from html2word.utils.browser_svg_converter import get_browser_converter
+            from html2word.utils.render_scheduler import get_render_scheduler
 
             converter = get_browser_converter()
 
@@ -549,7 +514,11 @@ class ImageBuilder:
             width_px = int(width_pt * 96 / 72)
             height_px = int(height_pt * 96 / 72)
 
-            png_data = converter.convert(svg_content, width_px, height_px)
+            # Waits for the pre-pass batch job when this SVG was collected, else renders inline
+            png_data = get_render_scheduler().run(
+                'svg', converter._get_svg_hash(svg_content, width_px, height_px),
+                converter.convert, svg_content, width_px, height_px
+            )
 
             if png_data:
                 logger.debug("SVG converted using Browser")
@@ -605,7 +574,8 @@ class ImageBuilder:
             # Insert image
             paragraph = self.document.add_paragraph()
             run = paragraph.add_run()
-            picture = run.add_picture(
+            picture = add_picture(
+                run,
                 image_stream,
                 width=Inches(width_pt / 72),
                 height=Inches(height_pt / 72)
@@ -622,6 +592,10 @@ class ImageBuilder:
         """
         Serialize SVG DOM node to SVG string.
 
+        Uses the raw markup captured by the parser when no stylesheet rule applies
+        inside the SVG, otherwise rebuilds the markup from the DOM. The result is
+        memoized on the node, so the pre-pass and the builders share one string.
+
         Args:
             svg_node: SVG DOM node
             width: SVG width
@@ -630,6 +604,10 @@ class ImageBuilder:
         Returns:
             SVG XML string
         """
+        memo = svg_node.layout_info.get('svg_serialized')
+        if memo is not None and memo[0] == (width, height):
+            return memo[1]
+
         # Build SVG opening tag with attributes
         attrs = []
         attrs.append(f'width="{width}"')
@@ -641,13 +619,54 @@ class ImageBuilder:
         if viewbox:
             attrs.append(f'viewBox="{viewbox}"')
 
-        svg_str = f"<svg {' '.join(attrs)}>"
+        content = self._raw_svg_content(svg_node)
+        if content is not None:
+            if 'xlink:' in content:
+                attrs.append('xmlns:xlink="http://www.w3.org/1999/xlink"')
+            # Rebuilt children carry their inherited styles inline; on the raw path
+            # the root passes them down instead
+            inherited = [
+                f"{key}:{value}" for key, value in sorted(svg_node.computed_styles.items())
+                if key in StyleInheritance.INHERITED_PROPERTIES
+            ]
+            if inherited:
+                attrs.append(f'style="{";".join(inherited)}"')
+        else:
+            # Serialize children
+            content = self._serialize_svg_children(svg_node)
+
+        svg_str = f"<svg {' '.join(attrs)}>{content}</svg>"
+        svg_node.layout_info['svg_serialized'] = ((width, height), svg_str)
+        return svg_str
 
-        # Serialize children
-        svg_str += self._serialize_svg_children(svg_node)
+    @staticmethod
+    def _raw_svg_content(svg_node: DOMNode) -> Optional[str]:
+        """
+        Raw markup of the SVG content as captured by the parser.
 
-        svg_str += "</svg>"
-        return svg_str
+        Args:
+            svg_node: SVG DOM node
+
+        Returns:
+            Content markup, or None if not captured or if stylesheet rules
+            apply inside the SVG (those are only reflected in the DOM)
+        """
+        source = svg_node.layout_info.get('svg_source')
+        if source is None:
+            return None
+
+        stack = list(svg_node.children)
+        while stack:
+            node = stack.pop()
+            if node.is_element:
+                if node.has_cascaded_styles:
+                    return None
+                stack.extend(node.children)
+
+        try:
+            return str(source, 'utf-8')
+        except UnicodeDecodeError:
+            return None
 
     def _serialize_svg_children(self, node: DOMNode) -> str:
         """Recursively serialize SVG child elements."""
@@ -783,7 +802,8 @@ class ImageBuilder:
             # Insert image
             paragraph = self.document.add_paragraph()
             run = paragraph.add_run()
-            picture = run.add_picture(
+            picture = add_picture(
+                run,
                 img_stream,
                 width=Inches(width_val / 72),
                 height=Inches(height_val / 72)
@@ -11,6 +11,7 @@ from docx.shared import Pt
 from html2word.parser.dom_tree import DOMNode
 from html2word.word_builder.style_mapper import StyleMapper
 from html2word.style.style_normalizer import StyleNormalizer
+from html2word.utils.image_cache import add_picture
 
 logger = logging.getLogger(__name__)
 
@@ -150,10 +151,8 @@ class ParagraphBuilder:
                 text_node.computed_styles['text-transform']
             )
 
-        run = paragraph.add_run(text)
-
-        # Apply run styles from computed styles
-        self.style_mapper.apply_run_style(run, text_node.computed_styles)
+        # Add run with computed styles (extends the previous run when formatting is identical)
+        self.style_mapper.add_styled_run(paragraph, text, text_node.computed_styles)
 
     def _process_inline_element(self, node: DOMNode, paragraph):
         """
@@ -186,9 +185,8 @@ class ParagraphBuilder:
                         node.computed_styles['text-transform']
                     )
 
-                run = paragraph.add_run(text)
                 # Apply styles from parent inline element
-                self.style_mapper.apply_run_style(run, node.computed_styles)
+                self.style_mapper.add_styled_run(paragraph, text, node.computed_styles)
             elif child.is_inline:
                 # Nested inline element
                 self._process_inline_element(child, paragraph)
@@ -284,7 +282,7 @@ class ParagraphBuilder:
 
             # Add inline image to paragraph run
             run = paragraph.add_run()
-            run.add_picture(image_stream, width=Inches(display_width), height=Inches(display_height))
+            add_picture(run, image_stream, width=Inches(display_width), height=Inches(display_height))
 
             logger.debug(f"Added inline image: {src} ({display_width:.2f}x{display_height:.2f} in)")
 
@@ -305,6 +303,7 @@ class ParagraphBuilder:
             from docx.shared import Inches
 
             image_builder = ImageBuilder(self.document)
+            image_builder.dom_tree = getattr(self.document_builder, 'dom_tree', None)
 
             # Get dimensions - for icons, ensure square aspect ratio
             width = svg_node.get_attribute('width') or svg_node.computed_styles.get('width', '14')
@@ -343,7 +342,8 @@ class ParagraphBuilder:
                 if png_data:
                     image_stream = io.BytesIO(png_data)
                     run = paragraph.add_run()
-                    run.add_picture(
+                    add_picture(
+                        run,
                         image_stream,
                         width=Inches(width_pt / 72),
                         height=Inches(height_pt / 72)
@@ -370,10 +370,14 @@ class ParagraphBuilder:
             if not png_data:
                 try:
                     from html2word.utils.browser_svg_converter import get_browser_converter
+                    from html2word.utils.render_scheduler import get_render_scheduler
                     converter = get_browser_converter()
                     width_px = int(width_pt * 96 / 72)
                     height_px = int(height_pt * 96 / 72)
-                    png_data = converter.convert(svg_content, width_px, height_px)
+                    png_data = get_render_scheduler().run(
+                        'svg', converter._get_svg_hash(svg_content, width_px, height_px),
+                        converter.convert, svg_content, width_px, height_px
+                    )
                 except Exception as e:
                     logger.debug(f"Browser converter failed: {e}")
 
@@ -385,12 +389,13 @@ class ParagraphBuilder:
                     if use_element:
                         png_data = self._create_inline_icon_fallback(use_element, width_pt, height_pt, svg_node)
                     else:
-                        png_data = self._create_pil_icon_fallback(width_pt, height_pt, svg_node)
+                        png_data = self._create_inline_icon_fallback(None, width_pt, height_pt, svg_node)
 
                 if png_data:
                     image_stream = io.BytesIO(png_data)
                     run = paragraph.add_run()
-                    run.add_picture(
+                    add_picture(
+                        run,
                         image_stream,
                         width=Inches(width_pt / 72),
                         height=Inches(height_pt / 72)
@@ -406,14 +411,20 @@ class ParagraphBuilder:
                     if png_data:
                         image_stream = io.BytesIO(png_data)
                         run = paragraph.add_run()
-                        run.add_picture(
+                        add_picture(
+                            run,
                             image_stream,
                             width=Inches(width_pt / 72),
                             height=Inches(height_pt / 72)
                         )
                         logger.debug(f"Added fallback icon ({width}x{height})")
                         return
-                logger.warning("Could not convert inline SVG, skipping")
+                from html2word.utils.deadline import get_deadline
+                deadline = get_deadline()
+                if deadline.is_low():
+                    deadline.record('inline_svg_skipped')
+                else:
+                    logger.warning("Could not convert inline SVG, skipping")
 
         except Exception as e:
             logger.warning(f"Failed to add inline SVG: {e}")
@@ -464,13 +475,14 @@ class ParagraphBuilder:
 
         return default_size
 
-    def _create_inline_icon_fallback(self, use_element: DOMNode, width_pt: float, height_pt: float, svg_node: DOMNode) -> bytes:
+    def _create_inline_icon_fallback(self, use_element: Optional[DOMNode], width_pt: float, height_pt: float, svg_node: DOMNode) -> bytes:
         """
         Create a fallback icon PNG for inline SVG with missing symbol.
-        Uses browser rendering with icon font to get exact icon appearance.
+        Drawn in-process with PIL and memoized by (glyph, colour, size), so each
+        distinct icon is generated once and embedded as the same image part.
 
         Args:
-            use_element: The use element referencing a missing symbol
+            use_element: The use element referencing a missing symbol (None for blank renders)
             width_pt: Width in points
             height_pt: Height in points
             svg_node: The parent SVG node (for color info)
@@ -478,144 +490,28 @@ class ParagraphBuilder:
         Returns:
             PNG data as bytes or None
         """
-        # First try browser rendering with icon font
-        png_data = self._render_icon_with_browser(use_element, width_pt, height_pt, svg_node)
-        if png_data:
-            return png_data
+        import re
+        from html2word.utils.deadline import get_deadline
+        from html2word.utils.icon_factory import get_icon_factory, icon_kind_from_href
+
+        # Decorative icons are the first thing dropped once the conversion deadline has passed
+        deadline = get_deadline()
+        if deadline.expired():
+            deadline.record('icon_skipped')
+            return None
 
-        # Fallback to PIL-based icon
-        return self._create_pil_icon_fallback(width_pt, height_pt, svg_node)
+        href = None
+        if use_element is not None:
+            href = use_element.get_attribute('xlink:href') or use_element.get_attribute('href')
 
-    def _render_icon_with_browser(self, _use_element: DOMNode, width_pt: float, height_pt: float, svg_node: DOMNode) -> bytes:
-        """
-        Render icon using Chrome headless to get exact icon appearance.
-        Creates a simple info icon that matches the HTML style.
-        """
-        try:
-            import subprocess
-            import tempfile
-            import os
-            import re
-            import shutil
-
-            # Get color from SVG style
-            color = 'rgb(86, 125, 245)'  # Default blue
-            style = svg_node.get_attribute('style') or ''
-            color_match = re.search(r'color:\s*(rgb\([^)]+\))', style)
-            if color_match:
-                color = color_match.group(1)
-
-            # Convert to pixels
-            width_px = max(int(width_pt * 96 / 72), 16)
-            height_px = max(int(height_pt * 96 / 72), 16)
-
-            # Create HTML that renders an info icon similar to the original
-            html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        html, body {{
-            width: {width_px}px;
-            height: {height_px}px;
-            overflow: hidden;
-            background: transparent;
-        }}
-        .icon {{
-            width: {width_px}px;
-            height: {height_px}px;
-            background: white;
-            border: 2px solid {color};
-            border-radius: 50%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: {color};
-            font-family: Arial, sans-serif;
-            font-size: {int(height_px * 0.6)}px;
-            font-weight: bold;
-            font-style: italic;
-        }}
-    </style>
-</head>
-<body>
-    <span class="icon">i</span>
-</body>
-</html>"""
-
-            # Find Chrome
-            chrome_paths = [
-                # Windows
-                r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-                r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-                os.path.expandvars(r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe"),
-                # Linux
-                "/usr/bin/google-chrome",
-                "/usr/bin/google-chrome-stable",
-                "/usr/bin/chromium-browser",
-                "/usr/bin/chromium",
-                # Mac
-                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-            ]
-
-            chrome_exe = None
-            for path in chrome_paths:
-                if os.path.exists(path):
-                    chrome_exe = path
-                    logger.debug(f"Found Chrome at: {path}")
-                    break
-
-            if not chrome_exe:
-                logger.debug("Chrome not found for icon rendering")
-                return None
-
-            # Create temp files and user data dir
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False, encoding='utf-8') as f:
-                f.write(html_content)
-                html_file = f.name
-
-            screenshot_file = html_file.replace('.html', '.png')
-            user_data_dir = tempfile.mkdtemp(prefix='chrome_icon_')
-
-            try:
-                # Run Chrome headless with separate user data dir to avoid conflicts
-                cmd = [
-                    chrome_exe,
-                    '--headless=new',
-                    '--disable-gpu',
-                    '--no-sandbox',
-                    f'--user-data-dir={user_data_dir}',
-                    f'--window-size={width_px},{height_px}',
-                    '--default-background-color=00000000',
-                    f'--screenshot={screenshot_file}',
-                    f'file:///{html_file}'
-                ]
-
-                subprocess.run(cmd, capture_output=True, timeout=10)
-
-                if os.path.exists(screenshot_file):
-                    with open(screenshot_file, 'rb') as f:
-                        png_data = f.read()
-                    logger.debug(f"Successfully rendered icon with browser ({width_px}x{height_px})")
-                    return png_data
-                else:
-                    logger.debug("Chrome screenshot not created for icon")
-                    return None
+        # Get color from SVG style
+        color = None
+        style = svg_node.get_attribute('style') or ''
+        color_match = re.search(r'(?<![-\w])color:\s*(rgb\([^)]+\)|#[0-9a-fA-F]{3,6})', style)
+        if color_match:
+            color = color_match.group(1)
 
-            finally:
-                # Cleanup
-                try:
-                    os.unlink(html_file)
-                    if os.path.exists(screenshot_file):
-                        os.unlink(screenshot_file)
-                    shutil.rmtree(user_data_dir, ignore_errors=True)
-                except:
-                    pass
-
-        except Exception as e:
-            logger.debug(f"Browser icon rendering failed: {e}")
-            return None
+        return get_icon_factory().get_icon(icon_kind_from_href(href), width_pt, height_pt, color)
 
     def _is_blank_image(self, png_data: bytes) -> bool:
         """
@@ -658,67 +554,3 @@ class ParagraphBuilder:
         except Exception as e:
             logger.debug(f"Error checking if image is blank: {e}")
             return False  # Assume not blank if we can't check
-
-    def _create_pil_icon_fallback(self, width_pt: float, height_pt: float, svg_node: DOMNode) -> bytes:
-        """
-        Create a simple PIL-based info icon as last resort fallback.
-        """
-        try:
-            from PIL import Image, ImageDraw, ImageFont
-            import re
-
-            # Convert to pixels
-            width_px = max(int(width_pt * 96 / 72), 16)
-            height_px = max(int(height_pt * 96 / 72), 16)
-
-            # Get color from SVG style
-            color = (86, 125, 245, 255)  # Default blue
-            style = svg_node.get_attribute('style') or ''
-            if 'color:' in style:
-                match = re.search(r'color:\s*rgb\((\d+),\s*(\d+),\s*(\d+)\)', style)
-                if match:
-                    color = (int(match.group(1)), int(match.group(2)), int(match.group(3)), 255)
-
-            # Create transparent image
-            img = Image.new('RGBA', (width_px, height_px), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-
-            # Draw info icon (outlined style: white background, blue border, blue text)
-            margin = 1
-            border_width = max(2, width_px // 8)
-            # Draw white filled circle with blue outline
-            draw.ellipse([(margin, margin), (width_px - margin - 1, height_px - margin - 1)],
-                       fill=(255, 255, 255, 255), outline=color, width=border_width)
-
-            # Draw 'i' character in blue
-            try:
-                font_size = int(width_px * 0.6)
-                font = ImageFont.truetype("arial.ttf", font_size)
-                bbox = draw.textbbox((0, 0), "i", font=font)
-                text_width = bbox[2] - bbox[0]
-                text_height = bbox[3] - bbox[1]
-                x = (width_px - text_width) // 2
-                y = (height_px - text_height) // 2 - font_size // 8
-                draw.text((x, y), "i", fill=color, font=font)
-            except:
-                # Fallback: draw simple 'i' shape in blue
-                center_x = width_px // 2
-                dot_r = max(1, width_px // 10)
-                stem_w = max(1, width_px // 12)
-                draw.ellipse([(center_x - dot_r, height_px // 4 - dot_r),
-                            (center_x + dot_r, height_px // 4 + dot_r)],
-                           fill=color)
-                draw.rectangle([(center_x - stem_w, height_px // 4 + dot_r * 2),
-                              (center_x + stem_w, height_px * 3 // 4)],
-                             fill=color)
-
-            # Save to bytes
-            import io
-            img_stream = io.BytesIO()
-            img.save(img_stream, format='PNG')
-            img_stream.seek(0)
-            return img_stream.getvalue()
-
-        except Exception as e:
-            logger.warning(f"Failed to create PIL icon fallback: {e}")
-            return None
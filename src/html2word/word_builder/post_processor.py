@@ -0,0 +1,105 @@
+"""
+Document post-processing.
+
+Whole-document fix-ups run as compiled XPath queries over the raw body XML in
+a single sweep, instead of walking python-docx proxy objects (tables -> rows ->
+cells -> paragraphs). The streaming backend applies the same fix-ups block by
+block, right before each top-level block is written.
+"""
+
+import logging
+from typing import Callable, Dict, List, Tuple
+
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml.ns import nsmap
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+_NAMESPACES = {'w': nsmap['w']}
+
+# Direct paragraphs of the cells of a top-level table, as python-docx's
+# table.rows -> row.cells -> cell.paragraphs visits them (vMerge continuation
+# cells resolve to the cell above and add no paragraphs of their own)
+_TABLE_CELL_PARAGRAPHS = (
+    "self::w:tbl/w:tr/w:tc"
+    "[not(w:tcPr/w:vMerge) or w:tcPr/w:vMerge/@w:val='restart']"
+    "/w:p"
+)
+
+
+def _default_left_alignment(p) -> bool:
+    """Left-align a non-empty table cell paragraph that has no explicit alignment."""
+    # FIXED: Keep table cell content left-aligned by default for better readability
+    # (left alignment is more appropriate for tabular data than justify)
+    if not p.text.strip():
+        return False
+    p.get_or_add_pPr().jc_val = WD_ALIGN_PARAGRAPH.LEFT
+    return True
+
+
+class BodyPostProcessor:
+    """Applies registered XML fix-ups to the top-level blocks of a document body."""
+
+    def __init__(self):
+        """Initialize post-processor with the default fix-ups."""
+        # name -> (XPath over a block, XPath over the body, fix-up)
+        self._fixups: List[Tuple[str, etree.XPath, etree.XPath, Callable]] = []
+        self.stats: Dict[str, int] = {}
+
+        self.register(
+            'table_cell_alignment',
+            _TABLE_CELL_PARAGRAPHS
+            + "[not(w:pPr/w:jc)][w:r/w:t or w:r/w:noBreakHyphen or w:hyperlink/w:r/w:t]",
+            _default_left_alignment,
+        )
+
+    def register(self, name: str, path: str, fixup: Callable):
+        """
+        Register a fix-up.
+
+        Args:
+            name: Name reported in stats
+            path: XPath selecting the elements to fix, relative to a top-level
+                body block and starting with a self:: step (w: prefix available)
+            fixup: Called with each selected element; returns True if it changed it
+        """
+        block_xpath = etree.XPath(path, namespaces=_NAMESPACES)
+        body_xpath = etree.XPath('*/' + path, namespaces=_NAMESPACES)
+        self._fixups.append((name, block_xpath, body_xpath, fixup))
+        self.stats.setdefault(name, 0)
+
+    def reset_stats(self):
+        """Reset per-build counters."""
+        for name in self.stats:
+            self.stats[name] = 0
+
+    def process_body(self, body):
+        """
+        Apply all fix-ups to every block of the body.
+
+        Args:
+            body: w:body element
+        """
+        for name, _, body_xpath, fixup in self._fixups:
+            self._apply(name, body_xpath(body), fixup)
+
+    def process_block(self, element):
+        """
+        Apply all fix-ups to one top-level block (streaming backend).
+
+        Args:
+            element: Body child about to be written
+        """
+        for name, block_xpath, _, fixup in self._fixups:
+            self._apply(name, block_xpath(element), fixup)
+
+    def _apply(self, name: str, elements: List, fixup: Callable):
+        fixed = 0
+        for element in elements:
+            try:
+                if fixup(element):
+                    fixed += 1
+            except Exception as e:
+                logger.warning(f"Post-processing fix-up '{name}' failed: {e}")
+        self.stats[name] += fixed
@@ -0,0 +1,165 @@
+"""
+Streaming .docx writer.
+
+Writes word/document.xml into the output package while the document is being
+built: finished top-level blocks (paragraphs, tables) are serialized into the
+zip entry and removed from the in-memory tree, so memory stays proportional to
+the blocks still being built instead of the whole document. Styles, numbering,
+relationships, media and the other parts are written when the writer is closed.
+
+Drawing ids (wp:docPr/@id) must be unique across the whole document, but
+python-docx derives the next id from the in-memory tree only. The writer
+records the highest id it has streamed so new pictures continue from there
+(see html2word.utils.image_cache.next_shape_id).
+"""
+
+import logging
+import os
+import re
+import zipfile
+from typing import Callable, Optional
+
+from docx.opc.oxml import serialize_part_xml
+from docx.opc.pkgwriter import PackageWriter
+from lxml import etree
+
+from html2word.utils.image_cache import record_streamed_ids
+
+logger = logging.getLogger(__name__)
+
+_STREAM_MARKER = b'<!--html2word-stream-->'
+_XMLNS_RE = re.compile(rb'\sxmlns:([\w.-]+)="([^"]*)"')
+
+
+class _ZipPartWriter:
+    """PhysPkgWriter stand-in for PackageWriter that skips the streamed main document part."""
+
+    def __init__(self, zip_file: zipfile.ZipFile, skip_membername: str):
+        self._zip = zip_file
+        self._skip = skip_membername
+
+    def write(self, pack_uri, blob: bytes):
+        if pack_uri.membername == self._skip:
+            return
+        self._zip.writestr(pack_uri.membername, blob)
+
+
+class StreamingDocxWriter:
+    """Streams the main document part of a python-docx Document into a .docx file."""
+
+    # Most recent top-level blocks kept in memory: builders may still be adding to them
+    WINDOW = 8
+
+    def __init__(self, document, output_path: str,
+                 before_write: Optional[Callable] = None):
+        """
+        Open the output package and write the start of word/document.xml.
+
+        Args:
+            document: python-docx Document being built
+            output_path: Output .docx file path
+            before_write: Optional callback invoked with each block element right
+                before it is serialized (last chance for per-block post-processing)
+        """
+        self.document = document
+        self.output_path = output_path
+        self.before_write = before_write
+        self.stats = {'blocks': 0, 'bytes': 0}
+
+        self._root = document.element
+        self._body = self._root.body
+        # Namespaces declared on <w:document>; fragments repeat them and must not
+        self._root_nsdecls = {
+            prefix.encode('utf-8'): uri.encode('utf-8')
+            for prefix, uri in self._root.nsmap.items() if prefix
+        }
+        self._membername = document.part.partname.membername
+
+        head, self._tail = self._split_skeleton()
+        self._zip = zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED)
+        self._stream = self._zip.open(self._membername, 'w', force_zip64=True)
+        self._write(head)
+        logger.info(f"Streaming document body to {output_path}")
+
+    def _split_skeleton(self):
+        """Serialize <w:document> with an empty body and split it around the body content."""
+        children = list(self._body)
+        for child in children:
+            self._body.remove(child)
+        marker = etree.Comment(_STREAM_MARKER[4:-3].decode('ascii'))
+        self._body.append(marker)
+        try:
+            xml = serialize_part_xml(self._root)
+        finally:
+            self._body.remove(marker)
+            self._body.extend(children)
+        head, tail = xml.split(_STREAM_MARKER, 1)
+        return head, tail
+
+    def _write(self, data: bytes):
+        self._stream.write(data)
+        self.stats['bytes'] += len(data)
+
+    def _serialize_block(self, element) -> bytes:
+        """Serialize a body child as it appears inside the full document."""
+        xml = etree.tostring(element, encoding='UTF-8')
+        tag_end = xml.index(b'>')
+        start_tag = _XMLNS_RE.sub(
+            lambda m: b'' if self._root_nsdecls.get(m.group(1)) == m.group(2) else m.group(0),
+            xml[:tag_end]
+        )
+        return start_tag + xml[tag_end:]
+
+    def flush(self, keep: Optional[int] = None):
+        """
+        Write finished top-level blocks and drop them from memory.
+
+        Args:
+            keep: Number of most recent blocks to keep in memory (default WINDOW)
+        """
+        if keep is None:
+            keep = self.WINDOW
+        sect_pr = self._body.sectPr
+        blocks = [child for child in self._body if child is not sect_pr]
+        if len(blocks) <= keep:
+            return
+        max_id = 0
+        for block in blocks[:len(blocks) - keep]:
+            if self.before_write is not None:
+                self.before_write(block)
+            self._write(self._serialize_block(block))
+            max_id = max([max_id] + [int(value) for value in block.xpath('.//@id') if value.isdigit()])
+            self._body.remove(block)
+            self.stats['blocks'] += 1
+        record_streamed_ids(self.document.part, max_id)
+
+    def close(self):
+        """Write the remaining blocks, the section properties and all other package parts."""
+        self.flush(keep=0)
+        sect_pr = self._body.sectPr
+        if sect_pr is not None:
+            self._write(self._serialize_block(sect_pr))
+        self._write(self._tail)
+        self._stream.close()
+
+        package = self.document.part.package
+        parts = list(package.iter_parts())
+        part_writer = _ZipPartWriter(self._zip, self._membername)
+        PackageWriter._write_content_types_stream(part_writer, parts)
+        PackageWriter._write_pkg_rels(part_writer, package.rels)
+        PackageWriter._write_parts(part_writer, parts)
+        self._zip.close()
+
+        logger.info(f"Streamed {self.stats['blocks']} blocks ({self.stats['bytes']} bytes of document XML)")
+
+    def abort(self):
+        """Close and delete the partially written package."""
+        try:
+            self._stream.close()
+            self._zip.close()
+        except Exception:
+            pass
+        try:
+            os.unlink(self.output_path)
+        except OSError:
+            pass
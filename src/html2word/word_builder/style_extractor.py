@@ -0,0 +1,243 @@
+"""
+Named style extraction.
+
+Builders apply all formatting as direct run and paragraph properties, so the
+same <w:rPr>/<w:pPr> blocks are repeated throughout document.xml. This pass
+registers frequently repeated formatting signatures as character and paragraph
+styles in styles.xml and replaces the repeated properties with style references.
+
+Properties whose meaning would change inside a style stay direct:
+toggle properties (bold, italic, caps, ...) combine by XOR across the style
+hierarchy, and numbering, section breaks, paragraph-mark run properties and
+revision marks are tied to the paragraph itself. Paragraphs and runs that
+already reference a style (headings, hyperlinks) are left alone so the style
+names that TOCs and navigation rely on are kept.
+"""
+
+import copy
+import logging
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml.ns import qn
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# Run properties that toggle relative to the paragraph/table style when set in a style
+_RUN_TOGGLE_TAGS = frozenset(qn(f'w:{tag}') for tag in (
+    'b', 'bCs', 'i', 'iCs', 'caps', 'smallCaps', 'strike', 'dstrike',
+    'outline', 'shadow', 'emboss', 'imprint', 'vanish',
+))
+_RUN_DIRECT_TAGS = _RUN_TOGGLE_TAGS | {qn('w:rPrChange')}
+_PARA_DIRECT_TAGS = frozenset(qn(f'w:{tag}') for tag in (
+    'numPr', 'rPr', 'sectPr', 'pPrChange', 'cnfStyle',
+))
+
+# Approximate serialized size of a style definition (w:style, w:name, w:basedOn, ...)
+_STYLE_OVERHEAD = 160
+# Size of <w:rStyle w:val="..."/> / <w:pStyle w:val="..."/> with a short id
+_REFERENCE_SIZE = 36
+
+_XMLNS_RE = re.compile(rb'\sxmlns:[\w.-]+="[^"]*"')
+
+
+def named_styles_enabled() -> bool:
+    """Whether to extract named styles (HTML2WORD_NAMED_STYLES, default true)"""
+    return os.getenv('HTML2WORD_NAMED_STYLES', 'true').lower() == 'true'
+
+
+def get_min_occurrences() -> int:
+    """Minimum repeats of a formatting signature before it becomes a style (HTML2WORD_NAMED_STYLE_MIN_COUNT, default 3)"""
+    return max(2, int(os.getenv('HTML2WORD_NAMED_STYLE_MIN_COUNT', '3')))
+
+
+def _signature(element) -> Tuple:
+    """Hashable signature of an element subtree (tag, attributes, children)."""
+    return (element.tag, tuple(sorted(element.attrib.items())),
+            tuple(_signature(child) for child in element))
+
+
+class _Candidate:
+    """Occurrences of one formatting signature."""
+
+    __slots__ = ('is_run', 'props', 'size', 'count', 'owners', 'style_id')
+
+    def __init__(self, is_run: bool, props: List):
+        self.is_run = is_run
+        # Detached copies: the first occurrence may be streamed out and freed
+        self.props = [copy.deepcopy(prop) for prop in props]
+        # Serialized size as inside the document (namespaces are declared on the root)
+        self.size = sum(len(_XMLNS_RE.sub(b'', etree.tostring(prop))) for prop in self.props)
+        self.count = 0
+        self.owners: List = []  # rPr/pPr elements carrying these properties (full pass only)
+        self.style_id: Optional[str] = None
+
+
+class NamedStyleExtractor:
+    """Moves repeated direct formatting into character and paragraph styles."""
+
+    def __init__(self, document, min_occurrences: Optional[int] = None):
+        """
+        Initialize extractor.
+
+        Args:
+            document: python-docx Document
+            min_occurrences: Minimum repeats before a signature becomes a style
+                (default HTML2WORD_NAMED_STYLE_MIN_COUNT)
+        """
+        self.document = document
+        self.min_occurrences = min_occurrences or get_min_occurrences()
+        self._candidates: Dict[Tuple, _Candidate] = {}
+        self._style_names = {style.name for style in document.styles}
+        self._style_ids = {style.style_id for style in document.styles}
+        self._default_paragraph_style = document.styles.default(WD_STYLE_TYPE.PARAGRAPH)
+        self.stats = {
+            'character_styles': 0,
+            'paragraph_styles': 0,
+            'runs_styled': 0,
+            'paragraphs_styled': 0,
+            'bytes_before': 0,
+            'bytes_after': 0,
+        }
+
+    def extract(self, root) -> Dict[str, int]:
+        """
+        Collect signatures in a finished tree, then register styles for the repeated ones.
+
+        Args:
+            root: Element to scan (normally the document body)
+
+        Returns:
+            Size report (see report)
+        """
+        self._collect(root)
+        for candidate in self._candidates.values():
+            if not candidate.owners:
+                continue
+            if candidate.style_id is None and self._should_register(candidate):
+                self._register(candidate)
+            if candidate.style_id is not None:
+                for owner in candidate.owners:
+                    self._replace(owner, candidate)
+            else:
+                self._count_unchanged(candidate, len(candidate.owners))
+            candidate.owners = []
+        return self.report()
+
+    def extract_incremental(self, element):
+        """
+        Process one finished block whose predecessors are already written (streaming backend).
+
+        A signature becomes a style once it has been seen min_occurrences times; earlier
+        occurrences keep their direct formatting.
+
+        Args:
+            element: Top-level body block about to be written
+        """
+        seen = []
+        self._collect(element, seen)
+        for candidate, owner in seen:
+            if candidate.style_id is None:
+                if not self._should_register(candidate):
+                    self._count_unchanged(candidate, 1)
+                    continue
+                self._register(candidate)
+            self._replace(owner, candidate)
+
+    def report(self) -> Dict[str, int]:
+        """
+        Formatting XML size before/after extraction.
+
+        Returns:
+            Dict with style/occurrence counts and the approximate bytes of run/paragraph
+            property XML (including the added style definitions) before and after
+        """
+        return dict(self.stats)
+
+    def _collect(self, root, seen: Optional[List] = None):
+        """
+        Group rPr/pPr elements under root by formatting signature.
+
+        Args:
+            root: Element to scan
+            seen: When given, (candidate, element) pairs are appended here instead of
+                being kept on the candidates
+        """
+        for tag, owner_tag, direct_tags, ref_tag in (
+                (qn('w:rPr'), qn('w:r'), _RUN_DIRECT_TAGS, qn('w:rStyle')),
+                (qn('w:pPr'), qn('w:p'), _PARA_DIRECT_TAGS, qn('w:pStyle'))):
+            for props in root.iter(tag):
+                parent = props.getparent()
+                if parent is None or parent.tag != owner_tag:
+                    continue  # paragraph-mark rPr, revision copies, ...
+                if props.find(ref_tag) is not None:
+                    continue  # already styled
+                movable = [child for child in props if child.tag not in direct_tags]
+                if not movable:
+                    continue
+                key = (tag, tuple(_signature(child) for child in movable))
+                candidate = self._candidates.get(key)
+                if candidate is None:
+                    candidate = self._candidates[key] = _Candidate(tag == qn('w:rPr'), movable)
+                candidate.count += 1
+                if seen is None:
+                    candidate.owners.append(props)
+                else:
+                    seen.append((candidate, props))
+
+    def _should_register(self, candidate: _Candidate) -> bool:
+        """Repeated often enough, and the references plus the definition are smaller than the repeats."""
+        count = candidate.count
+        return (count >= self.min_occurrences
+                and candidate.size * count > candidate.size + _STYLE_OVERHEAD + _REFERENCE_SIZE * count)
+
+    def _count_unchanged(self, candidate: _Candidate, count: int):
+        self.stats['bytes_before'] += candidate.size * count
+        self.stats['bytes_after'] += candidate.size * count
+
+    def _register(self, candidate: _Candidate):
+        """Add a style carrying the candidate's properties to styles.xml."""
+        is_run = candidate.is_run
+        prefix = 'HTML Text' if is_run else 'HTML Paragraph'
+        index = self.stats['character_styles' if is_run else 'paragraph_styles'] + 1
+        name = f'{prefix} {index}'
+        while name in self._style_names or name.replace(' ', '') in self._style_ids:
+            index += 1
+            name = f'{prefix} {index}'
+
+        style = self.document.styles.add_style(
+            name, WD_STYLE_TYPE.CHARACTER if is_run else WD_STYLE_TYPE.PARAGRAPH
+        )
+        if not is_run and self._default_paragraph_style is not None:
+            style.element.basedOn_val = self._default_paragraph_style.style_id
+
+        props = style.element.get_or_add_rPr() if is_run else style.element.get_or_add_pPr()
+        for prop in candidate.props:
+            props.append(copy.deepcopy(prop))
+
+        candidate.style_id = style.style_id
+        self._style_names.add(name)
+        self._style_ids.add(style.style_id)
+        self.stats['character_styles' if is_run else 'paragraph_styles'] += 1
+        self.stats['bytes_after'] += candidate.size + _STYLE_OVERHEAD
+        logger.debug(f"Registered {'character' if is_run else 'paragraph'} style '{name}'")
+
+    def _replace(self, props, candidate: _Candidate):
+        """Replace the movable properties of one rPr/pPr with a reference to the candidate's style."""
+        is_run = props.tag == qn('w:rPr')
+        direct_tags = _RUN_DIRECT_TAGS if is_run else _PARA_DIRECT_TAGS
+        ref_tag = qn('w:rStyle') if is_run else qn('w:pStyle')
+        for child in list(props):
+            if child.tag not in direct_tags:
+                props.remove(child)
+        ref = etree.SubElement(props, ref_tag)
+        ref.set(qn('w:val'), candidate.style_id)
+        props.insert(0, ref)  # rStyle/pStyle is the first child in the schema
+
+        self.stats['runs_styled' if is_run else 'paragraphs_styled'] += 1
+        self.stats['bytes_before'] += candidate.size
+        self.stats['bytes_after'] += _REFERENCE_SIZE
+
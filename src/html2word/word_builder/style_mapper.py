@@ -4,11 +4,14 @@ Style mapper - maps CSS styles to Word styles.
 Converts computed CSS styles to python-docx formatting.
 """
 
+import copy
 import logging
 from typing import Optional, Dict, Any
 from docx.shared import Pt, RGBColor, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_UNDERLINE
 from docx.enum.table import WD_ALIGN_VERTICAL
+from docx.oxml.ns import qn
+from docx.text.run import Run
 
 from html2word.utils.colors import ColorConverter
 from html2word.utils.fonts import FontMapper
@@ -17,18 +20,125 @@ from html2word.utils.font_utils import apply_uniform_font
 
 logger = logging.getLogger(__name__)
 
+# Text that python-docx turns into w:br/w:tab/w:cr elements (never coalesced)
+_BREAK_CHARS = frozenset('\n\r\t')
+
 
 class StyleMapper:
     """Maps CSS styles to Word formatting."""
 
+    # Computed styles that determine a run's <w:rPr> (the run style signature)
+    RUN_STYLE_PROPERTIES = ('font-family', 'font-size', 'font-weight',
+                            'font-style', 'color', 'text-decoration')
+
     def __init__(self):
         """Initialize style mapper."""
         self.font_mapper = FontMapper()
+        # run style signature -> compiled <w:rPr> template (None when the styles set nothing)
+        self._run_templates: Dict[tuple, Any] = {}
+        self.run_template_stats = {'compiled': 0, 'reused': 0}
+        # Last run added by add_styled_run and its signature (coalescing candidate)
+        self._last_run = None
+        self.run_stats = {'text_runs': 0, 'runs': 0}
+
+    def reset_run_stats(self):
+        """Reset run coalescing counts (text runs requested / runs created)."""
+        self._last_run = None
+        self.run_stats = {'text_runs': 0, 'runs': 0}
+
+    def _run_signature(self, styles: Dict[str, Any]) -> Optional[tuple]:
+        """Run style signature of computed styles (None when a value is unhashable)."""
+        signature = tuple((prop, styles[prop]) for prop in self.RUN_STYLE_PROPERTIES if prop in styles)
+        try:
+            hash(signature)
+        except TypeError:
+            return None
+        return signature
+
+    def add_styled_run(self, paragraph, text: str, styles: Dict[str, Any]):
+        """
+        Add a styled text run, coalescing with the previous run when possible.
+
+        When the paragraph's last element is the plain text run added by the previous
+        call and both have the same run style signature, the text is appended to that
+        run instead of creating a new one with duplicated properties.
+
+        Args:
+            paragraph: python-docx Paragraph object
+            text: Run text
+            styles: Computed CSS styles
+
+        Returns:
+            python-docx Run object holding the text (possibly shared with earlier text)
+        """
+        self.run_stats['text_runs'] += 1
+        signature = self._run_signature(styles)
+        p = paragraph._p
+
+        last = self._last_run
+        if (last is not None and signature is not None and last[1] == signature
+                and len(p) and p[-1] is last[0] and not _BREAK_CHARS.intersection(text)):
+            r = last[0]
+            t = r[-1]
+            if t.tag == qn('w:t') and len(r) == (2 if r.rPr is not None else 1):
+                merged = (t.text or '') + text
+                t.text = merged
+                if merged != merged.strip():
+                    t.set(qn('xml:space'), 'preserve')
+                return Run(r, paragraph)
+
+        run = paragraph.add_run(text)
+        self.apply_run_style(run, styles)
+        self.run_stats['runs'] += 1
+        self._last_run = (run._r, signature)
+        return run
 
     def apply_run_style(self, run, styles: Dict[str, Any]):
         """
         Apply text run styles.
 
+        Run properties are compiled once per style signature into a <w:rPr>
+        template; applying the style to a fresh run is a single element clone.
+
+        Args:
+            run: python-docx Run object
+            styles: Computed CSS styles
+        """
+        signature = self._run_signature(styles) if run._r.rPr is None else None
+        if signature is None:
+            # Run already carries properties (merge property by property) or unhashable style value
+            self._apply_run_properties(run, styles)
+            return
+
+        template = self._run_templates.get(signature, False)
+
+        if template is False:
+            template = self._compile_run_template(styles)
+            self._run_templates[signature] = template
+            self.run_template_stats['compiled'] += 1
+        else:
+            self.run_template_stats['reused'] += 1
+
+        if template is not None:
+            run._r.insert(0, copy.deepcopy(template))
+
+    def _compile_run_template(self, styles: Dict[str, Any]):
+        """Build the <w:rPr> produced by styles on an empty scratch run."""
+        from docx.oxml import OxmlElement
+        from docx.text.run import Run
+
+        scratch = Run(OxmlElement('w:r'), None)
+        self._apply_run_properties(scratch, styles)
+        rPr = scratch._r.rPr
+        if rPr is None:
+            return None
+        scratch._r.remove(rPr)
+        return rPr
+
+    def _apply_run_properties(self, run, styles: Dict[str, Any]):
+        """
+        Set run properties from computed styles one by one.
+
         Args:
             run: python-docx Run object
             styles: Computed CSS styles
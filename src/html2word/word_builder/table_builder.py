@@ -4,11 +4,17 @@ Table builder for Word documents.
 Builds Word tables from HTML table elements with proper cell merging.
 """
 
+import copy
 import logging
 from typing import List, Optional, Tuple, Dict, Any
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import nsdecls, qn
 from docx.shared import Inches, Pt
+from docx.table import _Cell, _Row
 
+from html2word.layout.table_layout import TableLayout
 from html2word.parser.dom_tree import DOMNode
+from html2word.utils.image_cache import add_picture
 from html2word.word_builder.style_mapper import StyleMapper
 from html2word.word_builder.paragraph_builder import ParagraphBuilder
 
@@ -80,196 +86,55 @@ class TableBuilder:
         if table_node.tag != 'table':
             return None
 
-        # Extract table structure
-        rows = self._extract_rows(table_node)
-        if not rows:
+        # Table structure, computed once and shared by all build steps
+        layout = TableLayout.for_table(table_node)
+        if not layout.rows or layout.num_cols == 0:
             return None
 
-        # Calculate dimensions
-        num_rows = len(rows)
-        num_cols = self._calculate_columns(rows)
-
-        if num_rows == 0 or num_cols == 0:
-            return None
-
-        # Create table
-        table = self.document.add_table(rows=num_rows, cols=num_cols)
-
-        # Fill table cells
-        self._fill_table(table, rows)
+        table = self._add_table(self.document, layout)
 
         # Apply table-level styles
-        self._apply_table_style(table, table_node)
+        self._apply_table_style(table, table_node, layout)
 
         return table
 
-    def _extract_rows(self, table_node: DOMNode) -> List[DOMNode]:
+    def _add_table(self, container, layout: TableLayout):
         """
-        Extract row nodes from table.
+        Create and fill a Word table for a table layout.
 
-        Args:
-            table_node: Table DOM node
-
-        Returns:
-            List of row nodes (tr)
-        """
-        rows = []
-
-        # Process children to find rows
-        for child in table_node.children:
-            if child.tag == 'tr':
-                rows.append(child)
-            elif child.tag in ('thead', 'tbody', 'tfoot'):
-                # Process section
-                for section_child in child.children:
-                    if section_child.tag == 'tr':
-                        rows.append(section_child)
-
-        return rows
-
-    def _calculate_columns(self, rows: List[DOMNode]) -> int:
-        """
-        Calculate number of columns in table, excluding Element UI gutter columns.
-
-        Element UI tables often have a "gutter" column (for scrollbar space) which should be ignored.
-        This is typically:
-        - The last column
-        - Has empty content
-        - Has class containing "gutter" or col name containing "gutter"
+        Rows are built directly from the cell placements when spans are regular,
+        otherwise cells are created up front and merged through python-docx.
 
         Args:
-            rows: List of row nodes
+            container: Document or cell to add the table to
+            layout: Table layout model
 
         Returns:
-            Number of columns (excluding gutter)
+            python-docx Table object
         """
-        if not rows:
-            return 0
-
-        max_cols = 0
-
-        for row in rows:
-            col_count = 0
-            for cell in row.children:
-                if cell.tag in ('td', 'th'):
-                    colspan = int(cell.get_attribute('colspan', '1'))
-                    col_count += colspan
-            max_cols = max(max_cols, col_count)
-
-        # Check if the last column in ALL rows is a gutter column
-        # If so, exclude it from the column count
-        if max_cols > 0 and self._has_gutter_column(rows, max_cols):
-            logger.debug(f"Detected gutter column, reducing column count from {max_cols} to {max_cols - 1}")
-            return max_cols - 1
-
-        return max_cols
-
-    def _has_gutter_column(self, rows: List[DOMNode], max_cols: int) -> bool:
-        """
-        Check if there is an Element UI gutter column.
-
-        A gutter column is identified by:
-        1. Any cell has class="gutter" (most reliable, check this FIRST)
-        2. Element UI pattern: some rows have N+1 cells, others have N cells
-        3. The extra cell is empty
-
-        Args:
-            rows: List of row nodes
-            max_cols: Maximum number of cells in any row
-
-        Returns:
-            True if gutter column detected
-        """
-        if max_cols <= 1:
-            return False
-
-        # PRIORITY 1: Check if ANY cell has class="gutter"
-        # This is the most reliable indicator and works even with single-row tables
-        for row in rows:
-            cells = [c for c in row.children if c.tag in ('td', 'th')]
-            for cell in cells:
-                cell_classes = cell.attributes.get('class', '')
-                if isinstance(cell_classes, list):
-                    cell_classes = ' '.join(cell_classes)
-                elif not isinstance(cell_classes, str):
-                    cell_classes = ''
-
-                if 'gutter' in cell_classes.lower():
-                    logger.debug(f"Detected gutter column via class='gutter'")
-                    return True
-
-        # PRIORITY 2: Check Element UI pattern (some rows have more cells than others)
-        row_cell_counts = []
-        for row in rows:
-            cells = [c for c in row.children if c.tag in ('td', 'th')]
-            row_cell_counts.append(len(cells))
-
-        if not row_cell_counts:
-            return False
-
-        min_count = min(row_cell_counts)
-        max_count = max(row_cell_counts)
-
-        if max_count == min_count + 1:
-            # Some rows have one extra column
-            # Check if rows with max_count have empty last cell
-            for row in rows:
-                cells = [c for c in row.children if c.tag in ('td', 'th')]
-                if len(cells) == max_count:
-                    last_cell = cells[-1]
-
-                    # Check if cell has empty content
-                    text_content = last_cell.get_text_content() if hasattr(last_cell, 'get_text_content') else ''
-                    if not text_content.strip():
-                        logger.debug(f"Detected gutter column via empty last cell in longer row")
-                        return True
-
-        return False
+        if layout.placements is not None:
+            table = container.add_table(rows=0, cols=layout.num_cols)
+            self._fill_table_bulk(table, layout)
+        else:
+            table = container.add_table(rows=layout.num_rows, cols=layout.num_cols)
+            self._fill_table(table, layout)
+        return table
 
-    def _fill_table(self, table, rows: List[DOMNode]):
+    def _fill_table(self, table, layout: TableLayout):
         """
         Fill table with content and handle cell merging.
 
         Args:
             table: python-docx Table object
-            rows: List of row nodes
+            layout: Table layout model
         """
-        # Build cell matrix to track merged cells
-        matrix = self._build_cell_matrix(rows)
-
-        # Detect gutter column (for Element UI tables)
-        # Identify which rows have gutter column
-        rows_with_gutter = set()
-        max_html_cols = 0
-        min_html_cols = float('inf')
-
-        for idx, row in enumerate(rows):
-            col_count = sum(1 for c in row.children if c.tag in ('td', 'th'))
-            max_html_cols = max(max_html_cols, col_count)
-            min_html_cols = min(min_html_cols, col_count)
-
-        # Element UI pattern: some rows have more cells than others
-        # Rows with extra cells have gutter
-        if max_html_cols > min_html_cols:
-            for idx, row in enumerate(rows):
-                cells = [c for c in row.children if c.tag in ('td', 'th')]
-                if len(cells) == max_html_cols:
-                    # This row has extra cells, check if last is gutter
-                    last_cell = cells[-1]
-                    cell_classes = last_cell.attributes.get('class', '')
-                    if isinstance(cell_classes, list):
-                        cell_classes = ' '.join(cell_classes)
-
-                    text_content = last_cell.get_text_content() if hasattr(last_cell, 'get_text_content') else ''
-
-                    # If last cell is empty or has "gutter" class, mark this row
-                    if 'gutter' in cell_classes.lower() or not text_content.strip():
-                        rows_with_gutter.add(idx)
-                        logger.debug(f"Row {idx} has gutter column")
-
-        # Fill cells
-        for row_idx, row_node in enumerate(rows):
-            word_row = table.rows[row_idx]
+        # Cell matrix to track merged cells
+        matrix = layout.matrix
+
+        # Fill cells (row objects fetched once: table.rows[i] rebuilds the row list on every access)
+        word_rows = list(table.rows)
+        for row_idx, row_node in enumerate(layout.rows):
+            word_row = word_rows[row_idx]
 
             # Set row height based on CSS height property
             self._apply_row_height(word_row, row_node)
@@ -290,15 +155,9 @@ class TableBuilder:
 
             col_idx = 0
 
-            # Get cells for this row
-            cells_in_row = [c for c in row_node.children if c.tag in ('td', 'th')]
-
-            for cell_idx, cell_node in enumerate(cells_in_row):
-                if cell_node.tag not in ('td', 'th'):
-                    continue
-
+            for cell_idx, cell_node in enumerate(layout.row_cells[row_idx]):
                 # Skip gutter column ONLY if this row has gutter and it's the last cell
-                if row_idx in rows_with_gutter and cell_idx == len(cells_in_row) - 1:
+                if layout.is_gutter_cell(row_idx, cell_idx):
                     logger.debug(f"Skipping gutter cell in row {row_idx}")
                     continue
 
@@ -313,8 +172,7 @@ class TableBuilder:
                 word_cell = word_row.cells[col_idx]
 
                 # Get colspan and rowspan
-                colspan = int(cell_node.get_attribute('colspan', '1'))
-                rowspan = int(cell_node.get_attribute('rowspan', '1'))
+                rowspan, colspan = layout.span(cell_node)
 
                 # Prepare cell styles - merge row styles with cell styles
                 cell_styles = self._get_merged_cell_styles(row_node, cell_node)
@@ -341,6 +199,101 @@ class TableBuilder:
 
                 col_idx += colspan
 
+    def _fill_table_bulk(self, table, layout: TableLayout):
+        """
+        Build rows directly as w:tr/w:tc elements with gridSpan/vMerge set on creation.
+
+        Produces the same XML as _fill_table on a pre-sized table (including the borders
+        copied onto every cell of a span before merging) without python-docx's per-access
+        row/cell list rebuilding and merge grid walks.
+
+        Args:
+            table: python-docx Table object without rows
+            layout: Table layout model with cell placements
+        """
+        tbl = table._tbl
+        num_cols = len(tbl.tblGrid.gridCol_lst)
+        col_twips = tbl.tblGrid.gridCol_lst[0].w.twips if num_cols else 0
+        tc_template = parse_xml(
+            f'<w:tc {nsdecls("w")}><w:tcPr><w:tcW w:type="dxa" w:w="{col_twips}"/></w:tcPr><w:p/></w:tc>'
+        )
+
+        # grid column -> [rows left, width, border] of vertical spans started in earlier rows
+        vertical_spans: Dict[int, list] = {}
+
+        for row_idx, row_node in enumerate(layout.rows):
+            tr = tbl.add_tr()
+            word_row = _Row(tr, table)
+            starts = {placement[0]: placement for placement in layout.placements[row_idx]}
+            cell_tcs = {}
+
+            col_idx = 0
+            while col_idx < num_cols:
+                tc = copy.deepcopy(tc_template)
+                tr.append(tc)
+                span = vertical_spans.get(col_idx)
+                if span is not None:
+                    # Continuation cell of a rowspan
+                    span[0] -= 1
+                    if span[0] == 0:
+                        del vertical_spans[col_idx]
+                    width = span[1]
+                    if span[2] is not None:
+                        self.style_mapper._apply_cell_borders(_Cell(tc, table), span[2])
+                    self._span_tc(tc, width, 'continue', col_twips)
+                elif col_idx in starts:
+                    _, cell_node, height, width, spanned = starts[col_idx]
+                    cell_tcs[col_idx] = tc
+                    if spanned:
+                        # Apply the cell's borders to every cell of the span (see _apply_borders_before_merge)
+                        box_model = cell_node.layout_info.get('box_model')
+                        border = box_model.border if box_model and box_model.border.has_border() else None
+                        if border is not None:
+                            self.style_mapper._apply_cell_borders(_Cell(tc, table), border)
+                        if height > 1:
+                            vertical_spans[col_idx] = [height - 1, width, border]
+                        if width > 1 or height > 1:
+                            self._span_tc(tc, width, 'restart' if height > 1 else None, col_twips)
+                else:
+                    width = 1
+                col_idx += width
+
+            # Set row height based on CSS height property
+            self._apply_row_height(word_row, row_node)
+
+            # Set row to not split across pages
+            self._set_row_cant_split(word_row)
+
+            # Check if this is a header row
+            is_header = False
+            if row_node.parent and row_node.parent.tag == 'thead':
+                is_header = True
+            elif any(c.tag == 'th' for c in row_node.children if c.is_element):
+                is_header = True
+
+            if is_header:
+                self._set_row_as_header(word_row)
+                self._set_row_keep_with_next(word_row)
+
+            for col_idx, cell_node, _, _, _ in layout.placements[row_idx]:
+                word_cell = _Cell(cell_tcs[col_idx], table)
+                cell_styles = self._get_merged_cell_styles(row_node, cell_node)
+                box_model = cell_node.layout_info.get('box_model')
+
+                # Apply cell-level styles (background, borders, alignment)
+                self.style_mapper.apply_table_cell_style(word_cell, cell_styles, box_model)
+
+                # Fill cell content with merged styles
+                self._fill_cell(word_cell, cell_node, cell_styles)
+
+    @staticmethod
+    def _span_tc(tc, width: int, v_merge: Optional[str], col_twips: int):
+        """Give a new w:tc the width, gridSpan and vMerge python-docx sets when merging."""
+        if width > 1:
+            tc.tcPr.tcW.set(qn('w:w'), str(col_twips * width))
+            tc.grid_span = width
+        tc.vMerge = v_merge
+
     def _get_merged_cell_styles(self, row_node: DOMNode, cell_node: DOMNode) -> Dict[str, Any]:
         """
         Merge row styles with cell styles.
@@ -402,81 +355,6 @@ class TableBuilder:
 
         return merged_styles
 
-    def _build_cell_matrix(self, rows: List[DOMNode]) -> List[List[Optional[DOMNode]]]:
-        """
-        Build matrix to track cell positions including merged cells.
-
-        Args:
-            rows: List of row nodes
-
-        Returns:
-            Matrix where None indicates a merged cell
-        """
-        if not rows:
-            return []
-
-        num_rows = len(rows)
-        num_cols = self._calculate_columns(rows)
-        matrix = [[None for _ in range(num_cols)] for _ in range(num_rows)]
-
-        # Detect which rows have gutter columns
-        rows_with_gutter = set()
-        max_html_cols = 0
-        min_html_cols = float('inf')
-
-        for idx, row in enumerate(rows):
-            col_count = sum(1 for c in row.children if c.tag in ('td', 'th'))
-            max_html_cols = max(max_html_cols, col_count)
-            min_html_cols = min(min_html_cols, col_count)
-
-        if max_html_cols > min_html_cols:
-            for idx, row in enumerate(rows):
-                cells = [c for c in row.children if c.tag in ('td', 'th')]
-                if len(cells) == max_html_cols:
-                    last_cell = cells[-1]
-                    cell_classes = last_cell.attributes.get('class', '')
-                    if isinstance(cell_classes, list):
-                        cell_classes = ' '.join(cell_classes)
-
-                    text_content = last_cell.get_text_content() if hasattr(last_cell, 'get_text_content') else ''
-
-                    if 'gutter' in cell_classes.lower() or not text_content.strip():
-                        rows_with_gutter.add(idx)
-
-        for row_idx, row_node in enumerate(rows):
-            col_idx = 0
-
-            # Get cells for this row
-            cells_in_row = [c for c in row_node.children if c.tag in ('td', 'th')]
-
-            for cell_idx, cell_node in enumerate(cells_in_row):
-                if cell_node.tag not in ('td', 'th'):
-                    continue
-
-                # Skip gutter column ONLY if this row has gutter and it's the last cell
-                if row_idx in rows_with_gutter and cell_idx == len(cells_in_row) - 1:
-                    continue
-
-                # Find next available column
-                while col_idx < num_cols and matrix[row_idx][col_idx] is not None:
-                    col_idx += 1
-
-                if col_idx >= num_cols:
-                    break
-
-                # Get span values
-                colspan = int(cell_node.get_attribute('colspan', '1'))
-                rowspan = int(cell_node.get_attribute('rowspan', '1'))
-
-                # Mark cells as occupied
-                for r in range(row_idx, min(row_idx + rowspan, num_rows)):
-                    for c in range(col_idx, min(col_idx + colspan, num_cols)):
-                        matrix[r][c] = cell_node
-
-                col_idx += colspan
-
-        return matrix
-
     def _merge_cells(self, table, row_idx: int, col_idx: int, rowspan: int, colspan: int):
         """
         Merge table cells.
@@ -608,9 +486,7 @@ class TableBuilder:
         # Table cells: limit line spacing to 1.2 for compact layout, auto-detect HTML line-height
         # FIXED: Respect Element UI alignment classes for table headers and cells
         # Check for Element UI alignment classes first
-        cell_classes = cell_node.attributes.get('class', [])
-        if isinstance(cell_classes, str):
-            cell_classes = cell_classes.split()
+        cell_classes = cell_node.class_set
 
         # Determine alignment based on Element UI classes or existing styles
         if 'is-center' in cell_classes:
@@ -649,8 +525,7 @@ class TableBuilder:
                 text = self._normalize_whitespace(text)
                 if text.strip():  # Only add if there's non-whitespace content
                     # Add text with merged styles
-                    run = paragraph.add_run(text)
-                    self.style_mapper.apply_run_style(run, cell_styles)
+                    self.style_mapper.add_styled_run(paragraph, text, cell_styles)
                     has_content = True
 
             elif child.is_element:
@@ -751,8 +626,7 @@ class TableBuilder:
                 text = child.text or ""
                 text = self._normalize_whitespace(text)
                 if text.strip():
-                    run = paragraph.add_run(text)
-                    self.style_mapper.apply_run_style(run, element_styles)
+                    self.style_mapper.add_styled_run(paragraph, text, element_styles)
 
             elif child.is_element:
                 if child.tag in ('strong', 'b', 'em', 'i', 'u', 'span', 'a'):
@@ -790,11 +664,7 @@ class TableBuilder:
             return False
 
         # Check for hidden-columns class (Element UI column templates)
-        classes = node.attributes.get('class', '')
-        if isinstance(classes, list):
-            classes = ' '.join(classes)
-        elif not isinstance(classes, str):
-            classes = ''
+        classes = node.class_string
 
         # Skip hidden-columns div (Element UI table column templates)
         if 'hidden-columns' in classes:
@@ -854,8 +724,7 @@ class TableBuilder:
                 text = child.text or ""
                 text = self._normalize_whitespace(text)
                 if text.strip():
-                    run = paragraph.add_run(text)
-                    self.style_mapper.apply_run_style(run, merged_styles)
+                    self.style_mapper.add_styled_run(paragraph, text, merged_styles)
                     has_content_in_paragraph = True
 
             elif child.is_element and child.tag == 'br':
@@ -902,8 +771,7 @@ class TableBuilder:
                 text = child.get_text_content()
                 text = self._normalize_whitespace(text)
                 if text.strip():
-                    run = paragraph.add_run(text)
-                    self.style_mapper.apply_run_style(run, merged_styles)
+                    self.style_mapper.add_styled_run(paragraph, text, merged_styles)
                     has_content_in_paragraph = True
 
         return paragraph
@@ -930,8 +798,7 @@ class TableBuilder:
                 text = child.text or ""
                 text = self._normalize_whitespace(text)
                 if text.strip():
-                    run = paragraph.add_run(text)
-                    self.style_mapper.apply_run_style(run, merged_styles)
+                    self.style_mapper.add_styled_run(paragraph, text, merged_styles)
 
             elif child.is_element and child.tag == 'br':
                 # Handle <br> tags inside inline elements
@@ -947,8 +814,7 @@ class TableBuilder:
                 text = child.get_text_content()
                 text = self._normalize_whitespace(text)
                 if text.strip():
-                    run = paragraph.add_run(text)
-                    self.style_mapper.apply_run_style(run, merged_styles)
+                    self.style_mapper.add_styled_run(paragraph, text, merged_styles)
 
     def _build_nested_table(self, word_cell, table_node: DOMNode) -> Optional[object]:
         """
@@ -962,16 +828,9 @@ class TableBuilder:
             python-docx Table object or None
         """
         try:
-            # Extract table structure
-            rows = self._extract_rows(table_node)
-            if not rows:
-                return None
-
-            # Calculate dimensions
-            num_rows = len(rows)
-            num_cols = self._calculate_columns(rows)
-
-            if num_rows == 0 or num_cols == 0:
+            # Table structure
+            layout = TableLayout.for_table(table_node)
+            if not layout.rows or layout.num_cols == 0:
                 return None
 
             # Create nested table in the cell
@@ -980,16 +839,13 @@ class TableBuilder:
                 # Clear the first paragraph but keep it
                 word_cell.paragraphs[0].clear()
 
-            # Add table to cell
-            nested_table = word_cell.add_table(rows=num_rows, cols=num_cols)
-
-            # Fill nested table cells
-            self._fill_table(nested_table, rows)
+            # Add table to cell and fill it
+            nested_table = self._add_table(word_cell, layout)
 
             # Apply table-level styles
-            self._apply_table_style(nested_table, table_node)
+            self._apply_table_style(nested_table, table_node, layout)
 
-            logger.debug(f"Built nested table: {num_rows}x{num_cols}")
+            logger.debug(f"Built nested table: {layout.num_rows}x{layout.num_cols}")
             return nested_table
 
         except Exception as e:
@@ -1054,7 +910,7 @@ class TableBuilder:
 
             # Add image to paragraph run
             run = paragraph.add_run()
-            run.add_picture(image_stream, width=Inches(display_width), height=Inches(display_height))
+            add_picture(run, image_stream, width=Inches(display_width), height=Inches(display_height))
 
             logger.debug(f"Added image to table cell: {src}")
 
@@ -1091,7 +947,8 @@ class TableBuilder:
                 height_pt = image_builder._parse_dimension(height)
 
                 run = paragraph.add_run()
-                run.add_picture(
+                add_picture(
+                    run,
                     image_stream,
                     width=Inches(width_pt / 72),
                     height=Inches(height_pt / 72)
@@ -1105,13 +962,14 @@ class TableBuilder:
         except Exception as e:
             logger.warning(f"Failed to add SVG to table cell: {e}")
 
-    def _apply_table_style(self, table, table_node: DOMNode):
+    def _apply_table_style(self, table, table_node: DOMNode, layout: Optional[TableLayout] = None):
         """
         Apply table-level styles.
 
         Args:
             table: python-docx Table object
             table_node: Table DOM node
+            layout: Table layout model (defaults to the layout of table_node)
         """
         # Set table width if specified
         box_model = table_node.layout_info.get('box_model')
@@ -1145,7 +1003,7 @@ class TableBuilder:
                 logger.warning(f"Failed to set table width: {e}")
 
         # Apply column widths
-        self._apply_column_widths(table, table_node)
+        self._apply_column_widths(table, table_node, layout or TableLayout.for_table(table_node))
 
         # Apply table style
         try:
@@ -1153,23 +1011,21 @@ class TableBuilder:
         except:
             pass
 
-    def _apply_column_widths(self, table, table_node: DOMNode):
+    def _apply_column_widths(self, table, table_node: DOMNode, layout: TableLayout):
         """
         Extract and apply column widths from HTML table with proportional scaling.
 
         This method ensures table columns fit within the Word page width while
-        maintaining the relative proportions from the HTML source.
+        maintaining the relative proportions from the HTML source. Columns without
+        a declared width share the remaining width by their content widths.
 
         Args:
             table: python-docx Table object
             table_node: Table DOM node
+            layout: Table layout model
         """
-        from html2word.utils.units import UnitConverter
-
-        # Try to extract column widths from <col> tags or first row cells
-        col_widths = self._extract_column_widths(table_node)
-
-        if not col_widths:
+        # Column widths from <col> tags or first row cells
+        if not layout.declared_widths:
             return  # No width information, use default
 
         # Get total table width - default to 6.5 inches for standard Word page with margins
@@ -1185,45 +1041,11 @@ class TableBuilder:
 
         try:
             # First pass: categorize columns and collect widths
-            html_widths = []  # HTML widths in px
-            is_percentage = []  # Track if width is percentage
-            has_absolute_widths = False
-            has_percentage_widths = False
-            total_absolute_width_px = 0.0
-
-            for col_idx, width_info in enumerate(col_widths):
-                if col_idx >= len(table.columns):
-                    break
-
-                if width_info:
-                    width_value = None
-                    is_pct = False
-
-                    # Parse width (can be px, %, pt, or just a number)
-                    if isinstance(width_info, str):
-                        if '%' in width_info:
-                            # Percentage width
-                            percent = float(width_info.rstrip('%'))
-                            width_value = percent  # Store as percentage
-                            is_pct = True
-                            has_percentage_widths = True
-                        else:
-                            # Absolute width (px, pt, etc.)
-                            width_pt = UnitConverter.to_pt(width_info)
-                            width_value = width_pt / 0.75  # Convert pt to px for calculation
-                            has_absolute_widths = True
-                            total_absolute_width_px += width_value
-                    elif isinstance(width_info, (int, float)):
-                        # Numeric width, assume pixels
-                        width_value = float(width_info)
-                        has_absolute_widths = True
-                        total_absolute_width_px += width_value
-
-                    html_widths.append(width_value)
-                    is_percentage.append(is_pct)
-                else:
-                    html_widths.append(None)
-                    is_percentage.append(False)
+            width_specs = layout.column_width_specs()
+            html_widths = [spec[0] if spec else None for spec in width_specs]  # px or percent
+            has_percentage_widths = any(spec and spec[1] for spec in width_specs)
+            has_absolute_widths = any(spec and not spec[1] for spec in width_specs)
+            total_absolute_width_px = sum(spec[0] for spec in width_specs if spec and not spec[1])
 
             # If no valid widths found, return
             if not has_absolute_widths and not has_percentage_widths:
@@ -1296,15 +1118,14 @@ class TableBuilder:
                 assigned_width = table_width_pt
                 logger.debug(f"Scaled down column widths by factor {scale_factor:.2f} to fit table width")
 
-            # Distribute remaining width to auto columns
-            auto_columns = sum(1 for w in word_widths if w is None)
-            if auto_columns > 0:
+            # Distribute remaining width to auto columns by their content widths
+            auto_columns = [i for i, w in enumerate(word_widths) if w is None]
+            if auto_columns:
                 remaining_width = table_width_pt - assigned_width
-                auto_width = max(remaining_width / auto_columns, 30)  # Min 30pt per column
-                for i in range(len(word_widths)):
-                    if word_widths[i] is None:
-                        word_widths[i] = auto_width
-                logger.debug(f"Distributed {remaining_width:.1f}pt to {auto_columns} auto columns")
+                auto_widths = layout.distribute_auto_width(remaining_width, auto_columns)  # Min 30pt per column
+                for i, auto_width in zip(auto_columns, auto_widths):
+                    word_widths[i] = auto_width
+                logger.debug(f"Distributed {remaining_width:.1f}pt to {len(auto_columns)} auto columns")
 
             # Third pass: apply calculated widths to Word table columns
             for col_idx, width_pt in enumerate(word_widths):
@@ -1341,127 +1162,50 @@ class TableBuilder:
             table: python-docx Table object
             col_widths_pt: List of column widths in pt
         """
-        from docx.oxml import parse_xml
-        from docx.oxml.ns import nsdecls, qn
-
         try:
-            for row_idx, row in enumerate(table.rows):
+            # Walk w:tr/w:tc directly, visiting grid columns the way row.cells does: a cell
+            # is visited once per spanned column and vMerge continuations resolve to the
+            # cell holding the content (without row.cells' per-row list rebuilding)
+            span_roots = {}  # grid offset -> w:tc that starts a vertical span
+            tr_lst = table._tbl.tr_lst
+            for row_idx, tr in enumerate(tr_lst):
                 col_idx = 0
+                grid_offset = 0
 
-                for cell_idx, cell in enumerate(row.cells):
-                    if col_idx >= len(col_widths_pt):
-                        break
+                for tc in tr.tc_lst:
+                    grid_span = tc.grid_span
+                    if tc.vMerge == 'continue':
+                        tc = span_roots.get(grid_offset, tc)
+                    else:
+                        span_roots[grid_offset] = tc
+                    grid_offset += grid_span
 
-                    width_pt = col_widths_pt[col_idx]
-                    if width_pt:
-                        # Convert pt to DXA (twentieths of a point)
-                        width_dxa = int(width_pt * 20)
+                    for _ in range(grid_span):
+                        if col_idx >= len(col_widths_pt):
+                            break
 
-                        # Get or create cell properties
-                        tc = cell._element
-                        tcPr = tc.get_or_add_tcPr()
+                        width_pt = col_widths_pt[col_idx]
+                        if width_pt:
+                            # Convert pt to DXA (twentieths of a point)
+                            width_dxa = int(width_pt * 20)
 
-                        # Remove existing width if present
-                        for tcW in tcPr.findall(qn('w:tcW')):
-                            tcPr.remove(tcW)
+                            # Get or create cell properties
+                            tcPr = tc.get_or_add_tcPr()
 
-                        # Set new cell width
-                        tcW = parse_xml(f'<w:tcW {nsdecls("w")} w:w="{width_dxa}" w:type="dxa"/>')
-                        tcPr.append(tcW)
+                            # Remove existing width if present
+                            for tcW in tcPr.findall(qn('w:tcW')):
+                                tcPr.remove(tcW)
 
-                        logger.debug(f"Set cell [row {row_idx}, col {cell_idx}] width to {width_pt:.1f}pt ({width_dxa} DXA)")
+                            # Set new cell width
+                            tcPr.append(OxmlElement('w:tcW', {qn('w:w'): str(width_dxa), qn('w:type'): 'dxa'}))
 
-                    col_idx += 1
+                        col_idx += 1
 
-            logger.debug(f"Applied cell widths to {len(table.rows)} rows")
+            logger.debug(f"Applied cell widths to {len(tr_lst)} rows")
 
         except Exception as e:
             logger.warning(f"Error applying cell widths: {e}")
 
-    def _extract_column_widths(self, table_node: DOMNode) -> List[Optional[str]]:
-        """
-        Extract column widths from <col> tags or first row cells.
-
-        Prioritizes <col> tags within <colgroup> as they provide the most
-        accurate width information, especially for Element UI tables.
-
-        Args:
-            table_node: Table DOM node
-
-        Returns:
-            List of width values (can be None for auto-width columns)
-        """
-        widths = []
-
-        # First, try to find <col> or <colgroup> tags
-        for child in table_node.children:
-            if child.tag == 'colgroup':
-                for col in child.children:
-                    if col.tag == 'col':
-                        # Try multiple sources for width
-                        width = (
-                            col.get_attribute('width') or
-                            col.computed_styles.get('width') or
-                            None
-                        )
-
-                        # Convert numeric width attribute to string with 'px'
-                        if width and isinstance(width, (int, float)):
-                            width = f"{width}px"
-
-                        widths.append(width)
-            elif child.tag == 'col':
-                width = (
-                    child.get_attribute('width') or
-                    child.computed_styles.get('width') or
-                    None
-                )
-
-                # Convert numeric width attribute to string with 'px'
-                if width and isinstance(width, (int, float)):
-                    width = f"{width}px"
-
-                widths.append(width)
-
-        # If we found column definitions, log them and return
-        if widths:
-            logger.debug(f"Found {len(widths)} column definitions from <col> tags: {widths}")
-            return widths
-
-        # Otherwise, extract from first row cells
-        rows = self._extract_rows(table_node)
-        if not rows:
-            return []
-
-        first_row = rows[0]
-        for cell in first_row.children:
-            if cell.tag in ('td', 'th'):
-                # Only use explicitly set widths (from width attribute or inline style)
-                # Don't use computed_styles.get('width') as it may contain browser defaults
-                width_attr = cell.get_attribute('width')
-
-                # Convert numeric width attribute to string with 'px'
-                if width_attr and isinstance(width_attr, (int, float)):
-                    width_attr = f"{width_attr}px"
-
-                # Check inline style for width
-                style_attr = cell.get_attribute('style')
-                width_from_style = None
-                if style_attr and isinstance(style_attr, str) and 'width' in style_attr:
-                    # Parse inline style to extract width
-                    import re
-                    match = re.search(r'width\s*:\s*([^;]+)', style_attr)
-                    if match:
-                        width_from_style = match.group(1).strip()
-
-                width = width_attr or width_from_style
-                widths.append(width)
-
-        if widths:
-            logger.debug(f"Extracted {len(widths)} column widths from first row cells: {widths}")
-
-        return widths
-
     def _apply_row_height(self, word_row, row_node: DOMNode):
         """
         Apply row height from CSS styles.
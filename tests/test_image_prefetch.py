@@ -0,0 +1,117 @@
+"""Image prefetch against a local HTTP stand-in."""
+
+import collections
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+from html2word.converter import HTML2WordConverter
+from html2word.utils.image_cache import get_image_cache
+from html2word.utils.image_prefetch import ImagePrefetcher
+from html2word.utils.image_utils import ImageProcessor
+
+
+def _png(color) -> bytes:
+    buffer = io.BytesIO()
+    Image.new('RGB', (16, 16), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+IMAGES = {
+    '/red.png': _png((255, 0, 0)),
+    '/green.png': _png((0, 255, 0)),
+    '/blue.png': _png((0, 0, 255)),
+}
+
+
+class _ImageServer:
+    """Serves IMAGES on 127.0.0.1 (404 for anything else) and counts requests per path."""
+
+    def __init__(self):
+        self.requests = collections.Counter()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests[self.path] += 1
+                body = IMAGES.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/png')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base = f'http://127.0.0.1:{self._httpd.server_address[1]}'
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True
+        )
+        self._thread.start()
+
+    def url(self, path: str) -> str:
+        return self.base + path
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    image_server = _ImageServer()
+    yield image_server
+    image_server.close()
+
+
+@pytest.fixture
+def build():
+    # URL images are only cached inside a build
+    get_image_cache().begin_build()
+
+
+def _convert(html: str, tmp_path) -> HTML2WordConverter:
+    converter = HTML2WordConverter()
+    converter.convert(f'<html><body>{html}</body></html>', str(tmp_path / 'out.docx'), input_type='string')
+    return converter
+
+
+def test_duplicate_sources_are_fetched_once(server, build):
+    task = ('image', server.url('/red.png'), None, None)
+    stats = ImagePrefetcher(max_workers=4).prefetch(ImageProcessor(), [task, task, task])
+
+    assert stats['tasks'] == 1
+    assert stats['prefetched'] == 1
+    assert server.requests['/red.png'] == 1
+
+
+def test_byte_cap_stops_new_submissions(server, build):
+    tasks = [('image', server.url(path), None, None) for path in IMAGES]
+    stats = ImagePrefetcher(max_workers=1, max_bytes=1).prefetch(ImageProcessor(), tasks)
+
+    assert stats['prefetched'] == 1
+    assert stats['skipped'] == len(IMAGES) - 1
+    assert sum(server.requests.values()) == 1
+
+
+def test_build_phase_does_not_fetch_prefetched_images(server, tmp_path):
+    html = ''.join(f'<p><img src="{server.url(path)}" width="16" height="16"></p>' for path in IMAGES)
+    converter = _convert(html + html, tmp_path)
+
+    assert converter.last_report['images']['prefetch']['prefetched'] == len(IMAGES)
+    assert server.requests == {path: 1 for path in IMAGES}
+
+
+def test_failing_url_is_not_fetched_again(server, tmp_path):
+    dead = server.url('/dead.png')
+    _convert(f'<p><img src="{dead}"></p><p>text</p><p><img src="{dead}"></p>', tmp_path)
+
+    assert server.requests['/dead.png'] == 1
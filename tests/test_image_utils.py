@@ -0,0 +1,135 @@
+"""Image loading: pass-through, cache scope of remote images and download deadlines."""
+
+import contextvars
+import io
+import socket
+import time
+import zipfile
+
+import pytest
+import requests
+from PIL import Image
+
+from html2word.converter import HTML2WordConverter
+from html2word.utils import image_utils
+from html2word.utils.deadline import start_deadline
+from html2word.utils.image_utils import ImageProcessor
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+
+def _encode(image_format: str) -> bytes:
+    buffer = io.BytesIO()
+    Image.effect_noise((64, 64), 50).convert('RGB').save(buffer, image_format)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('image_format', ['PNG', 'JPEG', 'GIF', 'BMP', 'TIFF'])
+def test_complete_image_is_intact(image_format):
+    assert ImageProcessor._is_intact(_encode(image_format), image_format)
+
+
+@pytest.mark.parametrize('image_format', ['PNG', 'JPEG', 'GIF', 'BMP', 'TIFF'])
+def test_truncated_image_is_not_intact(image_format):
+    data = _encode(image_format)
+    assert not ImageProcessor._is_intact(data[:len(data) // 2], image_format)
+
+
+def test_truncated_png_is_not_passed_through(tmp_path):
+    data = _encode('PNG')
+    path = tmp_path / 'truncated.png'
+    path.write_bytes(data[:len(data) // 2])
+
+    result = ImageProcessor(base_path=str(tmp_path)).process_image('truncated.png')
+
+    assert result is None or result[0].getvalue() != path.read_bytes()
+
+
+class _SequenceSession:
+    """Serves the given bodies for successive requests and records the URLs."""
+
+    def __init__(self, *bodies):
+        self.bodies = list(bodies)
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        self.requested.append(url)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.bodies.pop(0)
+        return response
+
+
+def _solid_png(color) -> bytes:
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def _embedded_colors(path) -> set:
+    colors = set()
+    with zipfile.ZipFile(path) as package:
+        for name in package.namelist():
+            if name.startswith('word/media/'):
+                image = Image.open(io.BytesIO(package.read(name))).convert('RGB')
+                if len(image.getcolors(1) or ()) == 1:
+                    colors.add(image.getpixel((0, 0)))
+    return colors
+
+
+def test_url_images_are_fetched_again_by_later_conversions(tmp_path, monkeypatch):
+    session = _SequenceSession(_solid_png(RED), _solid_png(BLUE))
+    monkeypatch.setattr(image_utils, '_http_session', session)
+    html = '<html><body><p><img src="http://images.test/logo.png" width="8" height="8"></p></body></html>'
+
+    HTML2WordConverter().convert(html, str(tmp_path / 'first.docx'), input_type='string')
+    HTML2WordConverter().convert(html, str(tmp_path / 'second.docx'), input_type='string')
+
+    assert session.requested == ['http://images.test/logo.png'] * 2
+    assert RED in _embedded_colors(tmp_path / 'first.docx')
+    second = _embedded_colors(tmp_path / 'second.docx')
+    assert BLUE in second and RED not in second
+
+
+def test_url_images_are_not_cached_outside_a_build():
+    processor = ImageProcessor(session=_SequenceSession(_solid_png(RED)))
+    key = contextvars.Context().run(processor._cache_key, 'http://images.test/logo.png', None, None, None, None)
+    assert key is None
+
+
+@pytest.fixture
+def hanging_url():
+    """URL of a server that accepts connections but never responds."""
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen(8)
+    yield f'http://127.0.0.1:{listener.getsockname()[1]}/hang.png'
+    listener.close()
+
+
+def test_download_timeout_is_capped_by_the_deadline(tmp_path, hanging_url):
+    converter = HTML2WordConverter()
+    start = time.monotonic()
+    converter.convert(
+        f'<html><body><img src="{hanging_url}"></body></html>', str(tmp_path / 'out.docx'),
+        input_type='string', deadline=1
+    )
+
+    assert time.monotonic() - start < ImageProcessor.DOWNLOAD_TIMEOUT / 2
+    assert converter.last_report['degradations'].get('image_download_cut_short') == 1
+
+
+def test_download_is_skipped_when_the_deadline_is_low(hanging_url):
+    session = _SequenceSession()
+    processor = ImageProcessor(session=session)
+
+    def load():
+        deadline = start_deadline(0)
+        return processor._load_from_url(hanging_url), deadline.degradations
+
+    data, degradations = contextvars.Context().run(load)
+
+    assert data is None
+    assert session.requested == []
+    assert degradations == {'image_download_skipped': 1}
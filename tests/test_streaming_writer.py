@@ -0,0 +1,36 @@
+"""Drawing ids written by the streaming output backend."""
+
+import base64
+import io
+import re
+import zipfile
+
+from PIL import Image
+
+from html2word.converter import HTML2WordConverter
+from html2word.word_builder.streaming_writer import StreamingDocxWriter
+
+
+def _png_data_uri(color) -> str:
+    buffer = io.BytesIO()
+    Image.new('RGB', (4, 4), color).save(buffer, 'PNG')
+    return 'data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def test_streamed_pictures_get_unique_increasing_drawing_ids(tmp_path):
+    # Each picture is followed by more text paragraphs than the writer keeps in
+    # memory, so no earlier picture is left in the tree when the next one is added
+    text = '<p>text</p>' * (StreamingDocxWriter.WINDOW + 2)
+    blocks = ''.join(
+        f'<p><img src="{_png_data_uri((i * 10, 0, 0))}" width="4" height="4"></p>{text}'
+        for i in range(20)
+    )
+    output = tmp_path / 'out.docx'
+    HTML2WordConverter(output_backend='streaming').convert(
+        f'<html><body>{blocks}</body></html>', str(output), input_type='string'
+    )
+
+    xml = zipfile.ZipFile(output).read('word/document.xml')
+    ids = [int(value) for value in re.findall(rb'<wp:docPr id="(\d+)"', xml)]
+    assert len(ids) >= 20
+    assert ids == sorted(set(ids))
@@ -0,0 +1,129 @@
+"""Pixel tests for the built-in SVG rasterizer."""
+
+import io
+
+import pytest
+from PIL import Image
+
+from html2word.utils.svg_rasterizer import BuiltinBackend, SVGRasterizer
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+STAR = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">'
+    '<polygon points="50,5 79,95 2,37 98,37 21,95" fill="black"{rule}/></svg>'
+)
+
+
+def render(svg: str, width: int, height: int) -> Image.Image:
+    png = BuiltinBackend().render(svg, width, height, 1)
+    return Image.open(io.BytesIO(png)).convert('RGB')
+
+
+def test_self_intersecting_star_nonzero_fills_centre():
+    image = render(STAR.format(rule=''), 100, 100)
+    assert image.getpixel((50, 55)) == BLACK
+    assert image.getpixel((50, 20)) == BLACK
+
+
+def test_self_intersecting_star_evenodd_leaves_centre_empty():
+    image = render(STAR.format(rule=' fill-rule="evenodd"'), 100, 100)
+    assert image.getpixel((50, 55)) == WHITE
+    assert image.getpixel((50, 20)) == BLACK
+
+
+def test_overlapping_subpaths_with_same_winding_do_not_punch_a_hole():
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">'
+        '<path d="M10 10H60V60H10Z M40 40H90V90H40Z" fill="red"/></svg>'
+    )
+    image = render(svg, 100, 100)
+    assert image.getpixel((50, 50)) == RED
+    assert image.getpixel((20, 20)) == RED
+    assert image.getpixel((80, 80)) == RED
+    assert image.getpixel((20, 80)) == WHITE
+
+
+def test_overlapping_subpaths_evenodd_punch_a_hole():
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">'
+        '<path d="M10 10H60V60H10Z M40 40H90V90H40Z" fill="red" fill-rule="evenodd"/></svg>'
+    )
+    image = render(svg, 100, 100)
+    assert image.getpixel((50, 50)) == WHITE
+    assert image.getpixel((20, 20)) == RED
+
+
+def test_opposite_winding_subpath_punches_a_hole_under_nonzero():
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">'
+        '<path d="M10 10H90V90H10Z M30 30V70H70V30Z" fill="red"/></svg>'
+    )
+    image = render(svg, 100, 100)
+    assert image.getpixel((50, 50)) == WHITE
+    assert image.getpixel((20, 20)) == RED
+
+
+def test_preserve_aspect_ratio_none_stretches_to_the_viewport():
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10" preserveAspectRatio="none">'
+        '<rect width="10" height="10" fill="blue"/></svg>'
+    )
+    image = render(svg, 200, 50)
+    for corner in ((1, 1), (198, 1), (1, 48), (198, 48)):
+        assert image.getpixel(corner) == BLUE
+
+
+def test_default_preserve_aspect_ratio_letterboxes_centred():
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10">'
+        '<rect width="10" height="10" fill="blue"/></svg>'
+    )
+    image = render(svg, 200, 50)
+    assert image.getpixel((1, 1)) == WHITE
+    assert image.getpixel((100, 25)) == BLUE
+
+
+@pytest.mark.parametrize('align, inside, outside', [
+    ('xMinYMid meet', (10, 25), (190, 25)),
+    ('xMaxYMid meet', (190, 25), (10, 25)),
+])
+def test_preserve_aspect_ratio_alignment(align, inside, outside):
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10" preserveAspectRatio="{align}">'
+        '<rect width="10" height="10" fill="blue"/></svg>'
+    )
+    image = render(svg, 200, 50)
+    assert image.getpixel(inside) == BLUE
+    assert image.getpixel(outside) == WHITE
+
+
+def test_preserve_aspect_ratio_slice_covers_the_viewport():
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10" preserveAspectRatio="xMidYMin slice">'
+        '<rect width="10" height="2" fill="blue"/></svg>'
+    )
+    image = render(svg, 200, 50)
+    # Scaled by 20: the 2-unit bar is 40px high and spans the full width
+    assert image.getpixel((1, 1)) == BLUE
+    assert image.getpixel((198, 38)) == BLUE
+    assert image.getpixel((100, 45)) == WHITE
+
+
+def test_semi_transparent_fill_blends_with_background():
+    svg = (
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10">'
+        '<path d="M0 0H10V10H0Z M2 2H8V8H2Z" fill="red" fill-opacity="0.5" fill-rule="evenodd"/></svg>'
+    )
+    image = render(svg, 100, 100)
+    assert image.getpixel((10, 50)) == (255, 127, 127)
+    assert image.getpixel((50, 50)) == WHITE
+
+
+def test_builtin_backend_is_recorded_for_supported_svg():
+    rasterizer = SVGRasterizer(backends=['builtin'])
+    assert rasterizer.rasterize(STAR.format(rule=''), 100, 100, 1)
+    assert rasterizer.stats['builtin'] == 1
@@ -0,0 +1,30 @@
+"""Column widths of auto-layout tables."""
+
+import re
+import zipfile
+
+from html2word.converter import HTML2WordConverter
+
+
+def _table_grid(html: str, tmp_path):
+    output = tmp_path / 'out.docx'
+    HTML2WordConverter().convert(f'<html><body>{html}</body></html>', str(output), input_type='string')
+    xml = zipfile.ZipFile(output).read('word/document.xml').decode('utf-8')
+    table_width = int(re.search(r'<w:tblW [^>]*w:w="(\d+)"', xml).group(1))
+    grid = [int(width) for width in re.findall(r'<w:gridCol w:w="(\d+)"', xml)]
+    return table_width, grid
+
+
+def test_minimum_column_width_does_not_overflow_the_table(tmp_path):
+    long_text = 'quarterly revenue by region ' * 20
+    table_width, grid = _table_grid(
+        '<table style="width:600px"><tr>'
+        f'<td style="width:100px">fixed</td><td>{long_text}</td><td>x</td>'
+        '</tr></table>',
+        tmp_path,
+    )
+
+    assert table_width == 9000
+    assert grid[0] == 1500
+    assert abs(sum(grid) - table_width) <= len(grid)
+    assert min(grid[1:]) >= 600